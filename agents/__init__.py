@@ -1,5 +1,7 @@
 from .planner import PlannerAgent
 from .executor import ExecutorAgent
 from .verifier import VerifierAgent
+from .plan_cache import PlanCache, get_plan_cache
+from .speculation import Speculator, create_speculator
 
-__all__ = ['PlannerAgent', 'ExecutorAgent', 'VerifierAgent']
\ No newline at end of file
+__all__ = ['PlannerAgent', 'ExecutorAgent', 'VerifierAgent', 'PlanCache', 'get_plan_cache', 'Speculator', 'create_speculator']
\ No newline at end of file
@@ -1,111 +1,375 @@
 import json
-from typing import Dict, List, Any
-from tools.github_tool import GitHubTool
-from tools.weather_tool import WeatherTool
+import time
+import threading
+import contextvars
+from queue import Queue, Empty
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Iterable, Iterator, Callable, Generator
+from tools.cache import ToolCache, get_tool_cache
+from tools.registry import ToolRegistry, get_registry
+from tools.records import WeatherReading
+from utils.singleflight import SingleFlight
+from utils.retry import RetryPolicy
+from utils.circuit_breaker import CircuitBreaker, get_breaker
+from utils.deadline import PARTIAL_RESULTS, Deadline, DeadlineExceeded, current_deadline, deadline_scope
+from utils.profiling import current_profile, track_allocations
+from utils.tracing import Span, Tracer, get_tracer
+
+_tool_flight = SingleFlight()
+
+class StepStream:
+    def __init__(self, events: Generator[Dict[str, Any], None, Dict[str, Any]]):
+        self._events = events
+        self.results: Optional[Dict[str, Any]] = None
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        self.results = yield from self._events
 
 class ExecutorAgent:
-    def __init__(self):
-        self.tools = {
-            "github_search": GitHubTool(),
-            "weather_get": WeatherTool()
-        }
-        self.max_retries = 2
+    def __init__(self, cache: Optional[ToolCache] = None, flight: Optional[SingleFlight] = None, retry_policy: Optional[RetryPolicy] = None, registry: Optional[ToolRegistry] = None, tracer: Optional[Tracer] = None):
+        self.registry = registry or get_registry()
+        self.tracer = tracer or get_tracer()
+        self.retry_policy = retry_policy or RetryPolicy(max_retries=2)
+        self.max_workers = 4
+        self.cache = cache or get_tool_cache()
+        self.flight = flight or _tool_flight
     
     def execute_plan(self, plan: Dict[str, Any]) -> Dict[str, Any]:
-        results = {
-            "status": "success",
-            "plan_summary": plan.get("task_summary", ""),
-            "steps": [],
-            "data": {},
-            "errors": []
-        }
+        self._build_graph(self._index_steps(plan["steps"]))
+        return self.execute_plan_stream(self._plan_events(plan))
         
+    def execute_plan_stream(self, plan_events: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        stream = self.stream_results(plan_events)
+        for _ in stream:
+            pass
+        return stream.results
+    
+    def stream_results(self, plan_events: Iterable[Dict[str, Any]]) -> StepStream:
+        return StepStream(self._traced_events(plan_events, contextvars.copy_context()))
+    
+    def _traced_events(self, plan_events: Iterable[Dict[str, Any]], context: contextvars.Context) -> Generator[Dict[str, Any], None, Dict[str, Any]]:
+        span = self.tracer.start_span("executor.execute_plan", context.run(self.tracer.current_span))
+        try:
+            with track_allocations("executor.execute_plan", context.run(current_profile)):
+                results = yield from self._execute_events(plan_events, context, span)
+            span.set(status=results["status"], steps=len(results["steps"]), errors=len(results["errors"]))
+            return results
+        except BaseException as e:
+            span.fail(str(e) or type(e).__name__)
+            raise
+        finally:
+            self.tracer.end_span(span)
+    
+    def _execute_events(self, plan_events: Iterable[Dict[str, Any]], context: contextvars.Context, span: Optional[Span] = None) -> Generator[Dict[str, Any], None, Dict[str, Any]]:
+        events = Queue()
+        started = time.perf_counter()
+        steps = {}
+        waiting_on = {}
+        children = defaultdict(list)
         step_outputs = {}
+        step_results = {}
+        plan = None
+        error = None
+        deadline = context.run(current_deadline)
+        budget = deadline.stage("execute") if deadline is not None else None
+        timed_out = False
         
-        for step in plan["steps"]:
-            step_number = step["step_number"]
-            action = step["action"]
-            parameters = step["parameters"].copy()
-            
-            if "depends_on" in step and step["depends_on"]:
-                parameters = self._resolve_dependencies(
-                    parameters,
-                    step["depends_on"],
-                    step_outputs
-                )
+        def produce() -> None:
+            try:
+                for event in plan_events:
+                    events.put(event)
+            except Exception as e:
+                events.put({"type": "error", "error": e})
+            finally:
+                events.put({"type": "end"})
+        
+        step_context = context.copy()
+        threading.Thread(target=context.run, args=(produce,), name="plan-stream", daemon=True).start()
+        
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            running = set()
             
-            step_result = self._execute_step(
-                action,
-                parameters,
-                step["description"]
-            )
+            def launch(number: int) -> None:
+                step = steps[number]
+                parameters = step["parameters"].copy()
+                if step.get("depends_on"):
+                    parameters = self._resolve_dependencies(
+                        parameters,
+                        step["depends_on"],
+                        step_outputs
+                    )
+                future = pool.submit(step_context.copy().run, self._run_step, step, parameters, started, budget, span)
+                running.add(number)
+                future.add_done_callback(lambda done: events.put({"type": "done", "step_number": number, "future": done}))
             
-            step_result.update({
-                "step_number": step_number,
-                "action": action,
-                "description": step["description"]
-            })
+            def add_step(step: Dict[str, Any]) -> None:
+                number = step["step_number"]
+                if number in steps:
+                    raise ValueError("Plan contains duplicate step numbers")
+                steps[number] = step
+                waiting_on[number] = set(step.get("depends_on") or []) - set(step_results)
+                for parent in waiting_on[number]:
+                    children[parent].append(number)
+                if not waiting_on[number]:
+                    launch(number)
             
-            results["steps"].append(step_result)
+            stream_done = False
+            while not stream_done or running:
+                try:
+                    event = events.get(timeout=budget.remaining() if budget is not None else None)
+                except Empty:
+                    timed_out = True
+                    break
+                
+                if event["type"] == "step":
+                    add_step(event["step"])
+                elif event["type"] == "plan":
+                    plan = event["plan"]
+                    for step in plan["steps"]:
+                        if step["step_number"] not in steps:
+                            add_step(step)
+                    self._index_steps(plan["steps"])
+                    self._build_graph(steps)
+                elif event["type"] == "error":
+                    error = event["error"]
+                elif event["type"] == "end":
+                    stream_done = True
+                elif event["type"] == "done":
+                    number = event["step_number"]
+                    running.discard(number)
+                    step_result = event["future"].result()
+                    step_results[number] = step_result
             
-            if step_result["status"] == "success":
-                step_outputs[step_number] = step_result["data"]
-                results["data"][f"step_{step_number}_{action}"] = step_result["data"]
-            else:
+                    if step_result["status"] == "success":
+                        step_outputs[number] = step_result["data"]
+                    
+                    for child in sorted(children.pop(number, []), key=lambda child: -self._expected_latency(steps[child])):
+                        waiting_on[child].discard(number)
+                        if not waiting_on[child]:
+                            launch(child)
+                    
+                    yield step_result
+        
+            if timed_out:
+                for number in sorted(set(steps) - set(step_results)):
+                    step_results[number] = self._expired_step(steps[number], started, DeadlineExceeded("execution", budget.seconds))
+                    yield step_results[number]
+        finally:
+            pool.shutdown(wait=not timed_out, cancel_futures=timed_out)
+        
+        if error is not None:
+            raise error
+        if plan is None:
+            if timed_out:
+                raise DeadlineExceeded("planning", deadline.seconds)
+            raise ValueError("Plan stream ended without a complete plan")
+        
+        ordered = [step_results[number] for number in sorted(steps)]
+        results = {
+            "status": "success",
+            "plan_summary": plan.get("task_summary", ""),
+            "steps": ordered,
+            "data": {f"step_{step['step_number']}_{step['action']}": step["data"] for step in ordered if step["status"] == "success"},
+            "errors": [],
+            "elapsed": time.perf_counter() - started,
+            "partial": timed_out
+        }
+        if timed_out:
+            deadline.degrade(PARTIAL_RESULTS)
+        
+        for step_result in ordered:
+            number = step_result["step_number"]
+            if step_result["status"] != "success":
                 results["status"] = "partial_failure"
                 results["errors"].append({
-                    "step": step_number,
+                    "step": number,
                     "error": step_result.get("error", "Unknown error")
                 })
         
         return results
     
+    def step_key(self, action: str, parameters: Dict[str, Any]) -> Optional[str]:
+        spec = self.registry.get(action)
+        if spec is None:
+            return None
+        try:
+            return self.cache.make_key(action, spec.bind(parameters))
+        except ValueError:
+            return None
+    
+    def prefetch(self, action: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        spec = self.registry.get(action)
+        if spec is None or not spec.cacheable or not spec.idempotent:
+            raise ValueError(f"Tool {action} cannot be prefetched")
+        with self.tracer.span("executor.prefetch", action=action) as span:
+            result = self._execute_step(action, parameters, "")
+            span.set(status=result["status"], cache=result["cache"])
+            return result
+    
+    def _plan_events(self, plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        for step in sorted(plan["steps"], key=lambda step: (bool(step.get("depends_on")), -self._expected_latency(step))):
+            yield {"type": "step", "step": step}
+        yield {"type": "plan", "plan": plan}
+    
+    def _expected_latency(self, step: Dict[str, Any]) -> float:
+        spec = self.registry.get(step.get("action"))
+        return spec.typical_latency_ms if spec else 0.0
+    
+    def _index_steps(self, plan_steps: List[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+        steps = {step["step_number"]: step for step in plan_steps}
+        if len(steps) != len(plan_steps):
+            raise ValueError("Plan contains duplicate step numbers")
+        return steps
+    
+    def _build_graph(self, steps: Dict[int, Dict[str, Any]]) -> Dict[int, List[int]]:
+        children = {number: [] for number in steps}
+        for number, step in steps.items():
+            for parent in set(step.get("depends_on") or []):
+                if parent not in steps:
+                    raise ValueError(f"Step {number} depends on missing step {parent}")
+                children[parent].append(number)
+        
+        indegree = {number: len(set(step.get("depends_on") or [])) for number, step in steps.items()}
+        ready = [number for number, count in indegree.items() if count == 0]
+        visited = 0
+        while ready:
+            number = ready.pop()
+            visited += 1
+            for child in children[number]:
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    ready.append(child)
+        
+        if visited != len(steps):
+            cycle = sorted(number for number, count in indegree.items() if count > 0)
+            raise ValueError(f"Plan contains a dependency cycle between steps: {cycle}")
+        
+        return children
+    
+    def _run_step(self, step: Dict[str, Any], parameters: Dict[str, Any], started: float, budget: Optional[Deadline] = None, parent: Optional[Span] = None) -> Dict[str, Any]:
+        started_at = time.perf_counter() - started
+        with deadline_scope(budget or current_deadline()), self.tracer.span("executor.step", parent, step_number=step["step_number"], action=step["action"]) as span:
+            step_result = self._execute_step(
+                step["action"],
+                parameters,
+                step["description"]
+            )
+            span.set(status=step_result["status"], retries=step_result["retries"], cache=step_result["cache"])
+            if step_result["status"] != "success":
+                span.fail(step_result["error"] or "Unknown error")
+        
+        step_result.update({
+            "step_number": step["step_number"],
+            "action": step["action"],
+            "description": step["description"],
+            "parameters": parameters,
+            "started_at": started_at,
+            "finished_at": time.perf_counter() - started
+        })
+        return step_result
+    
+    def _expired_step(self, step: Dict[str, Any], started: float, error: DeadlineExceeded) -> Dict[str, Any]:
+        finished_at = time.perf_counter() - started
+        return {
+            "status": "failed",
+            "data": None,
+            "error": str(error),
+            "retries": 0,
+            "retryable": False,
+            "cache": None,
+            "timed_out": True,
+            "step_number": step["step_number"],
+            "action": step["action"],
+            "description": step["description"],
+            "parameters": step["parameters"],
+            "started_at": finished_at,
+            "finished_at": finished_at
+        }
+    
     def _execute_step(self, action: str, parameters: Dict[str, Any], description: str) -> Dict[str, Any]:
         result = {
             "status": "failed",
             "data": None,
             "error": None,
-            "retries": 0
+            "retries": 0,
+            "retryable": None,
+            "cache": None
         }
         
-        for attempt in range(self.max_retries + 1):
-            try:
-                result["retries"] = attempt
-                tool = self.tools.get(action)
+        spec = None
+        deadline = current_deadline()
+        for attempt in range(self.retry_policy.max_retries + 1):
+            with self.tracer.span("executor.attempt", action=action, attempt=attempt) as span:
+                try:
+                    result["retries"] = attempt
+                    if deadline is not None:
+                        deadline.check(f"{action} attempt {attempt + 1}")
+                        span.set(deadline_remaining=deadline.remaining())
+                    wait = deadline.remaining() if deadline is not None else None
+                    spec = self.registry.get_spec(action)
+                    arguments = spec.bind(parameters)
+                    breaker = get_breaker(action)
+                    fetch = self.registry.loader(action, arguments)
+                    loader = lambda etag: self._guarded(breaker, lambda: fetch(etag))
                 
-                if not tool:
-                    raise ValueError(f"Unknown tool: {action}")
+                    if spec.cacheable:
+                        (data, result["cache"]), shared = self.flight.do(
+                            self.cache.make_key(action, arguments),
+                            lambda: self.cache.fetch(action, arguments, loader),
+                            timeout=wait
+                        )
+                        if result["cache"] == "miss" and isinstance(data, dict) and data.get("errors"):
+                            self.cache.discard(action, arguments)
+                    elif spec.idempotent:
+                        (data, _), shared = self.flight.do(self.cache.make_key(action, arguments), lambda: loader(None), timeout=wait)
+                    else:
+                        (data, _), shared = loader(None), False
                 
-                if action == "github_search":
-                    data = tool.search(
-                        query=parameters.get("query", ""),
-                        sort=parameters.get("sort", "stars"),
-                        max_results=parameters.get("max_results", 5)
-                    )
-                elif action == "weather_get":
-                    data = tool.get_weather(
-                        city=parameters.get("city", "")
-                    )
-                else:
-                    raise ValueError(f"Unsupported action: {action}")
+                    if shared:
+                        result["cache"] = "coalesced"
+                    span.set(cache=result["cache"])
                 
-                if "error" in data:
-                    raise Exception(data["error"])
-                
-                result.update({
-                    "status": "success",
-                    "data": data,
-                    "error": None
-                })
-                break
+                    result.update({
+                        "status": "success",
+                        "data": data,
+                        "error": None,
+                        "retryable": None
+                    })
+                    break
                 
-            except Exception as e:
-                result["error"] = str(e)
-                if attempt >= self.max_retries:
-                    result["status"] = "failed"
+                except Exception as e:
+                    result["error"] = str(e)
+                    result["retryable"] = self.retry_policy.is_retryable(e)
+                    span.fail(str(e))
+                    span.set(retryable=result["retryable"])
+                    delay = self.retry_policy.next_delay(attempt, e)
+                    if delay is None or not spec or not spec.idempotent:
+                        break
+                    if deadline is not None and delay >= deadline.remaining():
+                        span.set(deadline_exhausted=True)
+                        break
+                    span.set(backoff=delay)
+            time.sleep(delay)
         
         return result
     
+    def _guarded(self, breaker: CircuitBreaker, call: Callable[[], Any]) -> Any:
+        breaker.before_call()
+        try:
+            value = call()
+        except Exception as e:
+            if self.retry_policy.is_retryable(e):
+                breaker.record_failure()
+            elif getattr(e, "status_code", None) is not None:
+                breaker.record_success()
+            else:
+                breaker.release()
+            raise
+        breaker.record_success()
+        return value
+    
     def _resolve_dependencies(self, parameters: Dict[str, Any], depends_on: List[int], step_outputs: Dict[int, Any]) -> Dict[str, Any]:
         resolved = parameters.copy()
         
@@ -114,17 +378,16 @@ class ExecutorAgent:
                 if step_num in step_outputs:
                     data = step_outputs[step_num]
                     
-                    if isinstance(data, dict):
-                        if "repositories" in data and data["repositories"]:
-                            location = data["repositories"][0].get("location", "San Francisco")
-                            if "," in location:
-                                resolved["city"] = location.split(",")[0].strip()
-                            else:
-                                resolved["city"] = location
-                            break
-                        elif "city" in data:
-                            resolved["city"] = data["city"]
-                            break
+                    if isinstance(data, dict) and data.get("repositories"):
+                        location = getattr(data["repositories"][0], "location", None) or "San Francisco"
+                        if "," in location:
+                            resolved["city"] = location.split(",")[0].strip()
+                        else:
+                            resolved["city"] = location
+                        break
+                    elif isinstance(data, WeatherReading):
+                        resolved["city"] = data.city
+                        break
             
             if resolved["city"] == "from_previous_step":
                 resolved["city"] = "San Francisco"
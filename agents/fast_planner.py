@@ -0,0 +1,129 @@
+import re
+from typing import Dict, List, Any, Optional
+from agents.request_parser import LANGUAGES, REFERENCE_WORDS, TOKEN_PATTERN, extract_cities, normalize_text
+
+CLAUSE_SPLIT = re.compile(r"\s*(?:[,;]|\band\b|\balso\b|\bthen\b|\bplus\b)\s*")
+REPO_NOUNS = {"repo", "repos", "repository", "repositories", "project", "projects", "library", "libraries"}
+FILLER_WORDS = {
+    "find", "show", "get", "give", "list", "fetch", "search", "look", "up", "me", "the", "a", "please",
+    "top", "most", "best", "popular", "starred", "stars", "star", "by", "sorted", "on", "github", "for",
+    "what", "are", "is", "some", "of", "can", "you", "i", "want", "to", "see", "tell", "about",
+    "forked", "forks", "recently", "updated", "latest", "newest", "with", "in", "written"
+}
+WEATHER_WORDS = FILLER_WORDS | {
+    "weather", "temperature", "temp", "forecast", "like", "conditions", "today", "now", "current",
+    "check", "whats", "s", "at", "of", "how", "hot", "cold"
+}
+
+class FastPathPlanner:
+    def __init__(self, default_max_results: int = 5, max_results_limit: int = 100):
+        self.default_max_results = default_max_results
+        self.max_results_limit = max_results_limit
+    
+    def plan(self, user_request: str) -> Optional[Dict[str, Any]]:
+        text = normalize_text(user_request).rstrip(".!?")
+        if any(token in REFERENCE_WORDS for token in TOKEN_PATTERN.findall(text)):
+            return None
+        
+        searches: List[str] = []
+        cities: List[str] = []
+        loose_languages: List[str] = []
+        max_results = self.default_max_results
+        sort = "stars"
+        listed_cities = {city.lower(): city for _, _, city in extract_cities(text)}
+        
+        for clause in CLAUSE_SPLIT.split(text):
+            if not clause:
+                continue
+            
+            if clause.strip(" .'-") in listed_cities:
+                cities.append(listed_cities[clause.strip(" .'-")])
+                continue
+            
+            clause_cities = extract_cities(clause)
+            if clause_cities:
+                start, end, city = clause_cities[0]
+                rest = TOKEN_PATTERN.findall(clause[:start] + clause[end:])
+                if len(clause_cities) != 1 or any(token not in WEATHER_WORDS for token in rest):
+                    return None
+                cities.append(city)
+                continue
+            
+            tokens = TOKEN_PATTERN.findall(clause)
+            languages = [LANGUAGES[token] for token in tokens if token in LANGUAGES]
+            has_repo_noun = any(token in REPO_NOUNS for token in tokens)
+            numbers = [int(token) for token in tokens if token.isdigit()]
+            unknown = [
+                token for token in tokens
+                if token not in LANGUAGES and token not in REPO_NOUNS and token not in FILLER_WORDS and not token.isdigit()
+            ]
+            
+            if unknown or len(numbers) > 1:
+                return None
+            
+            if numbers:
+                max_results = min(max(numbers[0], 1), self.max_results_limit)
+            if "forked" in tokens or "forks" in tokens:
+                sort = "forks"
+            elif "recently" in tokens or "updated" in tokens or "latest" in tokens or "newest" in tokens:
+                sort = "updated"
+            
+            if has_repo_noun:
+                if not languages and not loose_languages:
+                    return None
+                searches.extend(loose_languages + languages)
+                loose_languages = []
+            elif languages:
+                loose_languages.extend(languages)
+            elif tokens:
+                return None
+        
+        if loose_languages:
+            if not searches:
+                return None
+            searches.extend(loose_languages)
+        
+        if not searches and not cities:
+            return None
+        
+        return self._build_plan(list(dict.fromkeys(searches)), list(dict.fromkeys(cities)), max_results, sort)
+    
+    def _build_plan(self, languages: List[str], cities: List[str], max_results: int, sort: str) -> Dict[str, Any]:
+        steps = []
+        summary = []
+        expected = []
+        
+        for language in languages:
+            steps.append({
+                "step_number": len(steps) + 1,
+                "action": "github_search",
+                "description": f"Search for top {max_results} {language} repositories sorted by {sort}",
+                "parameters": {
+                    "query": language.lower(),
+                    "sort": sort,
+                    "max_results": max_results
+                },
+                "depends_on": []
+            })
+            summary.append(f"find top {language} repositories")
+            expected.append(f"top {max_results} {language} repositories")
+        
+        if cities:
+            names = cities[0] if len(cities) == 1 else f"{', '.join(cities[:-1])} and {cities[-1]}"
+            steps.append({
+                "step_number": len(steps) + 1,
+                "action": "weather_get",
+                "description": f"Get current weather for {names}",
+                "parameters": {"city": cities[0]} if len(cities) == 1 else {"cities": cities},
+                "depends_on": []
+            })
+            summary.append(f"get the current weather in {names}")
+            expected.append(f"current weather in {names}")
+        
+        task_summary = " and ".join(summary)
+        expected_output = " and ".join(expected)
+        return {
+            "task_summary": task_summary[0].upper() + task_summary[1:],
+            "steps": steps,
+            "expected_output": expected_output[0].upper() + expected_output[1:]
+        }
\ No newline at end of file
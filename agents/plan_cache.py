@@ -0,0 +1,126 @@
+import re
+import copy
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple
+from agents.request_parser import ParsedRequest
+
+SLOT_MARKER = re.compile("\x00(\\w+)\\|(\\w+)\x00")
+
+class PlanCache:
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "uncacheable": 0,
+            "evictions": 0
+        }
+    
+    def get(self, parsed: ParsedRequest) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            skeleton = self._entries.get(parsed.template_key)
+            if skeleton is None:
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(parsed.template_key)
+            self.stats["hits"] += 1
+        
+        values = dict(parsed.slots())
+        return self._fill(copy.deepcopy(skeleton), values)
+    
+    def put(self, parsed: ParsedRequest, plan: Dict[str, Any]) -> bool:
+        skeleton, matched = self._skeletonize(copy.deepcopy(plan), parsed.slots())
+        if matched != {name for name, _ in parsed.slots()}:
+            with self._lock:
+                self.stats["uncacheable"] += 1
+            return False
+        
+        with self._lock:
+            self._entries[parsed.template_key] = skeleton
+            self._entries.move_to_end(parsed.template_key)
+            self.stats["stores"] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+        return True
+    
+    def invalidate(self, parsed: ParsedRequest) -> None:
+        with self._lock:
+            self._entries.pop(parsed.template_key, None)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats["size"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+    
+    def _skeletonize(self, value: Any, slots: List[Tuple[str, str]], in_parameters: bool = False) -> Tuple[Any, set]:
+        matched = set()
+        if isinstance(value, dict):
+            for key in value:
+                value[key], found = self._skeletonize(value[key], slots, in_parameters or key == "parameters")
+                matched |= found
+        elif isinstance(value, list):
+            for index, item in enumerate(value):
+                value[index], found = self._skeletonize(item, slots, in_parameters)
+                matched |= found
+        elif isinstance(value, int) and not isinstance(value, bool) and in_parameters:
+            for name, slot_value in slots:
+                if name.startswith("num") and slot_value == str(value):
+                    matched.add(name)
+                    return f"\x00{name}|number\x00", matched
+        elif isinstance(value, str):
+            for name, slot_value in sorted(slots, key=lambda slot: -len(slot[1])):
+                pattern = re.compile(rf"(?<![\w+#]){re.escape(slot_value)}(?![\w+#])", re.IGNORECASE)
+                
+                def mark(match: "re.Match") -> str:
+                    matched.add(name)
+                    return f"\x00{name}|{self._case_style(match.group(0), slot_value)}\x00"
+                
+                value = pattern.sub(mark, value)
+        return value, matched
+    
+    def _fill(self, value: Any, values: Dict[str, str]) -> Any:
+        if isinstance(value, dict):
+            return {key: self._fill(item, values) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._fill(item, values) for item in value]
+        if isinstance(value, str):
+            marker = SLOT_MARKER.fullmatch(value)
+            if marker is not None and marker.group(2) == "number":
+                return int(values[marker.group(1)])
+            return SLOT_MARKER.sub(lambda match: self._apply_case(values[match.group(1)], match.group(2)), value)
+        return value
+    
+    def _case_style(self, text: str, canonical: str) -> str:
+        if text == canonical:
+            return "canonical"
+        if text == text.lower():
+            return "lower"
+        if text == text.upper():
+            return "upper"
+        return "canonical"
+    
+    def _apply_case(self, value: str, style: str) -> str:
+        if style == "lower":
+            return value.lower()
+        if style == "upper":
+            return value.upper()
+        return value
+
+_default_plan_cache: Optional[PlanCache] = None
+_default_plan_cache_lock = threading.Lock()
+
+def get_plan_cache() -> PlanCache:
+    global _default_plan_cache
+    if _default_plan_cache is None:
+        with _default_plan_cache_lock:
+            if _default_plan_cache is None:
+                _default_plan_cache = PlanCache()
+    return _default_plan_cache
\ No newline at end of file
@@ -0,0 +1,76 @@
+import re
+import json
+from typing import Dict, List, Any, Optional, Iterator
+
+FENCE_PATTERN = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$")
+
+class IncrementalStepParser:
+    def __init__(self, array_key: str = "steps"):
+        self.array_key = array_key
+        self.buffer = ""
+        self.position = 0
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.string_start = 0
+        self.last_string: Optional[str] = None
+        self.pending_key: Optional[str] = None
+        self.array_depth: Optional[int] = None
+        self.item_start: Optional[int] = None
+        self.finished = False
+    
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        self.buffer += chunk
+        items = []
+        
+        while self.position < len(self.buffer):
+            char = self.buffer[self.position]
+            
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+                    self.last_string = self.buffer[self.string_start:self.position]
+            elif char == '"':
+                self.in_string = True
+                self.string_start = self.position + 1
+            elif char == ":":
+                self.pending_key = self.last_string
+            elif char in "{[":
+                if char == "[" and self.pending_key == self.array_key and self.depth == 1 and self.array_depth is None and not self.finished:
+                    self.array_depth = self.depth + 1
+                elif char == "{" and self.array_depth is not None and self.depth == self.array_depth:
+                    self.item_start = self.position
+                self.depth += 1
+                self.pending_key = None
+            elif char in "}]":
+                self.depth -= 1
+                if char == "}" and self.item_start is not None and self.depth == self.array_depth:
+                    items.append(json.loads(self.buffer[self.item_start:self.position + 1]))
+                    self.item_start = None
+                elif char == "]" and self.array_depth is not None and self.depth < self.array_depth:
+                    self.array_depth = None
+                    self.finished = True
+            elif char == ",":
+                self.pending_key = None
+            
+            self.position += 1
+        
+        return items
+
+def parse_plan_text(text: str) -> Dict[str, Any]:
+    return json.loads(FENCE_PATTERN.sub("", text))
+
+class PlanStream:
+    def __init__(self, events: Iterator[Dict[str, Any]]):
+        self._events = events
+        self.plan: Optional[Dict[str, Any]] = None
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for event in self._events:
+            if event["type"] == "plan":
+                self.plan = event["plan"]
+            yield event
\ No newline at end of file
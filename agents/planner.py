@@ -1,114 +1,250 @@
 import json
-from typing import Dict, List, Any
+import threading
+from typing import Dict, List, Any, Optional, Iterator, Tuple
 from llm.llm_client import LLMClient
+from agents.request_parser import ParsedRequest, parse_request
+from agents.plan_cache import PlanCache, get_plan_cache
+from agents.fast_planner import FastPathPlanner
+from agents.plan_stream import IncrementalStepParser, PlanStream, parse_plan_text
+from agents.speculation import Speculation, Speculator
+from tools.registry import ToolRegistry, get_registry
+from utils.deadline import current_deadline
+from utils.tracing import Tracer, get_tracer
 
 class PlannerAgent:
-    def __init__(self, llm_client: LLMClient):
-        self.llm = llm_client
-        self.available_tools = {
-            "github_search": {
-                "description": "Search GitHub repositories by query, sort by stars/forks/updated, get repository details",
-                "parameters": {
-                    "query": "Search query (e.g., 'python machine learning', 'javascript react')",
-                    "sort": "Sort by: stars, forks, or updated (default: stars)",
-                    "max_results": "Maximum number of results to return (default: 5, max: 10)"
-                },
-                "examples": [
-                    "Find top Python repos",
-                    "Search for machine learning projects",
-                    "Find React repositories sorted by stars"
-                ]
+    PLAN_EXAMPLE = {
+        "task_summary": "Search for Python repositories and get weather information for New York City",
+        "steps": [
+            {
+                "step_number": 1,
+                "action": "github_search",
+                "description": "Search for top Python repositories",
+                "parameters": {"query": "python", "sort": "stars", "max_results": 5},
+                "depends_on": []
             },
-            "weather_get": {
-                "description": "Get current weather information for a city including temperature, conditions, and humidity",
-                "parameters": {
-                    "city": "City name (e.g., 'New York', 'London', 'Tokyo')"
-                },
-                "examples": [
-                    "Get weather in New York",
-                    "Check temperature in London",
-                    "What's the weather in Tokyo"
-                ]
+            {
+                "step_number": 2,
+                "action": "weather_get",
+                "description": "Get current weather for New York City",
+                "parameters": {"city": "New York"},
+                "depends_on": []
             }
-        }
+        ],
+        "expected_output": "List of top Python repositories with their details and current weather in New York City"
+    }
+    
+    def __init__(self, llm_client: LLMClient, plan_cache: Optional[PlanCache] = None, fast_path: bool = True, registry: Optional[ToolRegistry] = None, tracer: Optional[Tracer] = None, speculator: Optional[Speculator] = None):
+        self.llm = llm_client
+        self.speculator = speculator
+        self.registry = registry or get_registry()
+        self.tracer = tracer or get_tracer()
+        self.plan_cache = plan_cache or get_plan_cache()
+        self.fast_planner = FastPathPlanner() if fast_path else None
+        self.path_counts = {"fast_path": 0, "cache": 0, "llm": 0}
+        self._stats_lock = threading.Lock()
+        self._system_prompt: Optional[Tuple[int, str]] = None
+    
+    @property
+    def available_tools(self) -> Dict[str, Any]:
+        return self.registry.catalogue()
     
     def create_plan(self, user_request: str) -> Dict[str, Any]:
+        with self.tracer.span("planner.create_plan", request_chars=len(user_request)) as span:
+            plan = self._create_plan(user_request)
+            span.set(plan_source=plan.get("plan_source"), steps=len(plan["steps"]))
+            if plan.get("speculation"):
+                span.set(**{f"speculation_{field}": value for field, value in plan["speculation"].items()})
+            return plan
+    
+    def _create_plan(self, user_request: str) -> Dict[str, Any]:
+        plan, parsed = self._local_plan(user_request)
+        if plan is not None:
+            return plan
+        
+        timeout = self._llm_budget("plan")
+        speculation = self._speculate(user_request, parsed)
         system_prompt = self._build_system_prompt()
-        user_prompt = f"User request: {user_request}\n\nCreate a detailed execution plan for this request."
+        user_prompt = self._user_prompt(user_request)
+        plan = None
         
         try:
             plan = self.llm.generate_structured_output(
                 system_prompt=system_prompt,
                 user_prompt=user_prompt,
                 json_schema=True,
-                temperature=0.3
+                temperature=0.3,
+                agent="planner",
+                timeout=timeout
             )
             
             self._validate_plan(plan)
-            return plan
+            self.plan_cache.put(parsed, plan)
+            return self._record_path(self._attach_speculation(plan, speculation), "llm")
             
         except Exception as e:
+            plan = None
             raise Exception(f"Failed to create plan: {str(e)}")
+        finally:
+            if speculation is not None:
+                speculation.reconcile(plan)
+    
+    def stream_plan(self, user_request: str) -> PlanStream:
+        return PlanStream(self._plan_events(user_request))
+    
+    def _plan_events(self, user_request: str) -> Iterator[Dict[str, Any]]:
+        with self.tracer.span("planner.stream_plan", request_chars=len(user_request)) as span:
+            for event in self._stream_events(user_request):
+                if event["type"] == "step" and "first_step" not in span.attributes:
+                    span.set(first_step=span.duration)
+                elif event["type"] == "plan":
+                    span.set(plan_source=event["plan"].get("plan_source"), steps=len(event["plan"]["steps"]))
+                    if event["plan"].get("speculation"):
+                        span.set(**{f"speculation_{field}": value for field, value in event["plan"]["speculation"].items()})
+                yield event
+    
+    def _stream_events(self, user_request: str) -> Iterator[Dict[str, Any]]:
+        plan, parsed = self._local_plan(user_request)
+        if plan is not None:
+            for step in plan["steps"]:
+                yield {"type": "step", "step": step}
+            yield {"type": "plan", "plan": plan}
+            return
+        
+        timeout = self._llm_budget("stream_plan")
+        speculation = self._speculate(user_request, parsed)
+        system_prompt = self._build_system_prompt()
+        user_prompt = self._user_prompt(user_request)
+        parser = IncrementalStepParser()
+        chunks = []
+        plan = None
+        
+        try:
+            for chunk in self.llm.stream_structured_output(
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                json_schema=True,
+                temperature=0.3,
+                agent="planner",
+                timeout=timeout
+            ):
+                chunks.append(chunk)
+                for step in parser.feed(chunk):
+                    self._validate_step(step)
+                    yield {"type": "step", "step": step}
+            
+            plan = parse_plan_text("".join(chunks))
+            self._validate_plan(plan)
+        except Exception as e:
+            plan = None
+            raise Exception(f"Failed to create plan: {str(e)}")
+        finally:
+            if speculation is not None:
+                speculation.reconcile(plan)
+        
+        self.plan_cache.put(parsed, plan)
+        yield {"type": "plan", "plan": self._record_path(self._attach_speculation(plan, speculation), "llm")}
+    
+    def _llm_budget(self, stage: str) -> Optional[float]:
+        deadline = current_deadline()
+        if deadline is None:
+            return None
+        deadline.check("planning")
+        return deadline.budget(stage)
+    
+    def _speculate(self, user_request: str, parsed: ParsedRequest) -> Optional[Speculation]:
+        if self.speculator is None:
+            return None
+        return self.speculator.start(user_request, parsed)
+    
+    def _attach_speculation(self, plan: Dict[str, Any], speculation: Optional[Speculation]) -> Dict[str, Any]:
+        if speculation is not None:
+            plan["speculation"] = speculation.reconcile(plan)
+        return plan
+    
+    def _local_plan(self, user_request: str) -> Tuple[Optional[Dict[str, Any]], Optional[ParsedRequest]]:
+        if self.fast_planner:
+            plan = self.fast_planner.plan(user_request)
+            if plan is not None:
+                self._validate_plan(plan)
+                return self._record_path(plan, "fast_path"), None
+        
+        parsed = parse_request(user_request)
+        cached = self.plan_cache.get(parsed)
+        if cached is not None:
+            try:
+                self._validate_plan(cached)
+                return self._record_path(cached, "cache"), parsed
+            except ValueError:
+                self.plan_cache.invalidate(parsed)
+        
+        return None, parsed
+    
+    def _record_path(self, plan: Dict[str, Any], source: str) -> Dict[str, Any]:
+        plan["plan_source"] = source
+        with self._stats_lock:
+            self.path_counts[source] += 1
+        return plan
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self.path_counts)
+        total = sum(stats.values())
+        stats["total"] = total
+        stats["bypass_rate"] = (stats["fast_path"] + stats["cache"]) / total if total else 0.0
+        return stats
     
     def _build_system_prompt(self) -> str:
+        cached = self._system_prompt
+        if cached is not None and cached[0] == self.registry.version:
+            return cached[1]
+        
+        prompt = self._render_system_prompt()
+        self._system_prompt = (self.registry.version, prompt)
+        return prompt
+    
+    def _render_system_prompt(self) -> str:
+        actions = ", ".join(self.registry.names())
+        plan_format = {
+            "task_summary": "Brief summary of what the user wants",
+            "steps": [
+                {
+                    "step_number": 1,
+                    "action": f"tool_name (must be one of: {actions})",
+                    "description": "Clear description of what this step does",
+                    "parameters": {"param_name": "param_value"},
+                    "depends_on": []
+                }
+            ],
+            "expected_output": "Description of what the final result should contain"
+        }
         return f"""You are a task planning agent. Your job is to break down user requests into executable steps.
 
 Available tools:
-{json.dumps(self.available_tools, indent=2)}
+{self._compact_json(self.available_tools)}
 
 IMPORTANT: You must respond with valid JSON in this exact format:
-{{
-    "task_summary": "Brief summary of what the user wants",
-    "steps": [
-        {{
-            "step_number": 1,
-            "action": "tool_name (must be one of: github_search, weather_get)",
-            "description": "Clear description of what this step does",
-            "parameters": {{
-                "param_name": "param_value"
-            }},
-            "depends_on": []
-        }}
-    ],
-    "expected_output": "Description of what the final result should contain"
-}}
+{self._compact_json(plan_format)}
 
 Rules:
 1. step_number must start at 1 and increment
-2. action must be exactly one of: github_search, weather_get
+2. action must be exactly one of: {actions}
 3. parameters must match the tool's required parameters
 4. depends_on is an array of step numbers this step depends on (empty if no dependencies)
 5. Keep plans simple and direct
 6. Each step should have a clear, single purpose
 7. If the user asks about weather in a location from a previous step, use "from_previous_step" as the city value
+8. For weather in several cities, use a single weather_get step with a "cities" list instead of one step per city
 
 Example for "Find Python repos and check weather in NYC":
-{{
-    "task_summary": "Search for Python repositories and get weather information for New York City",
-    "steps": [
-        {{
-            "step_number": 1,
-            "action": "github_search",
-            "description": "Search for top Python repositories",
-            "parameters": {{
-                "query": "python",
-                "sort": "stars",
-                "max_results": 5
-            }},
-            "depends_on": []
-        }},
-        {{
-            "step_number": 2,
-            "action": "weather_get",
-            "description": "Get current weather for New York City",
-            "parameters": {{
-                "city": "New York"
-            }},
-            "depends_on": []
-        }}
-    ],
-    "expected_output": "List of top Python repositories with their details and current weather in New York City"
-}}"""
+{self._compact_json(self.PLAN_EXAMPLE)}
+
+Create a detailed execution plan for the user request that follows."""
+
+    def _compact_json(self, value: Any) -> str:
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+    
+    def _user_prompt(self, user_request: str) -> str:
+        return f"User request: {user_request}"
     
     def _validate_plan(self, plan: Dict[str, Any]) -> None:
         required_fields = ["task_summary", "steps", "expected_output"]
@@ -119,10 +255,17 @@ Example for "Find Python repos and check weather in NYC":
         if not isinstance(plan["steps"], list) or len(plan["steps"]) == 0:
             raise ValueError("Plan must contain at least one step")
         
-        valid_actions = set(self.available_tools.keys())
         for step in plan["steps"]:
-            if "action" not in step or step["action"] not in valid_actions:
-                raise ValueError(f"Invalid action in step: {step.get('action')}")
+            self._validate_step(step)
+    
+    def _validate_step(self, step: Dict[str, Any]) -> None:
+        spec = self.registry.get(step.get("action"))
+        if spec is None:
+            raise ValueError(f"Invalid action in step: {step.get('action')}")
             
-            if "step_number" not in step or "description" not in step or "parameters" not in step:
-                raise ValueError(f"Step missing required fields: {step}")
\ No newline at end of file
+        if "step_number" not in step or "description" not in step or "parameters" not in step:
+            raise ValueError(f"Step missing required fields: {step}")
+        
+        missing = spec.missing_parameters(step["parameters"])
+        if missing:
+            raise ValueError(f"Step {step['step_number']} is missing required parameters: {', '.join(missing)}")
\ No newline at end of file
@@ -0,0 +1,155 @@
+import re
+from typing import List, Tuple
+
+LANGUAGES = {
+    "python": "Python",
+    "java": "Java",
+    "javascript": "JavaScript",
+    "typescript": "TypeScript",
+    "go": "Go",
+    "golang": "Go",
+    "rust": "Rust",
+    "ruby": "Ruby",
+    "php": "PHP",
+    "kotlin": "Kotlin",
+    "swift": "Swift",
+    "scala": "Scala",
+    "c++": "C++",
+    "cpp": "C++",
+    "c#": "C#",
+    "csharp": "C#",
+    "dart": "Dart",
+    "elixir": "Elixir",
+    "haskell": "Haskell",
+    "julia": "Julia",
+    "lua": "Lua",
+    "perl": "Perl",
+    "shell": "Shell"
+}
+
+STOP_WORDS = {
+    "a", "an", "the", "and", "also", "please", "me", "i", "want", "to", "find", "show", "get", "give",
+    "list", "fetch", "search", "look", "up", "for", "of", "some", "can", "you", "check", "tell", "what",
+    "whats", "is", "are", "current", "currently", "with", "on", "in", "at", "github", "then", "plus", "now", "like", "today"
+}
+
+TEMPORAL_WORDS = {
+    "today", "tonight", "tomorrow", "yesterday", "now", "this", "next", "last", "week", "weekend",
+    "later", "morning", "afternoon", "evening", "hourly", "daily"
+}
+
+REFERENCE_WORDS = {
+    "my", "your", "our", "their", "his", "her", "its", "it", "where", "which", "that", "those", "these",
+    "there", "here", "same", "owner", "owners", "author", "authors", "previous", "above", "result", "results"
+}
+
+SYNONYMS = {
+    "repos": "repo",
+    "repository": "repo",
+    "repositories": "repo",
+    "project": "repo",
+    "projects": "repo",
+    "starred": "stars",
+    "star": "stars",
+    "popular": "top",
+    "best": "top",
+    "temperature": "weather",
+    "temp": "weather"
+}
+
+CITY_END = (
+    r"(?=\s+(?:and|also|then|plus|with|please|today|tonight|tomorrow|now|this|next|later|right)\b"
+    r"|[,;?!]|\.(?:\s|$)|$)"
+)
+WEATHER_PATTERN = re.compile(
+    r"\b(?:weather|temperature|temp|forecast)\b(?:\s+(?:like|conditions|today|now))?\s+(?:in|at|for|of)\s+"
+    r"(?P<city>[a-z][a-z .'-]*?)" + CITY_END
+)
+CITY_LIST_PATTERN = re.compile(
+    r"(?:\s*,\s*(?:and\s+)?|\s+and\s+)"
+    r"(?P<city>[a-z][a-z .'-]*?)" + CITY_END
+)
+TOKEN_PATTERN = re.compile(r"\{\w+\}|[a-z0-9+#]+")
+
+class ParsedRequest:
+    def __init__(self, original: str, text: str, languages: List[str], cities: List[str], numbers: List[int], template_key: str):
+        self.original = original
+        self.text = text
+        self.languages = languages
+        self.cities = cities
+        self.numbers = numbers
+        self.template_key = template_key
+    
+    def slots(self) -> List[Tuple[str, str]]:
+        slots = [(f"lang{i}", LANGUAGES[language]) for i, language in enumerate(self.languages)]
+        slots.extend((f"city{i}", city) for i, city in enumerate(self.cities))
+        slots.extend((f"num{i}", str(number)) for i, number in enumerate(dict.fromkeys(self.numbers)))
+        return slots
+
+def normalize_text(request: str) -> str:
+    return " ".join(request.lower().replace("’", "'").split())
+
+def is_city_name(text: str) -> bool:
+    words = text.split()
+    return 0 < len(words) <= 3 and not any(
+        word in STOP_WORDS or word in TEMPORAL_WORDS or word in REFERENCE_WORDS or word in LANGUAGES
+        or word in SYNONYMS or word in SYNONYMS.values() or word.isdigit()
+        for word in words
+    )
+
+def extract_cities(text: str) -> List[Tuple[int, int, str]]:
+    cities = []
+    for match in WEATHER_PATTERN.finditer(text):
+        city = match.group("city").strip(" .'-")
+        if not is_city_name(city):
+            continue
+        cities.append((match.start("city"), match.start("city") + len(city), city.title()))
+        
+        position = match.end()
+        while True:
+            more = CITY_LIST_PATTERN.match(text, position)
+            if more is None:
+                break
+            city = more.group("city").strip(" .'-")
+            if not is_city_name(city):
+                break
+            cities.append((more.start("city"), more.start("city") + len(city), city.title()))
+            position = more.end()
+    return cities
+
+def parse_request(request: str) -> ParsedRequest:
+    text = normalize_text(request)
+    city_spans = extract_cities(text)
+    
+    templated = text
+    for index, (start, end, _) in reversed(list(enumerate(city_spans))):
+        templated = f"{templated[:start]}{{city{index}}}{templated[end:]}"
+    
+    languages: List[str] = []
+    numbers: List[int] = []
+    key_tokens: List[str] = []
+    for token in TOKEN_PATTERN.findall(templated):
+        if token in LANGUAGES:
+            language = LANGUAGES[token].lower()
+            if language not in languages:
+                languages.append(language)
+            key_tokens.append(f"{{lang{languages.index(language)}}}")
+            continue
+        
+        if token.isdigit():
+            numbers.append(int(token))
+            key_tokens.append(f"{{num{list(dict.fromkeys(numbers)).index(int(token))}}}")
+            continue
+        
+        token = SYNONYMS.get(token, token)
+        if token not in STOP_WORDS:
+            key_tokens.append(token)
+    
+    return ParsedRequest(
+        original=request,
+        text=text,
+        languages=languages,
+        cities=[city for _, _, city in city_spans],
+        numbers=numbers,
+        template_key=" ".join(key_tokens)
+    )
\ No newline at end of file
@@ -0,0 +1,152 @@
+import os
+import threading
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
+from agents.executor import ExecutorAgent
+from agents.request_parser import LANGUAGES, STOP_WORDS, TOKEN_PATTERN, ParsedRequest, parse_request
+from agents.fast_planner import CLAUSE_SPLIT, FILLER_WORDS, REPO_NOUNS
+from utils.env import load_env
+
+FORK_WORDS = {"forked", "forks"}
+RECENT_WORDS = {"recently", "updated", "latest", "newest"}
+
+class Speculation:
+    def __init__(self, speculator: "Speculator", calls: List[Dict[str, Any]]):
+        self.speculator = speculator
+        self.calls = calls
+        self.report: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+    
+    def reconcile(self, plan: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        with self._lock:
+            if self.report is not None:
+                return self.report
+            
+            planned = {
+                self.speculator.executor.step_key(step.get("action"), step.get("parameters") or {})
+                for step in (plan or {}).get("steps", [])
+            }
+            report = {"predicted": len(self.calls), "hits": 0, "wasted": 0, "cancelled": 0}
+            outcomes = []
+            for call in self.calls:
+                outcomes.append((call["action"], call["key"] in planned))
+                if call["key"] in planned:
+                    report["hits"] += 1
+                elif call["future"].cancel():
+                    report["cancelled"] += 1
+                elif self._reached_upstream(call["future"]):
+                    report["wasted"] += 1
+            
+            self.report = report
+        self.speculator._record(report, outcomes)
+        return report
+    
+    def _reached_upstream(self, future: Future) -> bool:
+        if not future.done():
+            return True
+        if future.exception() is not None:
+            return False
+        return future.result()["cache"] not in ("hit", "coalesced")
+
+class Speculator:
+    def __init__(self, executor: ExecutorAgent, max_calls: int = 2, min_hit_rate: float = 0.3, warmup: int = 10, max_workers: int = 4, default_max_results: int = 5, max_results_limit: int = 100):
+        self.executor = executor
+        self.max_calls = max_calls
+        self.min_hit_rate = min_hit_rate
+        self.warmup = warmup
+        self.default_max_results = default_max_results
+        self.max_results_limit = max_results_limit
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="speculation")
+        self.stats = {"requests": 0, "predicted": 0, "hits": 0, "wasted": 0, "cancelled": 0, "throttled": 0}
+        self.action_stats: Dict[str, Tuple[int, int]] = {}
+        self.throttled: Dict[str, int] = {}
+        self._lock = threading.Lock()
+    
+    def start(self, user_request: str, parsed: Optional[ParsedRequest] = None) -> Speculation:
+        calls = []
+        for action, parameters in self.predict(parsed or parse_request(user_request)):
+            key = self.executor.step_key(action, parameters)
+            if key is None:
+                continue
+            future = self.pool.submit(contextvars.copy_context().run, self.executor.prefetch, action, parameters)
+            calls.append({"action": action, "parameters": parameters, "key": key, "future": future})
+        return Speculation(self, calls)
+    
+    def predict(self, parsed: ParsedRequest) -> List[Tuple[str, Dict[str, Any]]]:
+        predictions = []
+        
+        words = set(parsed.text.split())
+        sort = "forks" if words & FORK_WORDS else "updated" if words & RECENT_WORDS else "stars"
+        max_results = min(max(parsed.numbers[0], 1), self.max_results_limit) if parsed.numbers else self.default_max_results
+        for query in self._search_queries(parsed):
+            predictions.append(("github_search", {"query": query, "sort": sort, "max_results": max_results}))
+        
+        if parsed.cities:
+            cities = list(dict.fromkeys(parsed.cities))
+            predictions.append(("weather_get", {"city": cities[0]} if len(cities) == 1 else {"cities": cities}))
+        
+        predictions = [prediction for prediction in predictions if self._worth_speculating(prediction[0])]
+        predictions.sort(key=lambda prediction: -self._expected_latency(prediction[0]))
+        return predictions[:self.max_calls]
+    
+    def _search_queries(self, parsed: ParsedRequest) -> List[str]:
+        city_words = {word for city in parsed.cities for word in city.lower().split()}
+        queries = []
+        for clause in CLAUSE_SPLIT.split(parsed.text):
+            tokens = TOKEN_PATTERN.findall(clause)
+            if not any(token in REPO_NOUNS or token in LANGUAGES for token in tokens):
+                continue
+            terms = [
+                token for token in tokens
+                if token not in FILLER_WORDS and token not in REPO_NOUNS and token not in STOP_WORDS
+                and token not in city_words and not token.isdigit()
+            ]
+            if terms:
+                queries.append(" ".join(terms))
+        return list(dict.fromkeys(queries))
+    
+    def _worth_speculating(self, action: str) -> bool:
+        with self._lock:
+            predicted, hits = self.action_stats.get(action, (0, 0))
+            if predicted < self.warmup or hits >= predicted * self.min_hit_rate:
+                return True
+            self.throttled[action] = self.throttled.get(action, 0) + 1
+            self.stats["throttled"] += 1
+            return self.throttled[action] % self.warmup == 0
+    
+    def _expected_latency(self, action: str) -> float:
+        spec = self.executor.registry.get(action)
+        return spec.typical_latency_ms if spec else 0.0
+    
+    def _record(self, report: Dict[str, Any], outcomes: List[Tuple[str, bool]]) -> None:
+        with self._lock:
+            self.stats["requests"] += 1
+            for field in ("predicted", "hits", "wasted", "cancelled"):
+                self.stats[field] += report[field]
+            for action, hit in outcomes:
+                predicted, hits = self.action_stats.get(action, (0, 0))
+                self.action_stats[action] = (predicted + 1, hits + hit)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            actions = dict(self.action_stats)
+        stats["hit_rate"] = stats["hits"] / stats["predicted"] if stats["predicted"] else 0.0
+        stats["waste_rate"] = stats["wasted"] / stats["predicted"] if stats["predicted"] else 0.0
+        stats["actions"] = {
+            action: {"predicted": predicted, "hits": hits, "hit_rate": hits / predicted if predicted else 0.0}
+            for action, (predicted, hits) in actions.items()
+        }
+        return stats
+
+def create_speculator(executor: ExecutorAgent) -> Optional[Speculator]:
+    load_env()
+    max_calls = int(os.getenv("SPECULATION_MAX_CALLS", "2"))
+    if os.getenv("SPECULATION", "0") != "1" or max_calls <= 0:
+        return None
+    return Speculator(
+        executor,
+        max_calls=max_calls,
+        min_hit_rate=float(os.getenv("SPECULATION_MIN_HIT_RATE", "0.3"))
+    )
\ No newline at end of file
@@ -1,14 +1,80 @@
 import json
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 from llm.llm_client import LLMClient
+from tools.records import WeatherReading
+from utils.deadline import RULES_ONLY, current_deadline
+from utils.tracing import Tracer, get_tracer
+
+class VerificationSession:
+    def __init__(self, verifier: "VerifierAgent", original_request: str):
+        self.verifier = verifier
+        self.original_request = original_request
+        self.items: Dict[int, List[Dict[str, Any]]] = {}
+        self.checks: Dict[int, bool] = {}
+    
+    def add_step(self, step_result: Dict[str, Any]) -> List[Dict[str, Any]]:
+        number = step_result["step_number"]
+        succeeded = step_result["status"] == "success"
+        self.items[number] = self.verifier._structure_step(step_result) if succeeded and step_result["data"] else []
+        self.checks[number] = succeeded and self.verifier._check_step(step_result, step_result.get("parameters") or {})
+        return self.items[number]
+    
+    def finish(self, plan: Dict[str, Any], execution_results: Dict[str, Any]) -> Dict[str, Any]:
+        for step_result in execution_results.get("steps", []):
+            if step_result["step_number"] not in self.items:
+                self.add_step(step_result)
+        return self.verifier._finish(self, plan, execution_results)
 
 class VerifierAgent:
-    def __init__(self, llm_client: LLMClient):
+    WEATHER_FIELDS = ("city", "temperature", "condition", "humidity")
+    REPO_FIELDS = ("name", "stars", "language")
+    CHARS_PER_TOKEN = 4
+    SYSTEM_PROMPT = """You are a verification agent. Analyze if the execution results adequately address the user's original request.
+
+Respond with JSON in this exact format:
+{"is_complete":true/false,"completeness_score":0-100,"issues":["issue1","issue2"],"suggestions":["suggestion1","suggestion2"]}
+
+Criteria:
+- is_complete: true if all requested information was obtained successfully
+- completeness_score: percentage of how well the request was fulfilled
+- issues: list of any problems or missing information
+- suggestions: recommendations for improvement (can be empty)
+
+Result rows list values in the order given by "fields"; temperatures are in °C and humidity in %.
+
+Evaluate if the execution results satisfy the original request."""
+    
+    def __init__(self, llm_client: LLMClient, max_payload_tokens: int = 1500, max_results_limit: int = 100, min_llm_budget: float = 2.0, tracer: Optional[Tracer] = None):
         self.llm = llm_client
+        self.tracer = tracer or get_tracer()
+        self.max_payload_tokens = max_payload_tokens
+        self.max_results_limit = max_results_limit
+        self.min_llm_budget = min_llm_budget
     
     def verify_results(self, original_request: str, plan: Dict[str, Any], execution_results: Dict[str, Any]) -> Dict[str, Any]:
-        verification = self._llm_verify(original_request, plan, execution_results)
-        formatted_output = self._format_output(original_request, execution_results, verification)
+        return self.start(original_request).finish(plan, execution_results)
+    
+    def start(self, original_request: str) -> VerificationSession:
+        return VerificationSession(self, original_request)
+    
+    def _finish(self, session: VerificationSession, plan: Dict[str, Any], execution_results: Dict[str, Any]) -> Dict[str, Any]:
+        with self.tracer.span("verifier.verify_results", steps=len(execution_results.get("steps", []))) as span:
+            verification = self._rule_verify(plan, execution_results, session.checks)
+            if verification is None:
+                deadline = current_deadline()
+                timeout = deadline.budget("verify") if deadline is not None else None
+                if timeout is not None and timeout < self.min_llm_budget:
+                    deadline.degrade(RULES_ONLY)
+                    verification = self._deadline_verify(execution_results, timeout)
+                else:
+                    verification = self._llm_verify(session.original_request, plan, execution_results, timeout)
+            structured = [
+                item
+                for step in execution_results.get("steps", [])
+                for item in session.items.get(step["step_number"], [])
+            ]
+            formatted_output = self._format_output(session.original_request, execution_results, verification, structured)
+            span.set(verified_by=verification.get("verified_by"), is_complete=bool(verification.get("is_complete")))
         
         return {
             "is_complete": execution_results["status"] == "success" and verification.get("is_complete", False),
@@ -16,69 +82,206 @@ class VerifierAgent:
             "formatted_output": formatted_output
         }
     
-    def _llm_verify(self, request: str, plan: Dict, results: Dict) -> Dict:
-        system_prompt = """You are a verification agent. Analyze if the execution results adequately address the user's original request.
-
-Respond with JSON in this exact format:
-{
-    "is_complete": true/false,
-    "completeness_score": 0-100,
-    "issues": ["issue1", "issue2"],
-    "suggestions": ["suggestion1", "suggestion2"]
-}
-
-Criteria:
-- is_complete: true if all requested information was obtained successfully
-- completeness_score: percentage of how well the request was fulfilled
-- issues: list of any problems or missing information
-- suggestions: recommendations for improvement (can be empty)"""
-
+    def _llm_verify(self, request: str, plan: Dict, results: Dict, timeout: Optional[float] = None) -> Dict:
+        plan_payload, results_payload = self._build_payload(plan, results)
+        span = self.tracer.current_span()
+        if span is not None:
+            span.set(plan_payload_chars=len(plan_payload), results_payload_chars=len(results_payload))
         user_prompt = f"""Original Request: {request}
 
 Planned Steps:
-{json.dumps(plan, indent=2)}
+{plan_payload}
 
 Execution Results:
-{json.dumps(results, default=str, indent=2)}
-
-Evaluate if the execution results satisfy the original request."""
+{results_payload}"""
 
         try:
             verification = self.llm.generate_structured_output(
-                system_prompt=system_prompt,
+                system_prompt=self.SYSTEM_PROMPT,
                 user_prompt=user_prompt,
                 json_schema=True,
-                temperature=0.2
+                temperature=0.2,
+                agent="verifier",
+                timeout=timeout
             )
+            verification["verified_by"] = "llm"
             return verification
         except Exception as e:
             return {
                 "is_complete": results["status"] == "success",
                 "completeness_score": 100 if results["status"] == "success" else 50,
                 "issues": [str(e)],
-                "suggestions": []
+                "suggestions": [],
+                "verified_by": "fallback"
             }
     
-    def _format_output(self, request: str, results: Dict, verification: Dict) -> Dict:
-        all_data = []
+    def _deadline_verify(self, results: Dict, timeout: float) -> Dict:
+        steps = results.get("steps", [])
+        succeeded = sum(1 for step in steps if step["status"] == "success")
+        return {
+            "is_complete": False,
+            "completeness_score": 100 * succeeded // len(steps) if steps else 0,
+            "issues": [f"LLM verification skipped: {timeout:.1f}s left before the deadline"],
+            "suggestions": [],
+            "verified_by": "rules_only"
+        }
+    
+    def _rule_verify(self, plan: Dict, results: Dict, checks: Optional[Dict[int, bool]] = None) -> Optional[Dict]:
+        steps = results.get("steps", [])
+        if not steps:
+            return None
         
-        for step in results.get("steps", []):
-            if step["status"] == "success" and step["data"]:
-                all_data.append({
-                    "action": step["action"],
-                    "data": step["data"]
-                })
+        failed = [step for step in steps if step["status"] != "success"]
+        if len(failed) == len(steps):
+            return {
+                "is_complete": False,
+                "completeness_score": 0,
+                "issues": [f"Step {step['step_number']} failed: {step.get('error')}" for step in failed],
+                "suggestions": ["Check the API keys and the request parameters, then try again"],
+                "verified_by": "rules"
+            }
+        if failed:
+            return None
+        
+        planned = {step["step_number"]: step for step in plan.get("steps", [])}
+        for step in steps:
+            if checks is not None and step["step_number"] in checks:
+                passed = checks[step["step_number"]]
+            else:
+                passed = self._check_step(step, step.get("parameters") or planned.get(step["step_number"], {}).get("parameters", {}))
+            if not passed:
+                return None
+        
+        return {
+            "is_complete": True,
+            "completeness_score": 100,
+            "issues": [],
+            "suggestions": [],
+            "verified_by": "rules"
+        }
+    
+    def _check_step(self, step: Dict, parameters: Dict) -> bool:
+        data = step.get("data") or {}
+        
+        if step["action"] == "github_search":
+            if not isinstance(data, dict):
+                return False
+            repositories = data.get("repositories")
+            if not isinstance(repositories, list):
+                return False
+            try:
+                requested = int(parameters.get("max_results", 5))
+            except (TypeError, ValueError):
+                return False
+            expected = min(requested, self.max_results_limit, data.get("total_count", requested))
+            return len(repositories) >= expected
+        
+        if step["action"] == "weather_get":
+            if self._weather_errors(data):
+                return False
+            requested = parameters.get("cities") or [parameters.get("city")]
+            readings = self._weather_readings(data)
+            if len(readings) < len(requested):
+                return False
+            return all(getattr(reading, field, None) not in (None, "") for reading in readings for field in self.WEATHER_FIELDS)
         
+        return False
+    
+    def _build_payload(self, plan: Dict, results: Dict) -> Tuple[str, str]:
+        plan_payload = json.dumps(
+            [
+                {"step": step.get("step_number"), "action": step.get("action"), "parameters": step.get("parameters")}
+                for step in plan.get("steps", [])
+            ],
+            default=str,
+            ensure_ascii=False,
+            separators=(",", ":")
+        )
+        budget = self.max_payload_tokens * self.CHARS_PER_TOKEN - len(plan_payload)
+        
+        steps = results.get("steps", [])
+        repo_limit = max(
+            (len(step["data"].get("repositories") or []) for step in steps if isinstance(step.get("data"), dict)),
+            default=0
+        )
+        detail = True
+        kept = len(steps)
+        while True:
+            payload: Dict[str, Any] = {
+                "status": results.get("status"),
+                "steps": [self._compact_step(step, repo_limit, detail) for step in steps[:kept]]
+            }
+            if kept < len(steps):
+                payload["truncated"] = len(steps) - kept
+            results_payload = json.dumps(payload, default=str, ensure_ascii=False, separators=(",", ":"))
+            if len(results_payload) <= budget or kept == 0:
+                break
+            if repo_limit > 0:
+                repo_limit //= 2
+            elif detail:
+                detail = False
+            else:
+                kept -= 1
+        
+        return plan_payload, results_payload
+    
+    def _compact_step(self, step: Dict, repo_limit: int, detail: bool = True) -> Dict:
+        compact = {"step": step.get("step_number"), "action": step.get("action"), "status": step.get("status")}
+        if step.get("error"):
+            compact["error"] = step["error"]
+        
+        data = step.get("data")
+        if step.get("action") == "github_search" and isinstance(data, dict) and "repositories" in data:
+            repositories = data["repositories"]
+            compact["total_count"] = data.get("total_count")
+            compact["returned"] = len(repositories)
+            if detail:
+                compact["repositories"] = [
+                    [getattr(repo, field) for field in self.REPO_FIELDS] for repo in repositories[:repo_limit]
+                ]
+                compact["fields"] = list(self.REPO_FIELDS)
+        elif step.get("action") == "weather_get" and data is not None:
+            readings = self._weather_readings(data)
+            if not detail:
+                compact["returned"] = len(readings)
+                return compact
+            compact["data"] = [[getattr(reading, field) for field in self.WEATHER_FIELDS] for reading in readings]
+            compact["fields"] = list(self.WEATHER_FIELDS)
+            if self._weather_errors(data):
+                compact["city_errors"] = self._weather_errors(data)
+        return compact
+    
+    def _weather_readings(self, data: Any) -> List[WeatherReading]:
+        if isinstance(data, WeatherReading):
+            return [data]
+        if isinstance(data, dict):
+            return list((data.get("cities") or {}).values())
+        return []
+    
+    def _weather_errors(self, data: Any) -> Dict[str, str]:
+        if isinstance(data, dict):
+            return data.get("errors") or {}
+        return {}
+    
+    def _format_output(self, request: str, results: Dict, verification: Dict, structured: Optional[List[Dict]] = None) -> Dict:
+        if structured is None:
+            structured = [
+                item
+                for step in results.get("steps", [])
+                if step["status"] == "success" and step["data"]
+                for item in self._structure_step(step)
+            ]
         summary = self._generate_summary(request, results, verification)
-        structured_data = self._structure_data(all_data)
         
         return {
             "summary": summary,
-            "data": structured_data,
+            "data": structured,
             "verification": verification
         }
     
     def _generate_summary(self, request: str, results: Dict, verification: Dict) -> str:
+        if results.get("partial"):
+            return f"⏱ Partial results (deadline reached before every step finished): {request}"
         if results["status"] == "success":
             return f"✅ Successfully completed: {request}"
         elif results["status"] == "partial_failure":
@@ -87,33 +290,39 @@ Evaluate if the execution results satisfy the original request."""
         else:
             return f"❌ Failed to complete: {request}"
     
-    def _structure_data(self, all_data: List[Dict]) -> List[Dict]:
+    def _structure_step(self, step: Dict) -> List[Dict]:
         structured = []
+        action = step["action"]
+        data = step["data"]
         
-        for item in all_data:
-            action = item["action"]
-            data = item["data"]
-            
-            if action == "github_search" and "repositories" in data:
-                for repo in data["repositories"]:
-                    structured.append({
-                        "type": "repo",
-                        "name": repo.get("name", "Unknown"),
-                        "stars": repo.get("stars", 0),
-                        "url": repo.get("url", ""),
-                        "description": repo.get("description", "No description"),
-                        "language": repo.get("language", "Unknown")
-                    })
+        if action == "github_search" and isinstance(data, dict) and "repositories" in data:
+            for repo in data["repositories"]:
+                structured.append({
+                    "type": "repo",
+                    "name": repo.name or "Unknown",
+                    "stars": repo.stars,
+                    "url": repo.url or "",
+                    "description": repo.description or "No description",
+                    "language": repo.language or "Unknown"
+                })
             
-            elif action == "weather_get":
-                city_name = data.get("city", "Unknown")
+        elif action == "weather_get":
+            for reading in self._weather_readings(data):
+                city_name = reading.city or "Unknown"
                 structured.append({
                     "type": "weather",
                     "name": f"Weather in {city_name}",
                     "city": city_name,
-                    "temperature": data.get("temperature", "N/A"),
-                    "condition": data.get("condition", "N/A"),
-                    "humidity": data.get("humidity", "N/A")
+                    "temperature": reading.temperature,
+                    "condition": reading.condition,
+                    "humidity": reading.humidity
+                })
+            for city_name, error in self._weather_errors(data).items():
+                structured.append({
+                    "type": "weather_error",
+                    "name": f"Weather in {city_name}",
+                    "city": city_name,
+                    "error": error
                 })
         
         return structured
\ No newline at end of file
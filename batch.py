@@ -0,0 +1,207 @@
+import os
+import sys
+import math
+import json
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Any, Optional, Set
+from agents.planner import PlannerAgent
+from agents.executor import ExecutorAgent
+from agents.verifier import VerifierAgent
+from agents.speculation import create_speculator
+from llm.llm_client import LLMClient
+from llm.usage import merge_usage, summarize_usage, track_usage
+from tools.records import encode_record
+from utils.deadline import create_deadline, deadline_scope
+from utils.hedging import hedger_states
+from utils.profiling import profile_request
+from utils.tracing import get_tracer, start_metrics_server
+
+def load_tasks(path: str) -> List[Dict[str, Any]]:
+    tasks = []
+    with open(path, encoding="utf-8") as handle:
+        for line_number, line in enumerate(handle, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            task_id = record.get("request_id") or record.get("id") or record.get("task_id") or f"line-{line_number}"
+            text = record.get("task") or record.get("request") or record.get("prompt")
+            if not text:
+                text = "\n\n".join(part for part in (record.get("title"), record.get("body")) if part)
+            if not text:
+                raise ValueError(f"Line {line_number} of {path} has no task text")
+            tasks.append({"id": str(task_id), "task": text, "profile": bool(record.get("profile"))})
+    return tasks
+
+def load_completed(path: str) -> Set[str]:
+    completed = set()
+    if not os.path.exists(path):
+        return completed
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                record = json.loads(line)
+                if record.get("status") != "error":
+                    completed.add(str(record["id"]))
+            except (ValueError, KeyError, AttributeError):
+                continue
+    return completed
+
+def run_task(planner: PlannerAgent, executor: ExecutorAgent, verifier: VerifierAgent, task: Dict[str, Any], deadline_seconds: Optional[float] = None, profile: bool = False) -> Dict[str, Any]:
+    started = time.perf_counter()
+    record = {"id": task["id"], "task": task["task"]}
+    deadline = create_deadline(seconds=deadline_seconds)
+    try:
+        with profile_request(f"batch-{task['id']}", profile or task.get("profile", False)) as profiler, track_usage() as usage, deadline_scope(deadline), get_tracer().span("pipeline", task_id=task["id"]) as span:
+            record["trace_id"] = span.trace_id or None
+            plan_stream = planner.stream_plan(task["task"])
+            exec_results = executor.execute_plan_stream(plan_stream)
+            verification = verifier.verify_results(task["task"], plan_stream.plan, exec_results)
+        output = verification.get("formatted_output", {})
+        record.update({
+            "status": exec_results["status"],
+            "is_complete": verification.get("is_complete", False),
+            "plan_source": plan_stream.plan.get("plan_source"),
+            "speculation": plan_stream.plan.get("speculation"),
+            "summary": output.get("summary"),
+            "data": output.get("data", []),
+            "errors": exec_results.get("errors", []),
+            "partial": exec_results.get("partial", False),
+            "degraded": list(deadline.degraded) if deadline is not None else [],
+            "llm_usage": summarize_usage(usage),
+            "profile": profiler.report if profiler is not None else None
+        })
+    except Exception as e:
+        record.update({"status": "error", "is_complete": False, "error": str(e)})
+    record["latency"] = time.perf_counter() - started
+    return record
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+def run_batch(tasks: List[Dict[str, Any]], output_path: str, concurrency: int, resume: bool = True, llm: Optional[LLMClient] = None, deadline: Optional[float] = None, profile: bool = False) -> Dict[str, Any]:
+    completed = load_completed(output_path) if resume else set()
+    remaining = [task for task in tasks if task["id"] not in completed]
+    
+    llm = llm or LLMClient()
+    executor = ExecutorAgent()
+    planner = PlannerAgent(llm, speculator=create_speculator(executor))
+    verifier = VerifierAgent(llm)
+    
+    mode = "a" if resume else "w"
+    if resume and os.path.exists(output_path) and os.path.getsize(output_path) > 0:
+        with open(output_path, "rb") as handle:
+            handle.seek(-1, os.SEEK_END)
+            needs_newline = handle.read(1) != b"\n"
+    else:
+        needs_newline = False
+    
+    latencies = []
+    usage = []
+    failures = 0
+    partial = 0
+    profiles = []
+    write_lock = threading.Lock()
+    started = time.perf_counter()
+    
+    with open(output_path, mode, encoding="utf-8") as output, ThreadPoolExecutor(max_workers=concurrency) as pool:
+        if needs_newline:
+            output.write("\n")
+        futures = [pool.submit(run_task, planner, executor, verifier, task, deadline, profile) for task in remaining]
+        for future in as_completed(futures):
+            record = future.result()
+            latencies.append(record["latency"])
+            usage.append(record.get("llm_usage", {}))
+            if record["status"] == "error":
+                failures += 1
+            elif record["partial"]:
+                partial += 1
+            if record.get("profile"):
+                profiles.append(record["profile"]["stacks"])
+            with write_lock:
+                output.write(json.dumps(record, default=encode_record, ensure_ascii=False) + "\n")
+                output.flush()
+    
+    elapsed = time.perf_counter() - started
+    return {
+        "tasks": len(remaining),
+        "skipped": len(tasks) - len(remaining),
+        "failures": failures,
+        "partial": partial,
+        "elapsed": elapsed,
+        "throughput": len(remaining) / elapsed if elapsed > 0 else 0.0,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "llm_usage": merge_usage(usage),
+        "speculation": planner.speculator.get_stats() if planner.speculator else None,
+        "hedging": {name: state for name, state in hedger_states().items() if state["enabled"]},
+        "profiles": profiles
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run Planner -> Executor -> Verifier over a JSONL task file")
+    parser.add_argument("input", nargs="?", default="requests.jsonl", help="JSONL file with one task per line")
+    parser.add_argument("-o", "--output", default="results.jsonl", help="JSONL file results are appended to")
+    parser.add_argument("-c", "--concurrency", type=int, default=4, help="Number of pipelines to run at once")
+    parser.add_argument("--restart", action="store_true", help="Ignore existing results instead of resuming")
+    parser.add_argument("--deadline", type=float, default=None, help="Per-task deadline in seconds; 0 disables it (default: REQUEST_DEADLINE or 30)")
+    parser.add_argument("--profile", action="store_true", help="Write a CPU flamegraph stack file and allocation report per task (default: AI_OPS_PROFILE)")
+    parser.add_argument("--traces", help="Write the retained traces as OTLP JSON to this file")
+    args = parser.parse_args(argv)
+    
+    try:
+        start_metrics_server()
+        tasks = load_tasks(args.input)
+        report = run_batch(tasks, args.output, max(1, args.concurrency), resume=not args.restart, deadline=args.deadline, profile=args.profile)
+        if args.traces:
+            with open(args.traces, "w", encoding="utf-8") as handle:
+                json.dump(get_tracer().export_otlp(), handle)
+    except (OSError, ValueError) as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return 1
+    
+    print(
+        f"Processed {report['tasks']} task(s), skipped {report['skipped']}, failed {report['failures']}, partial {report['partial']} "
+        f"in {report['elapsed']:.2f}s ({report['throughput']:.2f} tasks/s)",
+        file=sys.stderr
+    )
+    print(
+        f"Latency p50={report['p50']:.3f}s p95={report['p95']:.3f}s p99={report['p99']:.3f}s",
+        file=sys.stderr
+    )
+    for agent, totals in sorted(report["llm_usage"].items()):
+        print(
+            f"LLM {agent}: {totals['calls']} call(s), {totals['prompt_tokens']} prompt + {totals['completion_tokens']} completion tokens, "
+            f"{totals['latency']:.2f}s",
+            file=sys.stderr
+        )
+    speculation = report["speculation"]
+    if speculation and speculation["requests"]:
+        print(
+            f"Speculation: {speculation['hits']}/{speculation['predicted']} hit ({speculation['hit_rate']:.0%}), "
+            f"{speculation['wasted']} wasted, {speculation['cancelled']} cancelled over {speculation['requests']} LLM plan(s)",
+            file=sys.stderr
+        )
+    for name, hedging in sorted(report["hedging"].items()):
+        print(
+            f"Hedging {name}: {hedging['hedged']} hedge(s) for {hedging['calls']} call(s) ({hedging['hedge_rate']:.1%}), "
+            f"{hedging['hedge_wins']} won, ~{hedging['saved_seconds']:.2f}s saved, {hedging['denied']} held back by the budget",
+            file=sys.stderr
+        )
+    if report["profiles"]:
+        print(
+            f"Profiles: {len(report['profiles'])} written to {os.path.dirname(report['profiles'][0]) or '.'} (*.collapsed for flamegraph tools, *.alloc.txt for allocations)",
+            file=sys.stderr
+        )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
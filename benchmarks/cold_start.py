@@ -0,0 +1,87 @@
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+from typing import Dict, List, Any, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PHASES = ["import", "construct", "first_plan", "rerun", "llm_client"]
+
+def measure() -> Dict[str, float]:
+    sys.path.insert(0, ROOT)
+    os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+    timings = {}
+    
+    started = time.perf_counter()
+    from agents.planner import PlannerAgent
+    from agents.executor import ExecutorAgent
+    from agents.verifier import VerifierAgent
+    from llm.llm_client import LLMClient
+    timings["import"] = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    llm = LLMClient()
+    planner, executor, verifier = PlannerAgent(llm), ExecutorAgent(), VerifierAgent(llm)
+    timings["construct"] = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    planner.create_plan("Find top 5 python repos and weather in London")
+    planner._build_system_prompt()
+    timings["first_plan"] = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    rerun_llm = LLMClient()
+    PlannerAgent(rerun_llm), ExecutorAgent(), VerifierAgent(rerun_llm)
+    timings["rerun"] = time.perf_counter() - started
+    
+    timings["modules"] = len(sys.modules)
+    timings["heavy_modules"] = sorted(name for name in ("openai", "httpx", "dotenv", "requests", "asyncio") if name in sys.modules)
+    
+    started = time.perf_counter()
+    llm.client
+    timings["llm_client"] = time.perf_counter() - started
+    return timings
+
+def run(runs: int) -> Dict[str, Any]:
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child"],
+            capture_output=True, text=True, check=True, cwd=ROOT
+        )
+        samples.append(json.loads(output.stdout))
+    
+    report = {"runs": runs, "python": sys.version.split()[0], "timestamp": time.time()}
+    for phase in PHASES:
+        values = [sample[phase] for sample in samples]
+        report[phase] = {"median": statistics.median(values), "max": max(values)}
+    report["modules"] = samples[-1]["modules"]
+    report["heavy_modules_after_first_plan"] = samples[-1]["heavy_modules"]
+    return report
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure import time, agent construction and first-request latency in fresh interpreters")
+    parser.add_argument("-n", "--runs", type=int, default=5, help="Number of fresh interpreters to sample")
+    parser.add_argument("--history", help="JSONL file each report is appended to")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    
+    if args.child:
+        print(json.dumps(measure()))
+        return 0
+    
+    report = run(max(1, args.runs))
+    for phase in PHASES:
+        print(f"{phase:<12} median={report[phase]['median'] * 1000:8.1f}ms max={report[phase]['max'] * 1000:8.1f}ms")
+    print(f"{'modules':<12} {report['modules']} loaded; heavy: {', '.join(report['heavy_modules_after_first_plan']) or 'none'}")
+    
+    if args.history:
+        with open(args.history, "a", encoding="utf-8") as handle:
+            handle.write(json.dumps(report) + "\n")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
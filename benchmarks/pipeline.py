@@ -0,0 +1,241 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.stand_ins import Behaviour, GitHubStandIn, WeatherStandIn, LLMStandIn
+
+LANGUAGES = ["python", "rust", "go", "typescript", "java", "kotlin"]
+TOPICS = ["python machine learning", "rust web framework", "go cli", "typescript testing", "java database", "c++ game engine", "data visualization", "kubernetes operator"]
+CITIES = ["London", "Paris", "Tokyo", "Delhi", "Mumbai", "Berlin", "Sydney", "Toronto", "Chennai", "San Francisco", "New York", "Madrid"]
+TEMPLATES = [
+    "Find top {count} {language} repos and check weather in {city}",
+    "Show the most forked {language} repos",
+    "Find top {count} {topic} repos and check weather in {city}",
+    "What's the weather in {city}, {city2} and {city3}",
+    "Search GitHub for {topic} projects",
+    "Tell me something fun about {topic} and whether I need an umbrella around {city}"
+]
+RATE_LIMITS = {
+    "GITHUB_RPM": "1000000",
+    "OPENWEATHER_RPM": "1000000",
+    "LLM_RPM": "1000000",
+    "LLM_TPM": "1000000000"
+}
+
+def make_tasks(count: int, seed: int) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    tasks = []
+    for index in range(count):
+        cities = rng.sample(CITIES, 3)
+        text = rng.choice(TEMPLATES).format(
+            count=rng.choice([3, 5, 10]),
+            language=rng.choice(LANGUAGES),
+            topic=rng.choice(TOPICS),
+            city=cities[0],
+            city2=cities[1],
+            city3=cities[2]
+        )
+        tasks.append({"id": f"bench-{index}", "task": text})
+    return tasks
+
+def start_stand_ins(args: argparse.Namespace) -> Dict[str, Any]:
+    def behaviour(latency_ms: float, offset: int) -> Behaviour:
+        return Behaviour(
+            latency_ms=latency_ms,
+            sigma=args.sigma,
+            error_rate=args.error_rate,
+            rate_limit_rate=args.rate_limit_rate,
+            retry_after=args.retry_after,
+            seed=args.seed + offset
+        )
+    
+    stand_ins = {
+        "github": GitHubStandIn(behaviour(args.github_latency, 1)).start(),
+        "openweather": WeatherStandIn(behaviour(args.weather_latency, 2)).start(),
+        "llm": LLMStandIn(behaviour(args.llm_latency, 3), topics=TOPICS, cities=CITIES).start()
+    }
+    os.environ["GITHUB_API_URL"] = stand_ins["github"].url
+    os.environ["OPENWEATHER_API_URL"] = f"{stand_ins['openweather'].url}/data/2.5"
+    os.environ["LLM_BASE_URL"] = f"{stand_ins['llm'].url}/v1/"
+    os.environ["GEMINI_API_KEY"] = "benchmark"
+    os.environ["OPENWEATHER_API_KEY"] = "benchmark"
+    os.environ["RATE_LIMIT_DB"] = ""
+    os.environ["TOOL_CACHE_DB"] = ""
+    for name, value in RATE_LIMITS.items():
+        os.environ.setdefault(name, value)
+    return stand_ins
+
+def peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def run_level(concurrency: int, tasks: List[Dict[str, Any]], stand_ins: Dict[str, Any], trace_memory: bool, deadline: Optional[float] = None) -> Dict[str, Any]:
+    from agents.planner import PlannerAgent
+    from agents.executor import ExecutorAgent
+    from agents.verifier import VerifierAgent
+    from agents.plan_cache import PlanCache
+    from agents.speculation import create_speculator
+    from llm.llm_client import LLMClient
+    from tools.cache import ToolCache
+    from utils.hedging import hedger_states
+    from batch import percentile, run_task
+    
+    llm = LLMClient()
+    executor = ExecutorAgent(cache=ToolCache())
+    planner = PlannerAgent(llm, plan_cache=PlanCache(), speculator=create_speculator(executor))
+    verifier = VerifierAgent(llm)
+    upstream_before = {name: dict(stand_in.stats) for name, stand_in in stand_ins.items()}
+    hedging_before = hedger_states()
+    
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        records = list(pool.map(lambda task: run_task(planner, executor, verifier, task, deadline), tasks))
+    elapsed = time.perf_counter() - started
+    traced_peak = None
+    if trace_memory:
+        traced_peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+    
+    latencies = [record["latency"] for record in records]
+    plan_sources: Dict[str, int] = {}
+    degraded: Dict[str, int] = {}
+    for record in records:
+        source = record.get("plan_source") or "error"
+        plan_sources[source] = plan_sources.get(source, 0) + 1
+        for level in record.get("degraded", []):
+            degraded[level] = degraded.get(level, 0) + 1
+    
+    return {
+        "concurrency": concurrency,
+        "requests": len(records),
+        "failures": sum(1 for record in records if record["status"] == "error"),
+        "partial": sum(1 for record in records if record["status"] == "partial_failure"),
+        "elapsed": elapsed,
+        "throughput": len(records) / elapsed if elapsed > 0 else 0.0,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "peak_rss_mb": peak_rss_mb(),
+        "traced_peak_mb": traced_peak,
+        "plan_sources": plan_sources,
+        "degraded": degraded,
+        "speculation": planner.speculator.get_stats() if planner.speculator else None,
+        "upstream": {
+            name: {field: stand_in.stats[field] - upstream_before[name][field] for field in stand_in.stats}
+            for name, stand_in in stand_ins.items()
+        },
+        "hedging": {
+            name: {field: state[field] - hedging_before.get(name, {}).get(field, 0) for field in ("calls", "hedged", "hedge_wins", "saved_seconds")}
+            for name, state in hedger_states().items() if state["enabled"]
+        }
+    }
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    previous = {level["concurrency"]: level for level in baseline.get("levels", [])}
+    regressions = []
+    for level in report["levels"]:
+        base = previous.get(level["concurrency"])
+        if base is None:
+            continue
+        if base["throughput"] and level["throughput"] < base["throughput"] * (1 - tolerance):
+            regressions.append(f"c={level['concurrency']} throughput {level['throughput']:.2f}/s < baseline {base['throughput']:.2f}/s")
+        for metric in ("p50", "p95", "p99"):
+            if base[metric] and level[metric] > base[metric] * (1 + tolerance):
+                regressions.append(f"c={level['concurrency']} {metric} {level[metric] * 1000:.0f}ms > baseline {base[metric] * 1000:.0f}ms")
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the Planner -> Executor -> Verifier pipeline against local stand-in GitHub, OpenWeather and LLM servers")
+    parser.add_argument("-c", "--concurrency", default="1,4,16", help="Comma-separated concurrency levels")
+    parser.add_argument("-n", "--requests", type=int, default=40, help="Requests per concurrency level")
+    parser.add_argument("--github-latency", type=float, default=250.0, help="Median GitHub stand-in latency in ms")
+    parser.add_argument("--weather-latency", type=float, default=80.0, help="Median OpenWeather stand-in latency in ms")
+    parser.add_argument("--llm-latency", type=float, default=400.0, help="Median LLM stand-in time to first byte in ms")
+    parser.add_argument("--sigma", type=float, default=0.3, help="Log-normal spread of stand-in latencies (0 for fixed)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of stand-in responses that are 503s")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of stand-in responses that are rate-limit rejections")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with rate-limit rejections")
+    parser.add_argument("--seed", type=int, default=7, help="Seed for the task mix and stand-in behaviour")
+    parser.add_argument("--deadline", type=float, default=None, help="Per-request deadline in seconds; 0 disables it (default: REQUEST_DEADLINE or 30)")
+    parser.add_argument("--speculation", action="store_true", help="Start predicted tool calls while the LLM plans (sets SPECULATION=1)")
+    parser.add_argument("--hedging", action="store_true", help="Hedge slow LLM, GitHub and OpenWeather calls (sets HEDGING=1)")
+    parser.add_argument("--tracemalloc", action="store_true", help="Also report the traced Python heap peak (slows the run)")
+    parser.add_argument("--baseline", help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Write this run to --baseline instead of comparing")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative regression before failing")
+    parser.add_argument("--history", help="JSONL file each report is appended to")
+    args = parser.parse_args(argv)
+    
+    levels = [int(level) for level in args.concurrency.split(",") if level.strip()]
+    if args.hedging:
+        os.environ["HEDGING"] = "1"
+    if args.speculation:
+        os.environ["SPECULATION"] = "1"
+    stand_ins = start_stand_ins(args)
+    try:
+        warmup = make_tasks(len(TEMPLATES), args.seed + 1000)
+        run_level(len(warmup), warmup, stand_ins, False)
+        
+        report = {
+            "python": sys.version.split()[0],
+            "timestamp": time.time(),
+            "config": {key: value for key, value in vars(args).items() if key not in ("baseline", "save_baseline", "history")},
+            "levels": [run_level(level, make_tasks(args.requests, args.seed), stand_ins, args.tracemalloc, args.deadline) for level in levels]
+        }
+    finally:
+        for stand_in in stand_ins.values():
+            stand_in.stop()
+    
+    for level in report["levels"]:
+        memory = f"{level['peak_rss_mb']:.0f}MB" if level["peak_rss_mb"] is not None else "n/a"
+        if level["traced_peak_mb"] is not None:
+            memory = f"{memory} (heap peak {level['traced_peak_mb']:.1f}MB)"
+        print(
+            f"c={level['concurrency']:<3} {level['throughput']:7.2f} req/s  p50={level['p50'] * 1000:6.0f}ms  "
+            f"p95={level['p95'] * 1000:6.0f}ms  p99={level['p99'] * 1000:6.0f}ms  rss={memory}  "
+            f"failed={level['failures']} partial={level['partial']}"
+        )
+        if level["degraded"]:
+            print("      degraded " + " ".join(f"{name}={count}" for name, count in sorted(level["degraded"].items())))
+        for name, hedging in sorted(level["hedging"].items()):
+            if hedging["calls"]:
+                print(f"      hedging {name} {hedging['hedged']}/{hedging['calls']} hedged, {hedging['hedge_wins']} won, ~{hedging['saved_seconds']:.2f}s saved")
+        speculation = level["speculation"]
+        if speculation and speculation["predicted"]:
+            print(f"      speculation hit={speculation['hit_rate']:.0%} wasted={speculation['wasted']} cancelled={speculation['cancelled']} of {speculation['predicted']}")
+    
+    if args.history:
+        with open(args.history, "a", encoding="utf-8") as handle:
+            handle.write(json.dumps(report) + "\n")
+    
+    if args.baseline and args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+        print(f"Baseline written to {args.baseline}")
+    elif args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            regressions = compare(report, json.load(handle), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} of {args.baseline}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
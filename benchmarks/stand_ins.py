@@ -0,0 +1,311 @@
+import sys
+import json
+import math
+import time
+import random
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Any, Optional, Tuple
+from urllib.parse import urlparse, parse_qs, urlencode
+
+class _Server(ThreadingHTTPServer):
+    request_queue_size = 1024
+    daemon_threads = True
+    
+    def handle_error(self, request: Any, client_address: Tuple[str, int]) -> None:
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+class Behaviour:
+    def __init__(self, latency_ms: float = 100.0, sigma: float = 0.3, error_rate: float = 0.0, rate_limit_rate: float = 0.0, retry_after: float = 1.0, seed: Optional[int] = None):
+        self.latency_ms = latency_ms
+        self.sigma = sigma
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+    
+    def sample(self) -> Tuple[float, Optional[str]]:
+        with self._lock:
+            delay = self.latency_ms * math.exp(self._random.gauss(0.0, self.sigma)) if self.sigma > 0 else self.latency_ms
+            roll = self._random.random()
+        if roll < self.rate_limit_rate:
+            return delay / 1000, "rate_limited"
+        if roll < self.rate_limit_rate + self.error_rate:
+            return delay / 1000, "error"
+        return delay / 1000, None
+
+class StandIn:
+    name = "stand-in"
+    
+    def __init__(self, behaviour: Optional[Behaviour] = None):
+        self.behaviour = behaviour or Behaviour()
+        self.stats = {"requests": 0, "errors": 0, "rate_limited": 0, "not_modified": 0}
+        self._stats_lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._address: Tuple[str, int] = ("127.0.0.1", 0)
+    
+    @property
+    def url(self) -> str:
+        host, port = self._address
+        return f"http://{host}:{port}"
+    
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> "StandIn":
+        stand_in = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+            
+            def do_GET(self) -> None:
+                stand_in._dispatch(self, None)
+            
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                stand_in._dispatch(self, json.loads(self.rfile.read(length) or b"{}"))
+        
+        server = _Server((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name=f"{self.name}-stand-in", daemon=True).start()
+        self._server = server
+        self._address = server.server_address[:2]
+        return self
+    
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+    
+    def _count(self, field: str) -> None:
+        with self._stats_lock:
+            self.stats[field] += 1
+    
+    def _dispatch(self, handler: BaseHTTPRequestHandler, body: Optional[Dict[str, Any]]) -> None:
+        self._count("requests")
+        delay, outcome = self.behaviour.sample()
+        time.sleep(delay)
+        if outcome == "rate_limited":
+            self._count("rate_limited")
+            self.rate_limited(handler)
+        elif outcome == "error":
+            self._count("errors")
+            send_json(handler, 503, {"message": "Service Unavailable"})
+        else:
+            parsed = urlparse(handler.path)
+            self.handle(handler, parsed.path, {key: values[-1] for key, values in parse_qs(parsed.query).items()}, body)
+    
+    def rate_limited(self, handler: BaseHTTPRequestHandler) -> None:
+        send_json(handler, 429, {"message": "Too Many Requests"}, {"Retry-After": str(self.behaviour.retry_after)})
+    
+    def handle(self, handler: BaseHTTPRequestHandler, path: str, query: Dict[str, str], body: Optional[Dict[str, Any]]) -> None:
+        send_json(handler, 404, {"message": "Not Found"})
+
+class GitHubStandIn(StandIn):
+    name = "github"
+    LANGUAGES = ["Python", "Rust", "Go", "TypeScript", "C++", "Java"]
+    TOTAL_COUNT = 1000
+    
+    def rate_limited(self, handler: BaseHTTPRequestHandler) -> None:
+        send_json(handler, 403, {"message": "API rate limit exceeded"}, {
+            "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset": str(int(time.time() + self.behaviour.retry_after))
+        })
+    
+    def handle(self, handler: BaseHTTPRequestHandler, path: str, query: Dict[str, str], body: Optional[Dict[str, Any]]) -> None:
+        if path != "/search/repositories" or not query.get("q"):
+            send_json(handler, 422, {"message": "Validation Failed"})
+            return
+        
+        per_page = min(int(query.get("per_page", "30")), 100)
+        page = int(query.get("page", "1"))
+        payload = self.search(query["q"], per_page, page)
+        etag = '"' + hashlib.sha1(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest() + '"'
+        if handler.headers.get("If-None-Match") == etag:
+            self._count("not_modified")
+            handler.send_response(304)
+            handler.send_header("ETag", etag)
+            handler.send_header("Content-Length", "0")
+            handler.end_headers()
+            return
+        send_json(handler, 200, payload, {"ETag": etag, "Link": self.link(query, page, math.ceil(payload["total_count"] / per_page))})
+    
+    def link(self, query: Dict[str, str], page: int, last: int) -> str:
+        def url(number: int) -> str:
+            return f"{self.url}/search/repositories?{urlencode(dict(query, page=number))}"
+        
+        links = []
+        if page < last:
+            links.append(f'<{url(page + 1)}>; rel="next"')
+        links.append(f'<{url(last)}>; rel="last"')
+        return ", ".join(links)
+    
+    def search(self, query: str, per_page: int, page: int = 1) -> Dict[str, Any]:
+        seed = int(hashlib.sha1(query.lower().encode("utf-8")).hexdigest()[:8], 16)
+        slug = "-".join(query.lower().split())[:40] or "repo"
+        items = []
+        for rank in range((page - 1) * per_page, min(page * per_page, self.TOTAL_COUNT)):
+            owner = f"org{(seed + rank) % 997}"
+            items.append({
+                "name": f"{slug}-{rank + 1}",
+                "full_name": f"{owner}/{slug}-{rank + 1}",
+                "stargazers_count": 100000 // (rank + 1) + seed % 1000,
+                "forks_count": 10000 // (rank + 1),
+                "language": self.LANGUAGES[(seed + rank) % len(self.LANGUAGES)],
+                "html_url": f"https://github.com/{owner}/{slug}-{rank + 1}",
+                "description": f"Stand-in repository {rank + 1} for {query}",
+                "updated_at": "2024-01-01T00:00:00Z",
+                "owner": {"login": owner}
+            })
+        return {"total_count": self.TOTAL_COUNT, "incomplete_results": False, "items": items}
+
+class WeatherStandIn(StandIn):
+    name = "openweather"
+    CONDITIONS = ["clear sky", "few clouds", "scattered clouds", "light rain", "haze", "mist"]
+    UNKNOWN_CITIES = {"nowhere"}
+    
+    def __init__(self, behaviour: Optional[Behaviour] = None):
+        super().__init__(behaviour)
+        self._cities: Dict[int, str] = {}
+    
+    def handle(self, handler: BaseHTTPRequestHandler, path: str, query: Dict[str, str], body: Optional[Dict[str, Any]]) -> None:
+        if path.endswith("/weather"):
+            city = query.get("q", "")
+            if not city or city.lower() in self.UNKNOWN_CITIES:
+                send_json(handler, 404, {"cod": "404", "message": "city not found"})
+                return
+            send_json(handler, 200, self.reading(city))
+        elif path.endswith("/group"):
+            readings = [self.reading(self.city_for(int(city_id))) for city_id in query.get("id", "").split(",") if city_id.isdigit()]
+            send_json(handler, 200, {"cnt": len(readings), "list": readings})
+        else:
+            send_json(handler, 404, {"cod": "404", "message": "Not Found"})
+    
+    def city_for(self, city_id: int) -> str:
+        return self._cities.get(city_id, f"City {city_id}")
+    
+    def reading(self, city: str) -> Dict[str, Any]:
+        seed = int(hashlib.sha1(city.lower().encode("utf-8")).hexdigest()[:8], 16)
+        city_id = seed % 9000000 + 1000000
+        self._cities[city_id] = city.title()
+        return {
+            "id": city_id,
+            "name": city.title(),
+            "sys": {"country": "XX"},
+            "main": {
+                "temp": round(seed % 400 / 10 - 5, 1),
+                "feels_like": round(seed % 400 / 10 - 6, 1),
+                "humidity": seed % 80 + 20,
+                "pressure": 1000 + seed % 30
+            },
+            "weather": [{"description": self.CONDITIONS[seed % len(self.CONDITIONS)]}],
+            "wind": {"speed": round(seed % 150 / 10, 1)}
+        }
+
+class LLMStandIn(StandIn):
+    name = "llm"
+    VERIFICATION = {
+        "is_complete": True,
+        "completeness_score": 90,
+        "issues": [],
+        "suggestions": []
+    }
+    
+    def __init__(self, behaviour: Optional[Behaviour] = None, topics: Optional[List[str]] = None, cities: Optional[List[str]] = None, chunk_chars: int = 24, chunk_delay_ms: float = 5.0):
+        super().__init__(behaviour)
+        self.topics = sorted(topics or ["open source"], key=len, reverse=True)
+        self.cities = sorted(cities or ["London"], key=len, reverse=True)
+        self.chunk_chars = chunk_chars
+        self.chunk_delay_ms = chunk_delay_ms
+    
+    def plan(self, request: str) -> Dict[str, Any]:
+        text = request.lower()
+        query = next((topic for topic in self.topics if topic.lower() in text), self.topics[-1])
+        cities = [city for city in self.cities if city.lower() in text] or [self.cities[-1]]
+        return {
+            "task_summary": f"Search GitHub for {query} and get the weather",
+            "steps": [
+                {
+                    "step_number": 1,
+                    "action": "github_search",
+                    "description": f"Search for {query} repositories",
+                    "parameters": {"query": query, "sort": "stars", "max_results": 5},
+                    "depends_on": []
+                },
+                {
+                    "step_number": 2,
+                    "action": "weather_get",
+                    "description": f"Get the current weather in {', '.join(cities)}",
+                    "parameters": {"city": cities[0]} if len(cities) == 1 else {"cities": cities},
+                    "depends_on": []
+                }
+            ],
+            "expected_output": "Repositories and current weather"
+        }
+    
+    def handle(self, handler: BaseHTTPRequestHandler, path: str, query: Dict[str, str], body: Optional[Dict[str, Any]]) -> None:
+        if not path.endswith("/chat/completions") or body is None:
+            send_json(handler, 404, {"error": {"message": "Not Found"}})
+            return
+        
+        messages = body.get("messages", [])
+        system_prompt = messages[0]["content"] if messages else ""
+        if system_prompt.startswith("You are a verification agent"):
+            content = json.dumps(self.VERIFICATION)
+        else:
+            content = json.dumps(self.plan(messages[-1]["content"] if messages else ""))
+        prompt_tokens = sum(len(message.get("content", "")) for message in messages) // 4
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": len(content) // 4, "total_tokens": prompt_tokens + len(content) // 4}
+        
+        if not body.get("stream"):
+            send_json(handler, 200, {
+                "id": "chatcmpl-stand-in",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "stand-in"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": usage
+            })
+            return
+        
+        handler.send_response(200)
+        handler.send_header("Content-Type", "text/event-stream")
+        handler.send_header("Connection", "close")
+        handler.end_headers()
+        for chunk in self.chunks(body, content):
+            handler.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            handler.wfile.flush()
+            time.sleep(self.chunk_delay_ms / 1000)
+        if (body.get("stream_options") or {}).get("include_usage"):
+            handler.wfile.write(f"data: {json.dumps(self.chunk(body, None, usage))}\n\n".encode("utf-8"))
+        handler.wfile.write(b"data: [DONE]\n\n")
+        handler.wfile.flush()
+        handler.close_connection = True
+    
+    def chunks(self, body: Dict[str, Any], content: str) -> List[Dict[str, Any]]:
+        return [self.chunk(body, content[start:start + self.chunk_chars]) for start in range(0, len(content), self.chunk_chars)]
+    
+    def chunk(self, body: Dict[str, Any], text: Optional[str], usage: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+        chunk = {
+            "id": "chatcmpl-stand-in",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": body.get("model", "stand-in"),
+            "choices": [] if text is None else [{"index": 0, "delta": {"content": text}, "finish_reason": None}]
+        }
+        if usage is not None:
+            chunk["usage"] = usage
+        return chunk
+
+def send_json(handler: BaseHTTPRequestHandler, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+    body = json.dumps(payload).encode("utf-8")
+    handler.send_response(status)
+    handler.send_header("Content-Type", "application/json")
+    handler.send_header("Content-Length", str(len(body)))
+    for name, value in (headers or {}).items():
+        handler.send_header(name, value)
+    handler.end_headers()
+    handler.wfile.write(body)
\ No newline at end of file
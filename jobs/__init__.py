@@ -0,0 +1,4 @@
+from .queue import JobQueue, QueueFull, get_job_queue
+from .worker import JobWorker, WorkerPool, start_worker_pool
+
+__all__ = ['JobQueue', 'QueueFull', 'get_job_queue', 'JobWorker', 'WorkerPool', 'start_worker_pool']
\ No newline at end of file
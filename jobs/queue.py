@@ -0,0 +1,235 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+from typing import Dict, List, Any, Optional
+from tools.records import encode_record
+from utils.env import load_env
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+TERMINAL_STATUSES = (COMPLETED, FAILED)
+
+class QueueFull(Exception):
+    retryable = True
+    
+    def __init__(self, message: str, depth: int):
+        super().__init__(message)
+        self.depth = depth
+
+class JobQueue:
+    def __init__(self, db_path: str, max_depth: int = 100, per_user_limit: int = 2, max_attempts: int = 3):
+        self.db_path = db_path
+        self.max_depth = max_depth
+        self.per_user_limit = per_user_limit
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+        connection = self._connection()
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, user_id TEXT NOT NULL, task TEXT NOT NULL, status TEXT NOT NULL, "
+            "attempts INTEGER NOT NULL DEFAULT 0, worker_id TEXT, submitted_at REAL NOT NULL, started_at REAL, "
+            "heartbeat_at REAL, finished_at REAL, result TEXT, error TEXT, profile INTEGER NOT NULL DEFAULT 0)"
+        )
+        if "profile" not in {row["name"] for row in connection.execute("PRAGMA table_info(jobs)")}:
+            connection.execute("ALTER TABLE jobs ADD COLUMN profile INTEGER NOT NULL DEFAULT 0")
+        connection.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, submitted_at)")
+        connection.execute("CREATE INDEX IF NOT EXISTS jobs_user ON jobs (user_id, status)")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS job_events ("
+            "job_id TEXT NOT NULL, seq INTEGER NOT NULL, type TEXT NOT NULL, payload TEXT NOT NULL, "
+            "created_at REAL NOT NULL, PRIMARY KEY (job_id, seq))"
+        )
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        return {
+            "db_path": self.db_path,
+            "max_depth": self.max_depth,
+            "per_user_limit": self.per_user_limit,
+            "max_attempts": self.max_attempts
+        }
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(**state)
+    
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.row_factory = sqlite3.Row
+            self._local.connection = connection
+        return connection
+    
+    def _transaction(self, work: Any) -> Any:
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            value = work(connection)
+            connection.execute("COMMIT")
+            return value
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+    
+    def submit(self, task: str, user_id: str, profile: bool = False) -> str:
+        if not task or not task.strip():
+            raise ValueError("Task must not be empty")
+        
+        job_id = uuid.uuid4().hex
+        
+        def insert(connection: sqlite3.Connection) -> None:
+            depth = connection.execute("SELECT COUNT(*) FROM jobs WHERE status IN (?, ?)", (QUEUED, RUNNING)).fetchone()[0]
+            if depth >= self.max_depth:
+                raise QueueFull(f"Job queue is full ({depth} pending jobs); try again shortly", depth)
+            connection.execute(
+                "INSERT INTO jobs (id, user_id, task, status, submitted_at, profile) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, user_id, task, QUEUED, time.time(), int(profile))
+            )
+        
+        self._transaction(insert)
+        return job_id
+    
+    def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        def take(connection: sqlite3.Connection) -> Optional[Dict[str, Any]]:
+            row = connection.execute(
+                "SELECT * FROM jobs AS job WHERE status = ? AND "
+                "(SELECT COUNT(*) FROM jobs AS other WHERE other.user_id = job.user_id AND other.status = ?) < ? "
+                "ORDER BY submitted_at LIMIT 1",
+                (QUEUED, RUNNING, self.per_user_limit)
+            ).fetchone()
+            if row is None:
+                return None
+            
+            now = time.time()
+            connection.execute(
+                "UPDATE jobs SET status = ?, worker_id = ?, attempts = attempts + 1, started_at = ?, heartbeat_at = ? WHERE id = ?",
+                (RUNNING, worker_id, now, now, row["id"])
+            )
+            connection.execute("DELETE FROM job_events WHERE job_id = ?", (row["id"],))
+            job = dict(row)
+            job.update({"status": RUNNING, "worker_id": worker_id, "attempts": row["attempts"] + 1, "started_at": now})
+            return job
+        
+        return self._transaction(take)
+    
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        cursor = self._connection().execute(
+            "UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND worker_id = ? AND status = ?",
+            (time.time(), job_id, worker_id, RUNNING)
+        )
+        return cursor.rowcount == 1
+    
+    def add_event(self, job_id: str, event_type: str, payload: Dict[str, Any]) -> None:
+        encoded = json.dumps(payload, default=str, ensure_ascii=False, separators=(",", ":"))
+        
+        def append(connection: sqlite3.Connection) -> None:
+            seq = connection.execute("SELECT COALESCE(MAX(seq), 0) + 1 FROM job_events WHERE job_id = ?", (job_id,)).fetchone()[0]
+            connection.execute(
+                "INSERT INTO job_events (job_id, seq, type, payload, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, seq, event_type, encoded, time.time())
+            )
+        
+        self._transaction(append)
+    
+    def complete(self, job_id: str, worker_id: str, result: Dict[str, Any]) -> bool:
+        return self._finish(job_id, worker_id, COMPLETED, json.dumps(result, default=encode_record, ensure_ascii=False), None)
+    
+    def fail(self, job_id: str, worker_id: str, error: str) -> bool:
+        return self._finish(job_id, worker_id, FAILED, None, error)
+    
+    def _finish(self, job_id: str, worker_id: str, status: str, result: Optional[str], error: Optional[str]) -> bool:
+        cursor = self._connection().execute(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ? AND worker_id = ? AND status = ?",
+            (status, result, error, time.time(), job_id, worker_id, RUNNING)
+        )
+        return cursor.rowcount == 1
+    
+    def release_worker(self, worker_id: str, reason: str) -> int:
+        return self._requeue("worker_id = ?", (worker_id,), reason)
+    
+    def recover(self, stale_after: float) -> int:
+        return self._requeue("heartbeat_at < ?", (time.time() - stale_after,), f"No heartbeat for {stale_after:.0f}s")
+    
+    def _requeue(self, condition: str, arguments: tuple, reason: str) -> int:
+        def requeue(connection: sqlite3.Connection) -> int:
+            now = time.time()
+            failed = connection.execute(
+                f"UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE status = ? AND attempts >= ? AND {condition}",
+                (FAILED, f"{reason}; gave up after {self.max_attempts} attempt(s)", now, RUNNING, self.max_attempts) + arguments
+            ).rowcount
+            requeued = connection.execute(
+                f"UPDATE jobs SET status = ?, worker_id = NULL, error = ? WHERE status = ? AND {condition}",
+                (QUEUED, reason, RUNNING) + arguments
+            ).rowcount
+            return failed + requeued
+        
+        return self._transaction(requeue)
+    
+    def purge(self, older_than: float) -> int:
+        def delete(connection: sqlite3.Connection) -> int:
+            cutoff = time.time() - older_than
+            connection.execute(
+                "DELETE FROM job_events WHERE job_id IN (SELECT id FROM jobs WHERE status IN (?, ?) AND finished_at < ?)",
+                TERMINAL_STATUSES + (cutoff,)
+            )
+            return connection.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?",
+                TERMINAL_STATUSES + (cutoff,)
+            ).rowcount
+        
+        return self._transaction(delete)
+    
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        connection = self._connection()
+        row = connection.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        
+        job = dict(row)
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        if job["status"] == QUEUED:
+            job["position"] = connection.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = ? AND submitted_at <= ?",
+                (QUEUED, job["submitted_at"])
+            ).fetchone()[0]
+        return job
+    
+    def events(self, job_id: str, after: int = 0) -> List[Dict[str, Any]]:
+        rows = self._connection().execute(
+            "SELECT seq, type, payload, created_at FROM job_events WHERE job_id = ? AND seq > ? ORDER BY seq",
+            (job_id, after)
+        ).fetchall()
+        return [
+            {"seq": row["seq"], "type": row["type"], "payload": json.loads(row["payload"]), "created_at": row["created_at"]}
+            for row in rows
+        ]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        rows = self._connection().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        stats = {QUEUED: 0, RUNNING: 0, COMPLETED: 0, FAILED: 0}
+        stats.update({row[0]: row[1] for row in rows})
+        stats["depth"] = stats[QUEUED] + stats[RUNNING]
+        stats["max_depth"] = self.max_depth
+        return stats
+
+_default_queue: Optional[JobQueue] = None
+_default_queue_lock = threading.Lock()
+
+def get_job_queue() -> JobQueue:
+    global _default_queue
+    if _default_queue is None:
+        with _default_queue_lock:
+            if _default_queue is None:
+                load_env()
+                _default_queue = JobQueue(
+                    os.getenv("JOB_DB", "jobs.db"),
+                    max_depth=int(os.getenv("JOB_MAX_DEPTH", "100")),
+                    per_user_limit=int(os.getenv("JOB_USER_CONCURRENCY", "2")),
+                    max_attempts=int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+                )
+    return _default_queue
\ No newline at end of file
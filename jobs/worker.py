@@ -0,0 +1,251 @@
+import os
+import sys
+import time
+import signal
+import socket
+import argparse
+import threading
+import multiprocessing
+from typing import Dict, List, Any, Optional
+from agents.planner import PlannerAgent
+from agents.executor import ExecutorAgent
+from agents.verifier import VerifierAgent
+from agents.speculation import create_speculator
+from jobs.queue import JobQueue, get_job_queue
+from llm.llm_client import LLMClient
+from llm.usage import summarize_usage, track_usage
+from utils.env import load_env
+from utils.deadline import create_deadline, deadline_scope
+from utils.profiling import profile_request
+from utils.tracing import get_tracer, start_metrics_server
+
+class JobWorker:
+    def __init__(self, queue: JobQueue, worker_id: str, heartbeat_interval: float = 5.0, poll_interval: float = 0.2):
+        self.queue = queue
+        self.worker_id = worker_id
+        self.heartbeat_interval = heartbeat_interval
+        self.poll_interval = poll_interval
+        self.executor = ExecutorAgent()
+        self.config_error: Optional[str] = None
+        try:
+            llm = LLMClient()
+        except ValueError as e:
+            self.config_error = f"Configuration Error: {str(e)}"
+        else:
+            self.planner = PlannerAgent(llm, speculator=create_speculator(self.executor))
+            self.verifier = VerifierAgent(llm)
+        self.current: Optional[str] = None
+    
+    def run(self, stop_event: Any) -> None:
+        threading.Thread(target=self._heartbeat, args=(stop_event,), name="job-heartbeat", daemon=True).start()
+        while not stop_event.is_set():
+            job = self.queue.claim(self.worker_id)
+            if job is None:
+                stop_event.wait(self.poll_interval)
+                continue
+            
+            self.current = job["id"]
+            try:
+                self.process(job)
+            finally:
+                self.current = None
+    
+    def _heartbeat(self, stop_event: Any) -> None:
+        while not stop_event.wait(self.heartbeat_interval):
+            job_id = self.current
+            if job_id is not None:
+                self.queue.heartbeat(job_id, self.worker_id)
+    
+    def process(self, job: Dict[str, Any]) -> None:
+        job_id = job["id"]
+        if self.config_error is not None:
+            self.queue.fail(job_id, self.worker_id, self.config_error)
+            return
+        
+        started = time.perf_counter()
+        deadline = create_deadline(job["submitted_at"] if job["attempts"] == 1 else job["started_at"])
+        try:
+            with profile_request(f"job-{job_id}", bool(job.get("profile"))) as profile, track_usage() as usage, deadline_scope(deadline), get_tracer().span("job", job_id=job_id, attempt=job["attempts"]) as trace:
+                if deadline is not None:
+                    deadline.check("queueing")
+                    trace.set(deadline_remaining=deadline.remaining())
+                plan_stream = self.planner.stream_plan(job["task"])
+                step_stream = self.executor.stream_results(plan_stream)
+                session = self.verifier.start(job["task"])
+                for step in step_stream:
+                    self.queue.add_event(job_id, "step", {
+                        "step_number": step["step_number"],
+                        "description": step["description"],
+                        "status": step["status"],
+                        "error": step.get("error"),
+                        "finished_at": step["finished_at"],
+                        "items": session.add_step(step)
+                    })
+                
+                exec_results = step_stream.results
+                plan = plan_stream.plan
+                self.queue.add_event(job_id, "verifying", {"steps": len(exec_results.get("steps", [])), "elapsed": exec_results.get("elapsed", 0)})
+                verification = session.finish(plan, exec_results)
+                if deadline is not None:
+                    trace.set(degraded=",".join(deadline.degraded))
+            
+            output = verification.get("formatted_output", {})
+            self.queue.complete(job_id, self.worker_id, {
+                "summary": output.get("summary", "Task completed"),
+                "is_complete": verification.get("is_complete", False),
+                "verified_by": verification["verification_details"].get("verified_by", "llm"),
+                "status": exec_results["status"],
+                "partial": exec_results.get("partial", False),
+                "deadline": deadline.snapshot() if deadline is not None else None,
+                "plan": plan,
+                "steps": [
+                    {"step_number": step["step_number"], "description": step["description"], "status": step["status"]}
+                    for step in exec_results.get("steps", [])
+                ],
+                "elapsed": exec_results.get("elapsed", 0),
+                "latency": time.perf_counter() - started,
+                "llm_usage": summarize_usage(usage),
+                "spans": get_tracer().get_trace(trace.trace_id) if trace.trace_id else [],
+                "profile": profile.report if profile is not None else None
+            })
+        except Exception as e:
+            self.queue.fail(job_id, self.worker_id, str(e))
+
+def worker_main(queue: JobQueue, worker_id: str, parent_pid: int, heartbeat_interval: float, poll_interval: float, metrics_port: int = 0) -> None:
+    stop_event = threading.Event()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop_event.set())
+    if metrics_port:
+        try:
+            start_metrics_server(metrics_port)
+        except OSError as e:
+            print(f"Worker {worker_id} could not serve metrics on port {metrics_port}: {str(e)}", file=sys.stderr)
+    
+    def watch_parent() -> None:
+        while not stop_event.wait(heartbeat_interval):
+            if os.getppid() != parent_pid:
+                stop_event.set()
+    
+    threading.Thread(target=watch_parent, name="job-parent-watch", daemon=True).start()
+    JobWorker(queue, worker_id, heartbeat_interval, poll_interval).run(stop_event)
+
+class WorkerPool:
+    def __init__(self, queue: JobQueue, workers: int = 2, heartbeat_interval: float = 5.0, stale_after: float = 30.0, poll_interval: float = 0.2, retention: float = 86400.0, metrics_port: int = 0):
+        self.queue = queue
+        self.workers = workers
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_after = stale_after
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.metrics_port = metrics_port
+        self.context = multiprocessing.get_context("spawn")
+        self.stop_event = threading.Event()
+        self.processes: Dict[str, Any] = {}
+        self.slots: Dict[str, int] = {}
+        self.stats = {"started": 0, "restarts": 0, "recovered": 0, "purged": 0}
+        self._lock = threading.Lock()
+        self._supervisor: Optional[threading.Thread] = None
+    
+    def start(self) -> "WorkerPool":
+        self.stats["recovered"] += self.queue.recover(self.stale_after)
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        for slot in range(self.workers):
+            self.slots[f"{prefix}:{slot}"] = slot
+            self._spawn(f"{prefix}:{slot}")
+        self._supervisor = threading.Thread(target=self._supervise, name="job-supervisor", daemon=True)
+        self._supervisor.start()
+        return self
+    
+    def _spawn(self, worker_id: str) -> None:
+        process = self.context.Process(
+            target=worker_main,
+            args=(self.queue, worker_id, os.getpid(), self.heartbeat_interval, self.poll_interval, self.worker_metrics_port(worker_id)),
+            name=f"job-worker-{worker_id}",
+            daemon=True
+        )
+        process.start()
+        with self._lock:
+            self.processes[worker_id] = process
+            self.stats["started"] += 1
+    
+    def worker_metrics_port(self, worker_id: str) -> int:
+        return self.metrics_port + 1 + self.slots[worker_id] if self.metrics_port else 0
+    
+    def _supervise(self) -> None:
+        while not self.stop_event.wait(self.heartbeat_interval):
+            with self._lock:
+                dead = [(worker_id, process) for worker_id, process in self.processes.items() if not process.is_alive()]
+            for worker_id, process in dead:
+                self.stats["recovered"] += self.queue.release_worker(worker_id, f"Worker exited with code {process.exitcode}")
+                if not self.stop_event.is_set():
+                    self.stats["restarts"] += 1
+                    self._spawn(worker_id)
+            self.stats["recovered"] += self.queue.recover(self.stale_after)
+            self.stats["purged"] += self.queue.purge(self.retention)
+    
+    def stop(self, timeout: float = 10.0) -> None:
+        self.stop_event.set()
+        with self._lock:
+            processes = dict(self.processes)
+        for process in processes.values():
+            if process.is_alive():
+                process.terminate()
+        deadline = time.monotonic() + timeout
+        for process in processes.values():
+            process.join(max(0.0, deadline - time.monotonic()))
+        for worker_id, process in processes.items():
+            if process.is_alive():
+                process.kill()
+                process.join()
+            self.queue.release_worker(worker_id, "Worker pool stopped")
+        if self._supervisor is not None:
+            self._supervisor.join()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            alive = sum(1 for process in self.processes.values() if process.is_alive())
+        stats = dict(self.stats)
+        stats["workers"] = self.workers
+        stats["alive"] = alive
+        return stats
+
+def start_worker_pool(queue: Optional[JobQueue] = None, workers: Optional[int] = None) -> Optional[WorkerPool]:
+    load_env()
+    workers = int(os.getenv("JOB_WORKERS", "2")) if workers is None else workers
+    if workers <= 0:
+        return None
+    return WorkerPool(
+        queue or get_job_queue(),
+        workers=workers,
+        heartbeat_interval=float(os.getenv("JOB_HEARTBEAT_INTERVAL", "5")),
+        stale_after=float(os.getenv("JOB_STALE_AFTER", "30")),
+        retention=float(os.getenv("JOB_RETENTION", "86400")),
+        metrics_port=int(os.getenv("METRICS_PORT", "0"))
+    ).start()
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run Planner -> Executor -> Verifier workers against the job queue")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Number of worker processes (default: JOB_WORKERS or 2)")
+    args = parser.parse_args(argv)
+    
+    load_env()
+    workers = args.workers if args.workers is not None else int(os.getenv("JOB_WORKERS", "2"))
+    start_metrics_server()
+    pool = start_worker_pool(workers=max(1, workers))
+    print(f"Started {pool.workers} worker(s) on {pool.queue.db_path}", file=sys.stderr)
+    if pool.metrics_port:
+        ports = ", ".join(str(pool.worker_metrics_port(worker_id)) for worker_id in pool.slots)
+        print(f"Worker metrics and traces on port(s) {ports}", file=sys.stderr)
+    try:
+        while True:
+            time.sleep(60)
+            stats = pool.queue.get_stats()
+            print(f"queued={stats['queued']} running={stats['running']} completed={stats['completed']} failed={stats['failed']}", file=sys.stderr)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pool.stop()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -1,3 +1,4 @@
 from .llm_client import LLMClient
+from .usage import UsageTracker, get_usage_tracker, track_usage, summarize_usage, merge_usage
 
-__all__ = ['LLMClient']
\ No newline at end of file
+__all__ = ['LLMClient', 'UsageTracker', 'get_usage_tracker', 'track_usage', 'summarize_usage', 'merge_usage']
\ No newline at end of file
@@ -1,34 +1,65 @@
 import os
 import json
-from typing import Dict, List, Any, Optional
-from openai import OpenAI
-from dotenv import load_dotenv
+import time
+import hashlib
+import threading
+from typing import Dict, List, Any, Optional, Iterator, Callable, Tuple
+from utils.env import load_env
+from utils.singleflight import SingleFlight
+from utils.rate_limit import get_limiter
+from utils.retry import RetryPolicy
+from utils.hedging import Hedger, get_hedger
+from utils.deadline import FAST_MODEL, DeadlineExceeded, current_deadline
+from utils.tracing import Tracer, get_tracer
+from llm.usage import UsageTracker, get_usage_tracker
+from tools.errors import RETRYABLE_STATUS_CODES, ToolError, parse_retry_after
 
-load_dotenv()
+_llm_flight = SingleFlight()
 
 class LLMClient:
-    def __init__(self, model: str = "gemini-2.5-flash"): 
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
+    CHARS_PER_TOKEN = 4
+    
+    def __init__(self, model: str = "gemini-2.5-flash", base_url: Optional[str] = None, flight: Optional[SingleFlight] = None, usage: Optional[UsageTracker] = None, tracer: Optional[Tracer] = None, hedger: Optional[Hedger] = None, retry_policy: Optional[RetryPolicy] = None):
+        load_env()
+        self.api_key = os.getenv("GEMINI_API_KEY")
+        if not self.api_key:
             raise ValueError("GEMINI_API_KEY not found in .env")
         
-        self.client = OpenAI(
-            api_key=api_key,
-            base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-        )
+        self.base_url = base_url or os.getenv("LLM_BASE_URL", "https://generativelanguage.googleapis.com/v1beta/openai/")
+        self._client = None
+        self._client_lock = threading.Lock()
         self.model = model
+        self.fast_model = os.getenv("GEMINI_FAST_MODEL", "gemini-2.5-flash-lite")
+        self.fast_model_below = float(os.getenv("LLM_FAST_MODEL_BELOW", "6"))
+        self.flight = flight or _llm_flight
+        self.request_limiter = get_limiter("llm_requests")
+        self.token_limiter = get_limiter("llm_tokens")
+        self.hedger = hedger or get_hedger("llm")
+        self.retry_policy = retry_policy or RetryPolicy(max_retries=int(os.getenv("LLM_MAX_RETRIES", "2")))
+        self.usage = usage or get_usage_tracker()
+        self.tracer = tracer or get_tracer()
+        self.stream_usage = os.getenv("LLM_STREAM_USAGE", "1") != "0"
     
-    def generate_structured_output(self, system_prompt: str, user_prompt: str, json_schema: Optional[Dict] = None, temperature: float = 0.7, max_tokens: int = 2000) -> Dict[str, Any]:
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    from openai import OpenAI
+                    self._client = OpenAI(api_key=self.api_key, base_url=self.base_url, max_retries=0)
+        return self._client
+    
+    def generate_structured_output(self, system_prompt: str, user_prompt: str, json_schema: Optional[Dict] = None, temperature: float = 0.7, max_tokens: int = 2000, agent: str = "default", timeout: Optional[float] = None) -> Dict[str, Any]:
         messages = [{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}]
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
+            content = self._complete(
+                agent,
+                timeout,
                 messages=messages,
                 temperature=temperature,
                 max_tokens=max_tokens,
                 response_format={"type": "json_object"} if json_schema else None
             )
-            content = response.choices[0].message.content
             try:
                 return json.loads(content)
             except json.JSONDecodeError:
@@ -36,10 +67,165 @@ class LLMClient:
         except Exception as e:
             raise Exception(f"LLM API call failed: {str(e)}")
     
-    def generate_text(self, system_prompt: str, user_prompt: str, temperature: float = 0.7, max_tokens: int = 1000) -> str:
+    def stream_structured_output(self, system_prompt: str, user_prompt: str, json_schema: Optional[Dict] = None, temperature: float = 0.7, max_tokens: int = 2000, agent: str = "default", timeout: Optional[float] = None) -> Iterator[str]:
+        messages = [{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}]
+        expires_at = time.monotonic() + timeout if timeout is not None else None
+        model = self.select_model(timeout)
+        try:
+            with self.tracer.span("llm.chat", agent=agent, model=model, stream=True, prompt_chars=self._prompt_chars(messages)):
+                started = time.perf_counter()
+                first_token = None
+                usage = None
+                completion_chars = 0
+                stream, reserved = self._create(expires_at, timeout, messages, max_tokens, lambda client, reserved: client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    response_format={"type": "json_object"} if json_schema else None,
+                    stream=True,
+                    extra_body={"stream_options": {"include_usage": True}} if self.stream_usage else None
+                ))
+                for chunk in stream:
+                    if expires_at is not None and time.monotonic() > expires_at:
+                        stream.close()
+                        raise DeadlineExceeded(f"{agent} LLM stream", timeout)
+                    usage = getattr(chunk, "usage", None) or usage
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        if first_token is None:
+                            first_token = time.perf_counter() - started
+                        completion_chars += len(chunk.choices[0].delta.content)
+                        yield chunk.choices[0].delta.content
+                self._record(agent, model, messages, usage, completion_chars, time.perf_counter() - started, reserved, first_token=first_token)
+        except Exception as e:
+            raise Exception(f"LLM API call failed: {str(e)}")
+    
+    def generate_text(self, system_prompt: str, user_prompt: str, temperature: float = 0.7, max_tokens: int = 1000, agent: str = "default", timeout: Optional[float] = None) -> str:
         messages = [{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}]
         try:
-            response = self.client.chat.completions.create(model=self.model, messages=messages, temperature=temperature, max_tokens=max_tokens)
-            return response.choices[0].message.content
+            return self._complete(agent, timeout, messages=messages, temperature=temperature, max_tokens=max_tokens)
         except Exception as e:
-            raise Exception(f"LLM API call failed: {str(e)}")
\ No newline at end of file
+            raise Exception(f"LLM API call failed: {str(e)}")
+    
+    def select_model(self, timeout: Optional[float]) -> str:
+        if timeout is None or not self.fast_model or timeout >= self.fast_model_below:
+            return self.model
+        deadline = current_deadline()
+        if deadline is not None:
+            deadline.degrade(FAST_MODEL)
+        return self.fast_model
+    
+    def _client_for(self, expires_at: Optional[float], timeout: Optional[float]) -> Any:
+        if expires_at is None:
+            return self.client
+        remaining = expires_at - time.monotonic()
+        if remaining <= 0:
+            raise DeadlineExceeded("LLM call", timeout)
+        return self.client.with_options(timeout=remaining)
+    
+    def _create(self, expires_at: Optional[float], timeout: Optional[float], messages: List[Dict[str, str]], max_tokens: int, send: Callable[[Any, int], Any]) -> Tuple[Any, int]:
+        for attempt in range(self.retry_policy.max_retries + 1):
+            reserved = self._acquire(messages, max_tokens)
+            try:
+                return send(self._client_for(expires_at, timeout), reserved), reserved
+            except Exception as e:
+                self.token_limiter.refund(reserved)
+                delay = self.retry_policy.next_delay(attempt, self._classify(e))
+                if delay is None or (expires_at is not None and time.monotonic() + delay >= expires_at):
+                    raise
+                time.sleep(delay)
+    
+    def _classify(self, error: Exception) -> ToolError:
+        from openai import APIConnectionError
+        
+        status = getattr(error, "status_code", None)
+        response = getattr(error, "response", None)
+        return ToolError(
+            str(error),
+            status_code=status,
+            retryable=status in RETRYABLE_STATUS_CODES if status is not None else isinstance(error, APIConnectionError),
+            retry_after=parse_retry_after(response.headers.get("Retry-After")) if response is not None else None
+        )
+    
+    def _prompt_chars(self, messages: List[Dict[str, str]]) -> int:
+        return sum(len(message["content"]) for message in messages)
+    
+    def _estimate_tokens(self, messages: List[Dict[str, str]]) -> int:
+        return self._prompt_chars(messages) // self.CHARS_PER_TOKEN
+    
+    def _acquire(self, messages: List[Dict[str, str]], max_tokens: int) -> int:
+        reserved = self._estimate_tokens(messages) + max_tokens
+        self.request_limiter.acquire()
+        self.token_limiter.acquire(reserved)
+        return reserved
+    
+    def _admit_hedge(self, reserved: int) -> bool:
+        if not self.request_limiter.try_acquire():
+            return False
+        if self.token_limiter.try_acquire(reserved):
+            return True
+        self.request_limiter.refund(1)
+        return False
+    
+    def _record(self, agent: str, model: str, messages: List[Dict[str, str]], usage: Any, completion_chars: int, latency: float, reserved: int, first_token: Optional[float] = None) -> None:
+        if isinstance(usage, dict):
+            prompt_tokens, completion_tokens = usage.get("prompt_tokens"), usage.get("completion_tokens")
+        else:
+            prompt_tokens, completion_tokens = getattr(usage, "prompt_tokens", None), getattr(usage, "completion_tokens", None)
+        
+        record = {
+            "agent": agent,
+            "model": model,
+            "prompt_tokens": prompt_tokens if prompt_tokens is not None else self._estimate_tokens(messages),
+            "completion_tokens": completion_tokens if completion_tokens is not None else completion_chars // self.CHARS_PER_TOKEN,
+            "latency": latency,
+            "first_token": first_token,
+            "estimated": prompt_tokens is None or completion_tokens is None,
+            "coalesced": False
+        }
+        unused = reserved - record["prompt_tokens"] - record["completion_tokens"]
+        if unused > 0:
+            self.token_limiter.refund(unused)
+        span = self.tracer.current_span()
+        if span is not None and span.name == "llm.chat":
+            span.set(
+                prompt_tokens=record["prompt_tokens"],
+                completion_tokens=record["completion_tokens"],
+                first_token=first_token,
+                estimated=record["estimated"]
+            )
+        self.usage.record(record)
+    
+    def _complete(self, agent: str, timeout: Optional[float], **request: Any) -> str:
+        expires_at = time.monotonic() + timeout if timeout is not None else None
+        model = self.select_model(timeout)
+        key = hashlib.sha256(
+            json.dumps([model, request], sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+        
+        def call() -> str:
+            started = time.perf_counter()
+            response, reserved = self._create(expires_at, timeout, request["messages"], request["max_tokens"], lambda client, reserved: self.hedger.run(
+                lambda: client.chat.completions.create(model=model, **request),
+                admit=lambda: self._admit_hedge(reserved)
+            ))
+            content = response.choices[0].message.content
+            self._record(agent, model, request["messages"], response.usage, len(content or ""), time.perf_counter() - started, reserved)
+            return content
+        
+        started = time.perf_counter()
+        with self.tracer.span("llm.chat", agent=agent, model=model, stream=False, prompt_chars=self._prompt_chars(request["messages"])) as span:
+            content, shared = self.flight.do(key, call, timeout=timeout)
+            span.set(coalesced=shared)
+        if shared:
+            self.usage.record({
+                "agent": agent,
+                "model": model,
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "latency": time.perf_counter() - started,
+                "first_token": None,
+                "estimated": False,
+                "coalesced": True
+            })
+        return content
\ No newline at end of file
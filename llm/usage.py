@@ -0,0 +1,78 @@
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Any, Optional, Iterator
+
+_request_usage: ContextVar[Optional[List[Dict[str, Any]]]] = ContextVar("llm_request_usage", default=None)
+
+def _accumulate(summary: Dict[str, Dict[str, Any]], record: Dict[str, Any]) -> None:
+    for name in (record["agent"], "total"):
+        totals = summary.setdefault(name, {
+            "calls": 0,
+            "coalesced": 0,
+            "estimated": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "latency": 0.0
+        })
+        totals["calls"] += 1
+        totals["coalesced"] += int(record["coalesced"])
+        totals["estimated"] += int(record["estimated"])
+        totals["prompt_tokens"] += record["prompt_tokens"]
+        totals["completion_tokens"] += record["completion_tokens"]
+        totals["latency"] += record["latency"]
+
+def summarize_usage(records: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    summary: Dict[str, Dict[str, Any]] = {}
+    for record in records:
+        _accumulate(summary, record)
+    return summary
+
+def merge_usage(summaries: List[Dict[str, Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    merged: Dict[str, Dict[str, Any]] = {}
+    for summary in summaries:
+        for name, totals in summary.items():
+            target = merged.setdefault(name, dict.fromkeys(totals, 0))
+            for field, value in totals.items():
+                target[field] += value
+    return merged
+
+@contextmanager
+def track_usage() -> Iterator[List[Dict[str, Any]]]:
+    records: List[Dict[str, Any]] = []
+    token = _request_usage.set(records)
+    try:
+        yield records
+    finally:
+        _request_usage.reset(token)
+
+class UsageTracker:
+    def __init__(self):
+        self._totals: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+    
+    def record(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            _accumulate(self._totals, record)
+        current = _request_usage.get()
+        if current is not None:
+            current.append(record)
+    
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {name: dict(totals) for name, totals in self._totals.items()}
+    
+    def reset(self) -> None:
+        with self._lock:
+            self._totals.clear()
+
+_default_tracker: Optional[UsageTracker] = None
+_default_tracker_lock = threading.Lock()
+
+def get_usage_tracker() -> UsageTracker:
+    global _default_tracker
+    if _default_tracker is None:
+        with _default_tracker_lock:
+            if _default_tracker is None:
+                _default_tracker = UsageTracker()
+    return _default_tracker
\ No newline at end of file
@@ -1,24 +1,241 @@
 import streamlit as st
+import os
 import time
-from agents.planner import PlannerAgent
-from agents.executor import ExecutorAgent
-from agents.verifier import VerifierAgent
+import uuid
+from jobs.queue import TERMINAL_STATUSES, QueueFull, get_job_queue
+from jobs.worker import start_worker_pool
 from llm.llm_client import LLMClient
+from utils.profiling import profile_request
+from utils.tracing import get_tracer, start_metrics_server
 
 st.set_page_config(page_title="AI Ops Assistant", page_icon="🤖", layout="wide")
 
-with st.sidebar:
-    st.header("System Status")
-    st.metric("Available Tools", "2")
-    st.metric("Active Agents", "3")
-    st.divider()
-    st.markdown("### Tools")
-    st.markdown("- GitHub Search")
-    st.markdown("- Weather API")
+MAX_HISTORY = 20
+POLL_INTERVAL = 0.5
+
+@st.cache_resource(show_spinner=False)
+def load_jobs():
+    LLMClient()
+    start_metrics_server()
+    queue = get_job_queue()
+    return queue, start_worker_pool(queue)
+
+def render_waterfall(spans):
+    import altair as alt
+    
+    if not spans:
+        st.caption("Trace no longer retained")
+        return
+    
+    children = {}
+    for span in spans:
+        children.setdefault(span["parent_id"], []).append(span)
+    
+    origin = spans[0]["start_ns"]
+    rows = []
+    pending = [(span, 0) for span in reversed(children.get(spans[0]["parent_id"], []))]
+    while pending:
+        span, depth = pending.pop()
+        pending.extend((child, depth + 1) for child in reversed(children.get(span["span_id"], [])))
+        rows.append({
+            "span": f"{len(rows) + 1:02d} {'  ' * depth}{span['name']}",
+            "start_ms": (span["start_ns"] - origin) / 1e6,
+            "end_ms": (span["end_ns"] - origin) / 1e6,
+            "duration_ms": round(span["duration"] * 1000, 1),
+            "status": span["status"]
+        })
+    
+    chart = alt.Chart(alt.Data(values=rows)).mark_bar().encode(
+        x=alt.X("start_ms:Q", title="ms"),
+        x2="end_ms:Q",
+        y=alt.Y("span:N", sort=None, title=None),
+        color=alt.Color("status:N", scale=alt.Scale(domain=["ok", "error"], range=["#4c78a8", "#e45756"]), legend=None),
+        tooltip=["span:N", "duration_ms:Q", "status:N"]
+    )
+    st.altair_chart(chart, use_container_width=True)
+    st.caption(f"Total {spans[0]['duration'] * 1000:.0f} ms across {len(spans)} span(s)")
+
+def format_unit(value, unit):
+    if value is None:
+        return "N/A"
+    return f"{value:g}{unit}" if isinstance(value, (int, float)) else f"{value}{unit}"
+
+def render_item(item):
+    item_type = item.get("type", "unknown")
+    
+    if item_type == "repo":
+        with st.expander(f" {item.get('name', 'Repository')}", expanded=True):
+            col1, col2 = st.columns(2)
+            with col1:
+                st.markdown(f"** Stars:** {item.get('stars', 0):,}")
+            with col2:
+                st.markdown(f"** URL:** [{item.get('name')}]({item.get('url')})")
+            if item.get('description'):
+                st.markdown(f"** Description:** {item.get('description')}")
+            if item.get('language'):
+                st.markdown(f"** Language:** {item.get('language')}")
+    
+    elif item_type == "weather":
+        with st.expander(f" {item.get('name', 'Weather')}", expanded=True):
+            col1, col2 = st.columns(2)
+            with col1:
+                st.markdown(f"** Temperature:** {format_unit(item.get('temperature'), '°C')}")
+            with col2:
+                st.markdown(f"** Condition:** {item.get('condition') or 'N/A'}")
+            if item.get('humidity') is not None:
+                st.markdown(f"** Humidity:** {format_unit(item.get('humidity'), '%')}")
+    
+    elif item_type == "weather_error":
+        st.warning(f"{item.get('name', 'Weather')}: {item.get('error')}")
+
+def render_sidebar():
+    try:
+        queue, pool = load_jobs()
+    except ValueError:
+        return
+    with st.sidebar:
+        st.header("System Status")
+        st.markdown("### Job Queue")
+        stats = queue.get_stats()
+        col1, col2 = st.columns(2)
+        col1.metric("Queued", stats["queued"])
+        col2.metric("Running", stats["running"])
+        if pool is not None:
+            st.caption(f"{pool.get_stats()['alive']}/{pool.workers} embedded worker(s) alive")
+        else:
+            st.caption("Jobs are run by external workers (python -m jobs.worker)")
+        st.divider()
+        result = st.session_state.get("last_result") or {}
+        st.markdown("### Latency Waterfall")
+        if result:
+            render_waterfall(result.get("spans"))
+        else:
+            st.caption("Run a task to see where its time goes")
+        st.divider()
+        st.markdown("### LLM Usage")
+        llm_totals = (result.get("llm_usage") or {}).get("total", {})
+        st.metric("LLM Calls", llm_totals.get("calls", 0))
+        st.metric("LLM Tokens", llm_totals.get("prompt_tokens", 0) + llm_totals.get("completion_tokens", 0))
+        speculation = (result.get("plan") or {}).get("speculation")
+        if speculation:
+            st.caption(f"Speculation: {speculation['hits']}/{speculation['predicted']} call(s) reused, {speculation['wasted']} wasted")
+        st.divider()
+        if st.button("Clear History", use_container_width=True):
+            st.session_state.history = []
+            st.session_state.active_job = None
+            st.session_state.last_result = None
+            st.rerun()
+
+def render_profile(report):
+    with st.expander(f"Profile ({report['samples']} CPU samples in {report['elapsed']:.2f}s)"):
+        st.markdown("**CPU samples by stage**")
+        st.table([{"stage": stage, "samples": samples} for stage, samples in sorted(report["stages"].items(), key=lambda item: -item[1])])
+        st.markdown("**Top allocations**")
+        st.table([
+            {"stage": row["stage"], "KiB": round(row["size_kib"], 1), "blocks": row["blocks"], "line": row["line"]}
+            for row in report["top_allocations"]
+        ])
+        st.caption(f"Collapsed stacks: {report['stacks']} · Allocations: {report['allocations']}")
+        if os.path.exists(report["stacks"]):
+            with open(report["stacks"], encoding="utf-8") as handle:
+                st.download_button("Download flamegraph stacks", handle.read(), file_name=os.path.basename(report["stacks"]))
+
+def render_job(queue, job_id):
+    job = queue.get(job_id)
+    if job is None:
+        st.warning("This task is no longer in the job queue")
+        return False
+    
+    rendered = st.session_state.setdefault("profiled_renders", set())
+    if job["status"] != "completed" or not job["profile"] or job_id in rendered:
+        return render_job_state(queue, job)
+    
+    rendered.add(job_id)
+    with profile_request(f"job-{job_id}-ui", True) as profile, get_tracer().span("ui.render", job_id=job_id):
+        polling = render_job_state(queue, job)
+    st.caption(f"UI render profile: {profile.report['stacks']}, {profile.report['allocations']}")
+    return polling
+
+def render_job_state(queue, job):
+    job_id = job["id"]
+    st.markdown("---")
+    st.markdown("### Processing Your Request")
+    events = queue.events(job_id)
+    steps = [event["payload"] for event in events if event["type"] == "step"]
+    finished = job["status"] in TERMINAL_STATUSES
+    
+    if job["status"] == "queued":
+        label = f"Queued at position {job['position']}..."
+    elif job["status"] == "running":
+        label = "Verifying results..." if any(event["type"] == "verifying" for event in events) else "Planning steps and executing them as they arrive..."
+    elif job["status"] == "completed":
+        label = "✅ Task completed!"
+    else:
+        label = "❌ Task failed"
+    
+    with st.status(label, expanded=not finished, state="complete" if job["status"] == "completed" else "error" if finished else "running"):
+        if job["attempts"] > 1:
+            st.write(f"Retrying after a worker failure (attempt {job['attempts']})")
+        for step in steps:
+            step_status = "✓" if step["status"] == "success" else "✗"
+            st.write(f"{step_status} Step {step['step_number']}: {step['description']} ({step['finished_at']:.2f}s)")
+        if job["status"] == "completed":
+            result = job["result"]
+            st.write(f"✓ Ran {len(result['steps'])} step(s) in {result['elapsed']:.2f}s")
+            st.write(f"✓ Verified by {result['verified_by']}")
+            degraded = (result.get("deadline") or {}).get("degraded")
+            if degraded:
+                st.write(f"⏱ Degraded to meet the deadline: {', '.join(degraded)}")
+    
     st.divider()
-    if st.button("Clear History", use_container_width=True):
-        st.session_state.history = []
-        st.rerun()
+    st.markdown("### Results")
+    summary_slot = st.empty()
+    shown = 0
+    for step in steps:
+        for item in step["items"]:
+            render_item(item)
+            shown += 1
+        if step["status"] != "success":
+            st.error(f"Step {step['step_number']} failed: {step.get('error')}")
+    
+    if job["status"] == "failed":
+        st.error(f"❌ Error: {job['error']}")
+        return False
+    
+    if job["status"] != "completed":
+        return True
+    
+    result = job["result"]
+    st.session_state.last_result = result
+    if result.get("is_complete", False):
+        summary_slot.success(result["summary"])
+    else:
+        summary_slot.warning(result["summary"])
+    if result.get("partial"):
+        st.warning("⏱ The deadline was reached before every step finished; showing partial results")
+    
+    if not shown:
+        st.info("No data returned from execution")
+    
+    plan = result["plan"]
+    st.markdown("####Generated Plan")
+    st.caption(f"Plan source: {plan.get('plan_source', 'llm')}")
+    for agent, totals in (result.get("llm_usage") or {}).items():
+        if agent != "total":
+            st.caption(
+                f"LLM {agent}: {totals['prompt_tokens']} prompt + {totals['completion_tokens']} completion tokens "
+                f"in {totals['latency']:.2f}s"
+            )
+    st.json(plan)
+    
+    st.markdown("####Execution Results")
+    for step in result["steps"]:
+        step_status = "✅" if step["status"] == "success" else "❌"
+        st.markdown(f"{step_status} **Step {step['step_number']}**: {step['description']}")
+    
+    if result.get("profile"):
+        render_profile(result["profile"])
+    return False
 
 def main():
     st.title(" AI Operations Assistant")
@@ -26,12 +243,11 @@ def main():
     
     if "history" not in st.session_state:
         st.session_state.history = []
+    if "user_id" not in st.session_state:
+        st.session_state.user_id = uuid.uuid4().hex
     
     try:
-        llm = LLMClient()
-        planner = PlannerAgent(llm)
-        executor = ExecutorAgent()
-        verifier = VerifierAgent(llm)
+        queue, _ = load_jobs()
         
         st.markdown("###  Enter Your Task")
         user_input = st.text_input(
@@ -43,81 +259,22 @@ def main():
         col1, col2 = st.columns([1, 5])
         with col1:
             execute_button = st.button("Execute", type="primary", use_container_width=True)
+        with col2:
+            profile = st.checkbox("Profile this request", help="Record a CPU flamegraph and top allocations for each pipeline stage")
         
         if execute_button and user_input:
-            st.session_state.history.append({"task": user_input, "timestamp": time.time()})
-            
-            st.markdown("---")
-            st.markdown("### Processing Your Request")
-            
             try:
-                st.write(" Planning steps...")
-                plan = planner.create_plan(user_input)
-                
-                st.markdown("####Generated Plan")
-                st.json(plan)
-                
-                time.sleep(1)
-                
-                st.write("Executing plan...")
-                exec_results = executor.execute_plan(plan)
-                
-                st.markdown("####Execution Results")
-                for step in exec_results.get("steps", []):
-                    step_status = "✅" if step["status"] == "success" else "❌"
-                    st.markdown(f"{step_status} **Step {step['step_number']}**: {step['description']}")
-                
-                time.sleep(1)
-                
-                st.write("✓ Verifying results...")
-                verification = verifier.verify_results(user_input, plan, exec_results)
-                
-                st.success("✅ Task completed!")
-                
-            except Exception as e:
-                st.error(f"❌ Error: {str(e)}")
-                return
-            
-            output = verification.get("formatted_output", {})
-            
-            st.divider()
-            st.markdown("### Results")
-            
-            summary = output.get("summary", "Task completed")
-            if verification.get("is_complete", False):
-                st.success(f"{summary}")
+                job_id = queue.submit(user_input, st.session_state.user_id, profile=profile)
+            except QueueFull as e:
+                st.warning(f"⏳ {str(e)}")
             else:
-                st.warning(f"{summary}")
+                st.session_state.active_job = job_id
+                st.session_state.history.append({"task": user_input, "timestamp": time.time(), "job_id": job_id})
+                del st.session_state.history[:-MAX_HISTORY]
             
-            if "data" in output and output["data"]:
-                st.markdown("###  Detailed Data")
-                
-                for item in output["data"]:
-                    item_type = item.get("type", "unknown")
-                    
-                    if item_type == "repo":
-                        with st.expander(f" {item.get('name', 'Repository')}", expanded=True):
-                            col1, col2 = st.columns(2)
-                            with col1:
-                                st.markdown(f"** Stars:** {item.get('stars', 'N/A')}")
-                            with col2:
-                                st.markdown(f"** URL:** [{item.get('name')}]({item.get('url')})")
-                            if item.get('description'):
-                                st.markdown(f"** Description:** {item.get('description')}")
-                            if item.get('language'):
-                                st.markdown(f"** Language:** {item.get('language')}")
-                    
-                    elif item_type == "weather":
-                        with st.expander(f" {item.get('name', 'Weather')}", expanded=True):
-                            col1, col2 = st.columns(2)
-                            with col1:
-                                st.markdown(f"** Temperature:** {item.get('temperature', 'N/A')}")
-                            with col2:
-                                st.markdown(f"** Condition:** {item.get('condition', 'N/A')}")
-                            if item.get('humidity'):
-                                st.markdown(f"** Humidity:** {item.get('humidity')}")
-            else:
-                st.info("No data returned from execution")
+        polling = False
+        if st.session_state.get("active_job"):
+            polling = render_job(queue, st.session_state.active_job)
         
         if st.session_state.history:
             st.divider()
@@ -125,12 +282,19 @@ def main():
             for idx, task in enumerate(reversed(st.session_state.history[-5:])):
                 st.text(f"{len(st.session_state.history) - idx}. {task['task']}")
     
+        return polling
+    
     except ValueError as e:
         st.error(f"Configuration Error: {str(e)}")
         st.info("Please ensure your .env file is properly configured with all required API keys.")
     except Exception as e:
         st.error(f"Unexpected Error: {str(e)}")
         st.info("Please check your configuration and try again.")
+    return False
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    polling = main()
+    render_sidebar()
+    if polling:
+        time.sleep(POLL_INTERVAL)
+        st.rerun()
\ No newline at end of file
@@ -0,0 +1,112 @@
+import json
+import time
+import threading
+import pytest
+from agents.plan_cache import PlanCache
+from agents.planner import PlannerAgent
+from utils.deadline import FAST_MODEL, PARTIAL_RESULTS, RULES_ONLY, Deadline, DeadlineExceeded, create_deadline, current_deadline, deadline_scope
+from utils.tracing import Tracer
+
+PLAN = {
+    "task_summary": "Weather in Lisbon",
+    "steps": [{"step_number": 1, "action": "weather_get", "description": "Get weather", "parameters": {"city": "Lisbon"}, "depends_on": []}],
+    "expected_output": "Weather"
+}
+
+class RecordingLLM:
+    def __init__(self):
+        self.timeouts = []
+    
+    def generate_structured_output(self, timeout=None, **kwargs):
+        self.timeouts.append(timeout)
+        return json.loads(json.dumps(PLAN))
+    
+    def stream_structured_output(self, timeout=None, **kwargs):
+        self.timeouts.append(timeout)
+        yield json.dumps(PLAN)
+
+def test_stage_budgets_are_shares_of_what_remains():
+    deadline = Deadline(10)
+    assert deadline.budget("plan") == pytest.approx(5, abs=0.05)
+    assert deadline.budget("stream_plan") == pytest.approx(6, abs=0.05)
+    assert deadline.budget("execute") == pytest.approx(8.5, abs=0.05)
+    assert deadline.budget("verify") == pytest.approx(10, abs=0.05)
+    assert deadline.budget("stream_plan") < deadline.budget("execute")
+
+def test_waiting_counts_against_the_deadline():
+    deadline = Deadline(10, started_at=time.time() - 4)
+    assert deadline.remaining() == pytest.approx(6, abs=0.05)
+    assert not Deadline(1, started_at=time.time() - 2).remaining()
+
+def test_check_raises_once_expired():
+    deadline = Deadline(0.01)
+    deadline.check("planning")
+    time.sleep(0.02)
+    with pytest.raises(DeadlineExceeded, match="during execution"):
+        deadline.check("execution")
+
+def test_timeout_is_capped_by_the_remaining_budget():
+    deadline = Deadline(2)
+    assert deadline.timeout(10, "http request") == pytest.approx(2, abs=0.05)
+    assert deadline.timeout(1, "http request") == 1
+    assert deadline.timeout(None, "http request") == pytest.approx(2, abs=0.05)
+
+def test_stages_share_degradations_and_their_lock():
+    deadline = Deadline(10)
+    execute = deadline.stage("execute")
+    verify = deadline.stage("verify")
+    assert execute.seconds == pytest.approx(8.5, abs=0.05)
+    assert execute._lock is deadline._lock is verify._lock
+    
+    execute.degrade(PARTIAL_RESULTS)
+    verify.degrade(RULES_ONLY)
+    deadline.degrade(PARTIAL_RESULTS)
+    assert deadline.snapshot()["degraded"] == [PARTIAL_RESULTS, RULES_ONLY]
+
+def test_concurrent_degrades_from_stages_are_recorded_once():
+    deadline = Deadline(10)
+    stages = [deadline.stage("execute") for _ in range(8)]
+    levels = [f"level_{index}" for index in range(50)]
+    
+    def degrade(stage):
+        for level in levels:
+            stage.degrade(level)
+            stage.degrade(FAST_MODEL)
+    
+    threads = [threading.Thread(target=degrade, args=(stage,)) for stage in stages]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(deadline.degraded) == sorted(levels + [FAST_MODEL])
+
+def test_deadline_scope_sets_and_restores_the_current_deadline():
+    deadline = Deadline(5)
+    assert current_deadline() is None
+    with deadline_scope(deadline):
+        assert current_deadline() is deadline
+    assert current_deadline() is None
+
+def test_create_deadline_reads_environment(monkeypatch):
+    monkeypatch.setenv("REQUEST_DEADLINE", "12")
+    assert create_deadline().seconds == 12
+    monkeypatch.setenv("REQUEST_DEADLINE", "0")
+    assert create_deadline() is None
+    assert create_deadline(seconds=3).seconds == 3
+
+def make_planner():
+    llm = RecordingLLM()
+    return PlannerAgent(llm, plan_cache=PlanCache(), fast_path=False, tracer=Tracer()), llm
+
+def test_streamed_plan_uses_its_own_share():
+    planner, llm = make_planner()
+    with deadline_scope(Deadline(10)):
+        events = list(planner.stream_plan("Weather in Lisbon"))
+    assert events[-1]["type"] == "plan"
+    assert llm.timeouts == [pytest.approx(6, abs=0.05)]
+
+def test_non_streamed_plan_uses_plan_share():
+    planner, llm = make_planner()
+    with deadline_scope(Deadline(10)):
+        planner.create_plan("Weather in Lisbon")
+    assert llm.timeouts == [pytest.approx(5, abs=0.05)]
\ No newline at end of file
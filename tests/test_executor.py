@@ -0,0 +1,138 @@
+import time
+import pytest
+from typing import Dict, List, Any
+from agents.executor import ExecutorAgent
+from tools.cache import ToolCache
+from tools.errors import ToolError
+from tools.registry import ToolRegistry, ToolSpec
+from utils.circuit_breaker import get_breaker
+from utils.deadline import PARTIAL_RESULTS, Deadline, deadline_scope
+from utils.retry import RetryPolicy
+
+class SleepTool:
+    def __init__(self):
+        self.calls = []
+    
+    def run(self, name: str = "", delay: str = "0", fail: str = "") -> Dict[str, Any]:
+        self.calls.append(name)
+        time.sleep(float(delay))
+        if fail:
+            raise ToolError(f"{name} failed", status_code=int(fail), retryable=int(fail) >= 500)
+        return {"name": name}
+
+def make_executor(action: str) -> ExecutorAgent:
+    tool = SleepTool()
+    registry = ToolRegistry()
+    registry.register(ToolSpec(
+        name=action,
+        description="Sleep",
+        entry_point="tests:SleepTool",
+        method="run",
+        parameters={"name": {"type": "string"}, "delay": {"type": "string", "default": "0"}, "fail": {"type": "string"}},
+        cacheable=False
+    ), instance=tool)
+    return ExecutorAgent(registry=registry, cache=ToolCache(ttls={}), retry_policy=RetryPolicy(max_retries=2, base_delay=0, jitter=0))
+
+def step(number: int, action: str, depends_on: List[int] = (), **parameters: Any) -> Dict[str, Any]:
+    return {"step_number": number, "action": action, "description": f"Step {number}", "parameters": parameters, "depends_on": list(depends_on)}
+
+def plan(*steps: Dict[str, Any]) -> Dict[str, Any]:
+    return {"task_summary": "Test plan", "steps": list(steps), "expected_output": ""}
+
+def test_independent_steps_run_concurrently():
+    executor = make_executor("sleep_parallel")
+    started = time.perf_counter()
+    results = executor.execute_plan(plan(*(step(number, "sleep_parallel", name=str(number), delay="0.2") for number in (1, 2, 3))))
+    
+    assert time.perf_counter() - started < 0.5
+    assert results["status"] == "success"
+    assert [result["step_number"] for result in results["steps"]] == [1, 2, 3]
+    assert all(result["started_at"] < 0.1 for result in results["steps"])
+
+def test_dependent_steps_wait_for_their_parents():
+    executor = make_executor("sleep_chain")
+    results = executor.execute_plan(plan(
+        step(1, "sleep_chain", name="a", delay="0.1"),
+        step(2, "sleep_chain", name="b", delay="0.2"),
+        step(3, "sleep_chain", [1, 2], name="c")
+    ))
+    
+    first, second, third = results["steps"]
+    assert third["started_at"] >= max(first["finished_at"], second["finished_at"])
+    assert first["started_at"] < 0.1 and second["started_at"] < 0.1
+    assert set(results["data"]) == {"step_1_sleep_chain", "step_2_sleep_chain", "step_3_sleep_chain"}
+
+def test_results_are_streamed_as_steps_finish():
+    executor = make_executor("sleep_stream")
+    stream = executor.stream_results(executor._plan_events(plan(
+        step(1, "sleep_stream", name="slow", delay="0.2"),
+        step(2, "sleep_stream", name="fast")
+    )))
+    
+    assert [result["step_number"] for result in stream] == [2, 1]
+    assert stream.results["status"] == "success"
+
+@pytest.mark.parametrize("steps, message", [
+    ([step(1, "sleep_graph", [2]), step(2, "sleep_graph", [1])], "dependency cycle between steps: \\[1, 2\\]"),
+    ([step(1, "sleep_graph"), step(2, "sleep_graph", [3]), step(3, "sleep_graph", [2])], "dependency cycle between steps: \\[2, 3\\]"),
+    ([step(1, "sleep_graph", [5])], "Step 1 depends on missing step 5"),
+    ([step(1, "sleep_graph"), step(1, "sleep_graph")], "duplicate step numbers")
+])
+def test_invalid_graphs_are_rejected_before_running(steps, message):
+    executor = make_executor("sleep_graph")
+    with pytest.raises(ValueError, match=message):
+        executor.execute_plan(plan(*steps))
+    assert executor.registry.get_tool("sleep_graph").calls == []
+
+def test_failed_steps_are_reported_without_stopping_others():
+    executor = make_executor("sleep_fail")
+    results = executor.execute_plan(plan(
+        step(1, "sleep_fail", name="bad", fail="404"),
+        step(2, "sleep_fail", name="good")
+    ))
+    
+    failed, succeeded = results["steps"]
+    assert results["status"] == "partial_failure"
+    assert results["errors"] == [{"step": 1, "error": "bad failed"}]
+    assert failed["retries"] == 0 and failed["retryable"] is False
+    assert succeeded["status"] == "success"
+    assert list(results["data"]) == ["step_2_sleep_fail"]
+
+def test_retryable_failures_are_retried():
+    executor = make_executor("sleep_retry")
+    results = executor.execute_plan(plan(step(1, "sleep_retry", name="flaky", fail="503")))
+    assert results["steps"][0]["retries"] == 2
+    assert executor.registry.get_tool("sleep_retry").calls == ["flaky"] * 3
+
+def test_steps_past_the_deadline_are_reported_as_timed_out():
+    executor = make_executor("sleep_deadline")
+    deadline = Deadline(0.5)
+    started = time.perf_counter()
+    with deadline_scope(deadline):
+        results = executor.execute_plan(plan(
+            step(1, "sleep_deadline", name="fast"),
+            step(2, "sleep_deadline", name="slow", delay="2"),
+            step(3, "sleep_deadline", [2], name="after")
+        ))
+    
+    assert time.perf_counter() - started < 1.5
+    fast, slow, after = results["steps"]
+    assert results["partial"] is True
+    assert fast["status"] == "success"
+    assert slow["timed_out"] and after["timed_out"]
+    assert "Deadline exceeded during execution" in slow["error"]
+    assert sorted(executor.registry.get_tool("sleep_deadline").calls) == ["fast", "slow"]
+    assert PARTIAL_RESULTS in deadline.degraded
+
+def test_only_retryable_failures_trip_the_breaker():
+    executor = make_executor("sleep_breaker_4xx")
+    executor.execute_plan(plan(*(step(number, "sleep_breaker_4xx", name=f"missing{number}", fail="404") for number in range(1, 7))))
+    assert get_breaker("sleep_breaker_4xx").snapshot()["state"] == "closed"
+    
+    executor = make_executor("sleep_breaker_5xx")
+    executor.execute_plan(plan(*(step(number, "sleep_breaker_5xx", name=f"down{number}", fail="503") for number in range(1, 3))))
+    assert get_breaker("sleep_breaker_5xx").snapshot()["state"] == "open"
+    
+    results = executor.execute_plan(plan(step(1, "sleep_breaker_5xx", name="late")))
+    assert "Circuit for sleep_breaker_5xx is open" in results["steps"][0]["error"]
+    assert executor.registry.get_tool("sleep_breaker_5xx").calls.count("late") == 0
\ No newline at end of file
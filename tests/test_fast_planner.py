@@ -0,0 +1,70 @@
+import pytest
+from agents.fast_planner import FastPathPlanner
+from agents.request_parser import extract_cities, parse_request
+
+def steps(request):
+    plan = FastPathPlanner().plan(request)
+    return None if plan is None else [(step["action"], step["parameters"]) for step in plan["steps"]]
+
+@pytest.mark.parametrize("request_text, expected", [
+    ("weather in Delhi please", [("weather_get", {"city": "Delhi"})]),
+    ("weather in Mexico City", [("weather_get", {"city": "Mexico City"})]),
+    ("weather in Paris, London and Tokyo", [("weather_get", {"cities": ["Paris", "London", "Tokyo"]})]),
+    ("weather in Delhi and weather in Oslo", [("weather_get", {"cities": ["Delhi", "Oslo"]})]),
+    ("Show most forked Go repositories", [("github_search", {"query": "go", "sort": "forks", "max_results": 5})]),
+    ("Find 3 recently updated rust repos", [("github_search", {"query": "rust", "sort": "updated", "max_results": 3})]),
+    ("Find python and rust repos", [
+        ("github_search", {"query": "python", "sort": "stars", "max_results": 5}),
+        ("github_search", {"query": "rust", "sort": "stars", "max_results": 5})
+    ]),
+    ("Find top 10 python repos and weather in Mexico City", [
+        ("github_search", {"query": "python", "sort": "stars", "max_results": 10}),
+        ("weather_get", {"city": "Mexico City"})
+    ])
+])
+def test_simple_requests_are_planned_locally(request_text, expected):
+    assert steps(request_text) == expected
+
+@pytest.mark.parametrize("request_text", [
+    "What's the weather in Delhi tomorrow?",
+    "next week in london weather",
+    "weather in my city",
+    "weather for the repo owner's city",
+    "find python repos about machine learning",
+    "find repos",
+    "python"
+])
+def test_ambiguous_requests_fall_back_to_the_llm(request_text):
+    assert steps(request_text) is None
+
+def test_max_results_is_clamped():
+    assert steps("find top 500 python repos")[0][1]["max_results"] == 100
+
+def test_plan_numbers_steps_in_order():
+    plan = FastPathPlanner().plan("Find python repos and weather in Oslo")
+    assert [step["step_number"] for step in plan["steps"]] == [1, 2]
+    assert plan["task_summary"] == "Find top Python repositories and get the current weather in Oslo"
+
+@pytest.mark.parametrize("text, cities", [
+    ("weather in new york today", ["New York"]),
+    ("temperature at oslo, lima and pune?", ["Oslo", "Lima", "Pune"]),
+    ("weather in the owner's city", []),
+    ("weather in 2024", [])
+])
+def test_extract_cities(text, cities):
+    assert [city for _, _, city in extract_cities(text)] == cities
+
+def test_template_key_replaces_slots():
+    parsed = parse_request("Find top 10 Python repos and weather in Mexico City")
+    assert parsed.template_key == "top {num0} {lang0} repo weather {city0}"
+    assert parsed.slots() == [("lang0", "Python"), ("city0", "Mexico City"), ("num0", "10")]
+
+def test_requests_differing_only_in_slots_share_a_key():
+    first = parse_request("find 5 rust repos and the weather in oslo")
+    second = parse_request("Get 20 Go repositories plus weather in Lima")
+    assert first.template_key == second.template_key
+
+def test_repeated_numbers_share_a_slot():
+    parsed = parse_request("top 5 java repos with 5 stars")
+    assert parsed.template_key == "top {num0} {lang0} repo {num0} stars"
+    assert parsed.slots() == [("lang0", "Java"), ("num0", "5")]
\ No newline at end of file
@@ -0,0 +1,68 @@
+import pytest
+from benchmarks.stand_ins import Behaviour, GitHubStandIn
+from tools.github_tool import GitHubTool
+from tools.http_client import HTTPClientPool
+from utils.hedging import Hedger
+from utils.rate_limit import TokenBucket
+
+class ChangingGitHub(GitHubStandIn):
+    changed_page = None
+    
+    def search(self, query, per_page, page=1):
+        payload = super().search(query, per_page, page)
+        if page == self.changed_page:
+            payload["items"][0]["description"] = "Updated"
+        return payload
+
+@pytest.fixture
+def github():
+    stand_in = ChangingGitHub(Behaviour(latency_ms=0, sigma=0)).start()
+    yield stand_in
+    stand_in.stop()
+
+@pytest.fixture
+def pool():
+    pool = HTTPClientPool()
+    yield pool
+    pool.close()
+
+def make_tool(monkeypatch, github, pool, capacity):
+    monkeypatch.setenv("GITHUB_API_URL", github.url)
+    limiter = TokenBucket("github", rate_per_minute=1, capacity=capacity, max_wait=0)
+    return GitHubTool(http_pool=pool, limiter=limiter, hedger=Hedger("github", enabled=False))
+
+def test_revalidation_does_not_wait_for_a_slot(monkeypatch, github, pool):
+    tool = make_tool(monkeypatch, github, pool, capacity=1)
+    data, etag = tool.search_conditional("python", max_results=5)
+    assert len(data["repositories"]) == 5
+    assert not tool.limiter.try_acquire()
+    
+    assert tool.search_conditional("python", max_results=5, etag=etag) == (None, etag)
+    assert github.stats["not_modified"] == 1
+
+def test_not_modified_refunds_the_slot(monkeypatch, github, pool):
+    tool = make_tool(monkeypatch, github, pool, capacity=2)
+    _, etag = tool.search_conditional("python", max_results=5)
+    tool.search_conditional("python", max_results=5, etag=etag)
+    assert tool.limiter.try_acquire()
+    assert not tool.limiter.try_acquire()
+
+def test_multi_page_search_revalidates_every_page(monkeypatch, github, pool):
+    tool = make_tool(monkeypatch, github, pool, capacity=10)
+    data, etag = tool.search_conditional("python", max_results=150)
+    assert len(data["repositories"]) == 150
+    assert len(etag.split(" ")) == 2
+    
+    assert tool.search_conditional("python", max_results=150, etag=etag) == (None, etag)
+    assert github.stats["not_modified"] == 2
+
+def test_changed_later_page_refetches_search(monkeypatch, github, pool):
+    tool = make_tool(monkeypatch, github, pool, capacity=10)
+    _, etag = tool.search_conditional("python", max_results=150)
+    github.changed_page = 2
+    
+    data, new_etag = tool.search_conditional("python", max_results=150, etag=etag)
+    assert len(data["repositories"]) == 150
+    assert data["repositories"][75].description == "Updated"
+    assert new_etag.split(" ")[0] == etag.split(" ")[0]
+    assert new_etag != etag
\ No newline at end of file
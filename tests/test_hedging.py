@@ -0,0 +1,109 @@
+import time
+import asyncio
+import threading
+from utils.hedging import Hedger
+
+class ScriptedCall:
+    def __init__(self, *delays):
+        self.delays = list(delays)
+        self.started = 0
+        self._lock = threading.Lock()
+    
+    def next_delay(self):
+        with self._lock:
+            self.started += 1
+            return self.delays.pop(0) if self.delays else 0.0
+    
+    def __call__(self):
+        delay = self.next_delay()
+        time.sleep(delay)
+        return delay
+    
+    async def run_async(self):
+        delay = self.next_delay()
+        await asyncio.sleep(delay)
+        return delay
+
+def warmed(count=4, **kwargs):
+    hedger = Hedger("test", min_samples=count, percentile=50, budget=0.25, **kwargs)
+    for _ in range(count):
+        hedger.run(ScriptedCall(0.0))
+    return hedger
+
+def test_no_threshold_until_enough_samples():
+    hedger = Hedger("test", min_samples=3, budget=1.0)
+    call = ScriptedCall(0.1)
+    assert hedger.run(call) == 0.1
+    assert hedger.threshold() is None
+    assert call.started == 1
+    assert hedger.snapshot()["hedged"] == 0
+
+def test_threshold_is_the_configured_percentile():
+    hedger = Hedger("test", min_samples=4, percentile=50, budget=0)
+    for delay in (0.04, 0.01, 0.03, 0.02):
+        hedger.run(ScriptedCall(delay))
+    assert 0.02 <= hedger.threshold() < 0.03
+
+def test_slow_calls_are_hedged_and_the_fast_copy_wins():
+    hedger = warmed()
+    call = ScriptedCall(0.5, 0.0)
+    started = time.monotonic()
+    
+    assert hedger.run(call) == 0.0
+    assert time.monotonic() - started < 0.4
+    assert call.started == 2
+    snapshot = hedger.snapshot()
+    assert (snapshot["hedged"], snapshot["hedge_wins"], snapshot["denied"]) == (1, 1, 0)
+
+def test_hedges_spend_the_budget_earned_by_calls():
+    hedger = warmed()
+    hedger.run(ScriptedCall(0.2, 0.0))
+    
+    call = ScriptedCall(0.2, 0.0)
+    assert hedger.run(call) == 0.2
+    assert call.started == 1
+    assert hedger.snapshot()["denied"] == 1
+    
+    for _ in range(3):
+        hedger.run(ScriptedCall(0.0))
+    assert hedger.run(ScriptedCall(0.2, 0.0)) == 0.0
+    assert hedger.snapshot()["hedged"] == 2
+
+def test_refused_admission_keeps_the_token():
+    hedger = warmed()
+    call = ScriptedCall(0.2, 0.0)
+    assert hedger.run(call, admit=lambda: False) == 0.2
+    assert call.started == 1
+    assert hedger.snapshot()["denied"] == 1
+    
+    assert hedger.run(ScriptedCall(0.2, 0.0), admit=lambda: True) == 0.0
+    assert hedger.snapshot()["hedged"] == 1
+
+def test_errors_from_one_copy_do_not_hide_the_other():
+    hedger = warmed()
+    attempts = []
+    
+    def call():
+        attempts.append(len(attempts))
+        if len(attempts) == 1:
+            time.sleep(0.1)
+            raise ValueError("primary failed")
+        return "hedge"
+    
+    assert hedger.run(call) == "hedge"
+
+def test_async_calls_are_hedged():
+    hedger = warmed()
+    call = ScriptedCall(0.5, 0.0)
+    started = time.monotonic()
+    
+    assert asyncio.run(hedger.run_async(call.run_async)) == 0.0
+    assert time.monotonic() - started < 0.4
+    assert hedger.snapshot()["hedge_wins"] == 1
+
+def test_disabled_hedger_just_calls_through():
+    hedger = Hedger("test", enabled=False, min_samples=0, budget=10)
+    call = ScriptedCall(0.05, 0.0)
+    assert hedger.run(call) == 0.05
+    assert call.started == 1
+    assert hedger.snapshot()["calls"] == 0
\ No newline at end of file
@@ -0,0 +1,90 @@
+import asyncio
+import pytest
+from benchmarks.stand_ins import Behaviour, GitHubStandIn, WeatherStandIn
+from tools.errors import ToolError
+from tools.github_tool import GitHubTool
+from tools.http_client import HTTPClientPool
+from tools.records import RepositoryRecord
+from tools.weather_tool import WeatherTool
+from utils.hedging import Hedger
+from utils.rate_limit import TokenBucket
+
+class RecordingGitHub(GitHubStandIn):
+    def handle(self, handler, path, query, body):
+        self.clients.add(handler.client_address)
+        super().handle(handler, path, query, body)
+
+@pytest.fixture
+def github():
+    stand_in = RecordingGitHub(Behaviour(latency_ms=0, sigma=0))
+    stand_in.clients = set()
+    stand_in.start()
+    yield stand_in
+    stand_in.stop()
+
+@pytest.fixture
+def weather():
+    stand_in = WeatherStandIn(Behaviour(latency_ms=0, sigma=0)).start()
+    yield stand_in
+    stand_in.stop()
+
+@pytest.fixture
+def pool():
+    pool = HTTPClientPool()
+    yield pool
+    pool.close()
+
+def limiter(name):
+    return TokenBucket(name, rate_per_minute=6000, capacity=100, max_wait=0)
+
+def github_tool(monkeypatch, github, pool):
+    monkeypatch.setenv("GITHUB_API_URL", github.url)
+    return GitHubTool(http_pool=pool, limiter=limiter("github"), hedger=Hedger("github", enabled=False))
+
+def weather_tool(monkeypatch, weather, pool):
+    monkeypatch.setenv("OPENWEATHER_API_URL", weather.url)
+    monkeypatch.setenv("OPENWEATHER_API_KEY", "test-key")
+    return WeatherTool(http_pool=pool, limiter=limiter("openweather"), hedger=Hedger("openweather", enabled=False))
+
+def test_sync_and_async_search_agree(monkeypatch, github, pool):
+    tool = github_tool(monkeypatch, github, pool)
+    
+    data = tool.search("python", max_results=3)
+    assert asyncio.run(tool.search_async("python", max_results=3)) == data
+    assert len(data["repositories"]) == 3
+    assert all(isinstance(repo, RepositoryRecord) for repo in data["repositories"])
+
+def test_sequential_calls_reuse_one_connection(monkeypatch, github, pool):
+    tool = github_tool(monkeypatch, github, pool)
+    for _ in range(5):
+        tool.search("python", max_results=3)
+    
+    assert github.stats["requests"] == 5
+    assert len(github.clients) == 1
+
+def test_async_calls_run_concurrently_from_another_loop(monkeypatch, weather, pool):
+    tool = weather_tool(monkeypatch, weather, pool)
+    
+    async def fetch_all():
+        return await asyncio.gather(*(tool.get_weather_async(city) for city in ["Oslo", "Lima", "Pune"]))
+    
+    readings = asyncio.run(fetch_all())
+    assert [reading.city for reading in readings] == ["Oslo", "Lima", "Pune"]
+    assert tool.get_weather("Oslo") == readings[0]
+
+def test_unknown_city_is_a_404_tool_error(monkeypatch, weather, pool):
+    tool = weather_tool(monkeypatch, weather, pool)
+    with pytest.raises(ToolError) as error:
+        tool.get_weather("Nowhere")
+    assert error.value.status_code == 404
+
+def test_iter_search_streams_records(monkeypatch, github, pool):
+    tool = github_tool(monkeypatch, github, pool)
+    names = [repo.full_name for repo in tool.iter_search("python", max_results=4)]
+    assert names == [repo.full_name for repo in tool.search("python", max_results=4)["repositories"]]
+
+def test_pool_restarts_after_close(monkeypatch, github, pool):
+    tool = github_tool(monkeypatch, github, pool)
+    first = tool.search("python", max_results=2)
+    pool.close()
+    assert tool.search("python", max_results=2) == first
\ No newline at end of file
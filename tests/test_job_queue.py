@@ -0,0 +1,144 @@
+import time
+import pickle
+import threading
+import pytest
+from jobs.queue import COMPLETED, FAILED, QUEUED, RUNNING, JobQueue, QueueFull
+from tools.records import RepositoryRecord
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(str(tmp_path / "jobs.db"), max_depth=5, per_user_limit=2, max_attempts=2)
+
+def test_jobs_are_claimed_in_submission_order(queue):
+    first = queue.submit("first", "alice")
+    second = queue.submit("second", "bob")
+    
+    job = queue.claim("w1")
+    assert (job["id"], job["status"], job["worker_id"], job["attempts"]) == (first, RUNNING, "w1", 1)
+    assert queue.claim("w2")["id"] == second
+    assert queue.claim("w3") is None
+
+def test_each_job_is_claimed_once_under_contention(queue):
+    submitted = {queue.submit(f"task {number}", f"user{number}") for number in range(5)}
+    claimed = []
+    
+    def work(worker_id):
+        while True:
+            job = queue.claim(worker_id)
+            if job is None:
+                return
+            claimed.append(job["id"])
+    
+    workers = [threading.Thread(target=work, args=(f"w{number}",)) for number in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    
+    assert sorted(claimed) == sorted(submitted)
+
+def test_per_user_limit_lets_other_users_through(queue):
+    for number in range(3):
+        queue.submit(f"alice {number}", "alice")
+    bob = queue.submit("bob", "bob")
+    
+    assert queue.claim("w1")["user_id"] == "alice"
+    running = queue.claim("w2")
+    assert running["user_id"] == "alice"
+    assert queue.claim("w3")["id"] == bob
+    assert queue.claim("w4") is None
+    
+    assert queue.complete(running["id"], "w2", {"status": "success"})
+    assert queue.claim("w4")["task"] == "alice 2"
+
+def test_full_queue_rejects_submissions(queue):
+    for number in range(5):
+        queue.submit(f"task {number}", "alice")
+    with pytest.raises(QueueFull) as error:
+        queue.submit("one more", "alice")
+    assert error.value.depth == 5
+    assert error.value.retryable
+    
+    job = queue.claim("w1")
+    queue.fail(job["id"], "w1", "boom")
+    queue.submit("fits again", "alice")
+
+def test_empty_tasks_are_rejected(queue):
+    with pytest.raises(ValueError):
+        queue.submit("  ", "alice")
+
+def test_results_are_stored_and_reported(queue):
+    job_id = queue.submit("find repos", "alice")
+    queued = queue.submit("later", "bob")
+    assert queue.get(queued)["position"] == 2
+    
+    queue.claim("w1")
+    assert not queue.complete(job_id, "w2", {"status": "stolen"})
+    assert queue.complete(job_id, "w1", {"repositories": [RepositoryRecord("demo", stars=3)]})
+    
+    job = queue.get(job_id)
+    assert job["status"] == COMPLETED
+    assert job["result"]["repositories"][0]["name"] == "demo"
+    assert queue.get(queued)["position"] == 1
+    assert queue.get("missing") is None
+
+def test_events_are_sequenced_and_reset_on_reclaim(queue):
+    job_id = queue.submit("stream", "alice")
+    queue.claim("w1")
+    queue.add_event(job_id, "step", {"step": 1})
+    queue.add_event(job_id, "step", {"step": 2})
+    
+    assert [event["seq"] for event in queue.events(job_id)] == [1, 2]
+    assert [event["payload"] for event in queue.events(job_id, after=1)] == [{"step": 2}]
+    
+    queue.release_worker("w1", "Worker exited")
+    queue.claim("w2")
+    assert queue.events(job_id) == []
+
+def test_jobs_of_a_dead_worker_are_requeued(queue):
+    job_id = queue.submit("task", "alice")
+    queue.claim("w1")
+    
+    assert queue.release_worker("w1", "Worker exited") == 1
+    job = queue.get(job_id)
+    assert (job["status"], job["worker_id"], job["error"]) == (QUEUED, None, "Worker exited")
+    assert not queue.complete(job_id, "w1", {})
+    assert queue.claim("w2")["attempts"] == 2
+
+def test_stale_jobs_are_recovered_until_attempts_run_out(queue):
+    job_id = queue.submit("task", "alice")
+    queue.claim("w1")
+    assert queue.recover(stale_after=60) == 0
+    
+    time.sleep(0.05)
+    assert queue.recover(stale_after=0.01) == 1
+    assert queue.get(job_id)["status"] == QUEUED
+    
+    queue.claim("w2")
+    assert queue.heartbeat(job_id, "w2")
+    assert not queue.heartbeat(job_id, "w1")
+    time.sleep(0.05)
+    assert queue.recover(stale_after=0.01) == 1
+    
+    job = queue.get(job_id)
+    assert job["status"] == FAILED
+    assert "gave up after 2 attempt(s)" in job["error"]
+
+def test_purge_removes_old_finished_jobs(queue):
+    done = queue.submit("done", "alice")
+    pending = queue.submit("pending", "bob")
+    queue.claim("w1")
+    queue.complete(done, "w1", {})
+    queue.add_event(done, "plan", {})
+    
+    time.sleep(0.02)
+    assert queue.purge(older_than=0.01) == 1
+    assert queue.get(done) is None
+    assert queue.events(done) == []
+    assert queue.get(pending)["status"] == QUEUED
+
+def test_queue_survives_pickling(queue):
+    job_id = queue.submit("task", "alice")
+    restored = pickle.loads(pickle.dumps(queue))
+    assert restored.get(job_id)["task"] == "task"
+    assert restored.get_stats() == {QUEUED: 1, RUNNING: 0, COMPLETED: 0, FAILED: 0, "depth": 1, "max_depth": 5}
\ No newline at end of file
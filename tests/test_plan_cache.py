@@ -0,0 +1,87 @@
+import copy
+from agents.plan_cache import PlanCache
+from agents.request_parser import parse_request
+
+def repo_plan(language, count, city=None):
+    steps = [{
+        "step_number": 1,
+        "action": "github_search",
+        "description": f"Search for the top {count} {language} repositories",
+        "parameters": {"query": f"language:{language.lower()}", "sort": "stars", "max_results": count},
+        "depends_on": []
+    }]
+    if city:
+        steps.append({
+            "step_number": 2,
+            "action": "weather_get",
+            "description": f"Get the weather in {city}",
+            "parameters": {"city": city},
+            "depends_on": []
+        })
+    return {"task_summary": f"Top {count} {language} repositories", "steps": steps, "expected_output": "Repositories"}
+
+def test_template_key_ignores_language_city_and_count():
+    first = parse_request("Top 5 Python repos and weather in London")
+    second = parse_request("top 10 rust repositories and the weather in new york")
+    assert first.template_key == second.template_key
+    assert first.slots() == [("lang0", "Python"), ("city0", "London"), ("num0", "5")]
+    assert second.slots() == [("lang0", "Rust"), ("city0", "New York"), ("num0", "10")]
+
+def test_repeated_numbers_share_one_slot():
+    parsed = parse_request("top 5 python and top 5 rust repos")
+    assert parsed.template_key == "top {num0} {lang0} top {num0} {lang1} repo"
+    assert parsed.numbers == [5, 5]
+
+def test_cached_skeleton_is_refilled_with_new_slots():
+    cache = PlanCache()
+    assert cache.put(parse_request("top 5 python repos and weather in London"), repo_plan("Python", 5, "London"))
+    
+    plan = cache.get(parse_request("top 10 rust repos and weather in Paris"))
+    assert plan == repo_plan("Rust", 10, "Paris")
+    assert cache.get_stats()["hits"] == 1
+
+def test_numbers_outside_parameters_are_kept():
+    cache = PlanCache()
+    cache.put(parse_request("top 1 python repo"), repo_plan("Python", 1))
+    plan = cache.get(parse_request("top 3 python repo"))
+    assert plan["steps"][0]["step_number"] == 1
+    assert plan["steps"][0]["parameters"]["max_results"] == 3
+    assert plan["task_summary"] == "Top 3 Python repositories"
+
+def test_string_counts_stay_strings():
+    cache = PlanCache()
+    plan = repo_plan("Python", 5)
+    plan["steps"][0]["parameters"]["max_results"] = "5"
+    cache.put(parse_request("top 5 python repos"), plan)
+    assert cache.get(parse_request("top 7 python repos"))["steps"][0]["parameters"]["max_results"] == "7"
+
+def test_lowercase_slot_values_keep_their_case():
+    cache = PlanCache()
+    cache.put(parse_request("top 5 python repos"), repo_plan("Python", 5))
+    assert cache.get(parse_request("top 5 go repos"))["steps"][0]["parameters"]["query"] == "language:go"
+
+def test_plans_that_do_not_use_every_slot_are_not_cached():
+    cache = PlanCache()
+    assert not cache.put(parse_request("top 5 python repos"), repo_plan("Python", 10))
+    assert not cache.put(parse_request("top 5 python repos and weather in Rome"), repo_plan("Python", 5))
+    assert cache.get_stats()["uncacheable"] == 2
+    assert cache.get(parse_request("top 5 python repos")) is None
+
+def test_cached_plans_are_copies():
+    cache = PlanCache()
+    original = repo_plan("Python", 5)
+    cache.put(parse_request("top 5 python repos"), copy.deepcopy(original))
+    first = cache.get(parse_request("top 5 python repos"))
+    first["steps"].clear()
+    assert cache.get(parse_request("top 5 python repos")) == original
+
+def test_least_recently_used_entries_are_evicted():
+    cache = PlanCache(max_entries=2)
+    cache.put(parse_request("top 5 python repos"), repo_plan("Python", 5))
+    cache.put(parse_request("weather in London"), {"task_summary": "Weather in London", "steps": [], "expected_output": "London"})
+    cache.get(parse_request("top 5 python repos"))
+    cache.put(parse_request("python repos sorted by forks"), {"task_summary": "Python forks", "steps": [], "expected_output": ""})
+    
+    assert cache.get(parse_request("weather in Paris")) is None
+    assert cache.get(parse_request("top 6 python repos")) is not None
+    assert cache.get_stats()["evictions"] == 1
\ No newline at end of file
@@ -0,0 +1,95 @@
+import json
+import pytest
+from agents.plan_cache import PlanCache
+from agents.plan_stream import IncrementalStepParser, PlanStream, parse_plan_text
+from agents.planner import PlannerAgent
+from utils.tracing import Tracer
+
+PLAN = {
+    "task_summary": "Find {steps} in \"quotes\" and [brackets]",
+    "steps": [
+        {
+            "step_number": 1,
+            "action": "github_search",
+            "description": "Search for repos with \"}\" and \\ in the text",
+            "parameters": {"query": "python", "nested": {"steps": [{"not": "a step"}]}},
+            "depends_on": []
+        },
+        {
+            "step_number": 2,
+            "action": "weather_get",
+            "description": "Get weather",
+            "parameters": {"city": "Oslo"},
+            "depends_on": [1]
+        }
+    ],
+    "expected_output": "Repositories and weather"
+}
+
+def feed_in_chunks(parser, text, size):
+    found = []
+    for start in range(0, len(text), size):
+        found.extend(parser.feed(text[start:start + size]))
+    return found
+
+@pytest.mark.parametrize("size", [1, 3, 7, 1000])
+def test_steps_are_parsed_regardless_of_chunking(size):
+    text = json.dumps(PLAN, indent=2)
+    assert feed_in_chunks(IncrementalStepParser(), text, size) == PLAN["steps"]
+
+def test_each_step_is_emitted_as_soon_as_it_closes():
+    text = json.dumps(PLAN)
+    first_end = text.index('"depends_on": []}') + len('"depends_on": []}')
+    parser = IncrementalStepParser()
+    assert parser.feed(text[:first_end - 1]) == []
+    assert parser.feed(text[first_end - 1:first_end]) == [PLAN["steps"][0]]
+    assert parser.feed(text[first_end:]) == [PLAN["steps"][1]]
+
+def test_steps_arrays_outside_the_top_level_are_ignored():
+    text = json.dumps({"task_summary": "x", "meta": {"steps": [{"step_number": 9}]}, "steps": [{"step_number": 1}]})
+    assert IncrementalStepParser().feed(text) == [{"step_number": 1}]
+
+def test_parsing_stops_after_the_steps_array():
+    text = json.dumps({"steps": [{"step_number": 1}], "expected_output": "x", "extra": {"steps": [{"step_number": 2}]}})
+    assert IncrementalStepParser().feed(text) == [{"step_number": 1}]
+
+def test_fenced_plans_are_parsed():
+    text = "```json\n" + json.dumps(PLAN) + "\n```"
+    assert feed_in_chunks(IncrementalStepParser(), text, 5) == PLAN["steps"]
+    assert parse_plan_text(text) == PLAN
+
+def test_plan_stream_keeps_the_final_plan():
+    stream = PlanStream(iter([{"type": "step", "step": {}}, {"type": "plan", "plan": PLAN}]))
+    assert stream.plan is None
+    assert [event["type"] for event in stream] == ["step", "plan"]
+    assert stream.plan is PLAN
+
+class ChunkedLLM:
+    def __init__(self, text, size):
+        self.chunks = [text[start:start + size] for start in range(0, len(text), size)]
+        self.sent = 0
+    
+    def stream_structured_output(self, **kwargs):
+        for chunk in self.chunks:
+            self.sent += 1
+            yield chunk
+
+def test_planner_yields_steps_before_the_llm_finishes():
+    plan = {key: value for key, value in PLAN.items()}
+    plan["steps"] = [dict(step, parameters={"query": "python"}) if step["action"] == "github_search" else step for step in PLAN["steps"]]
+    llm = ChunkedLLM(json.dumps(plan), 10)
+    planner = PlannerAgent(llm, plan_cache=PlanCache(), fast_path=False, tracer=Tracer())
+    
+    seen = []
+    for event in planner.stream_plan("Find python repos and the weather in the owner's city"):
+        seen.append((event["type"], llm.sent))
+    
+    assert [kind for kind, _ in seen] == ["step", "step", "plan"]
+    assert seen[0][1] < len(llm.chunks)
+    assert seen[-1][1] == len(llm.chunks)
+
+def test_planner_rejects_invalid_streamed_steps():
+    bad = {"task_summary": "x", "steps": [{"step_number": 1, "action": "unknown", "description": "x", "parameters": {}}], "expected_output": "x"}
+    planner = PlannerAgent(ChunkedLLM(json.dumps(bad), 10), plan_cache=PlanCache(), fast_path=False, tracer=Tracer())
+    with pytest.raises(Exception, match="Invalid action in step: unknown"):
+        list(planner.stream_plan("Do something unusual"))
\ No newline at end of file
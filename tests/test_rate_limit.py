@@ -0,0 +1,101 @@
+import time
+import pytest
+from types import SimpleNamespace
+from llm.llm_client import LLMClient
+from utils.hedging import Hedger
+from utils.rate_limit import RateLimitExceeded, TokenBucket
+from utils.retry import RetryPolicy
+from utils.singleflight import SingleFlight
+
+def test_bucket_starts_full_and_then_rejects():
+    bucket = TokenBucket("test", rate_per_minute=3, max_wait=0)
+    assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+    with pytest.raises(RateLimitExceeded):
+        bucket.acquire()
+    assert bucket.snapshot()["rejected"] == 1
+
+def test_bucket_refills_over_time():
+    bucket = TokenBucket("test", rate_per_minute=600, capacity=1)
+    assert bucket.try_acquire()
+    started = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - started >= 0.05
+    assert bucket.snapshot()["waited"] == 1
+
+def test_bucket_refund_is_capped_at_capacity():
+    bucket = TokenBucket("test", rate_per_minute=60, capacity=2, max_wait=0)
+    assert bucket.try_acquire(2)
+    bucket.refund(5)
+    assert bucket.try_acquire(2)
+    assert not bucket.try_acquire()
+
+def test_requests_larger_than_capacity_take_whole_bucket():
+    bucket = TokenBucket("test", rate_per_minute=60, capacity=10, max_wait=0)
+    assert bucket.try_acquire(50)
+    assert not bucket.try_acquire()
+
+def test_shared_bucket_is_shared_between_instances(tmp_path):
+    db_path = str(tmp_path / "limits.db")
+    first = TokenBucket("shared", rate_per_minute=2, db_path=db_path, max_wait=0)
+    second = TokenBucket("shared", rate_per_minute=2, db_path=db_path, max_wait=0)
+    assert first.try_acquire()
+    assert second.try_acquire()
+    assert not first.try_acquire()
+    second.refund(1)
+    assert first.try_acquire()
+
+class UpstreamError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"upstream returned {status_code}")
+        self.status_code = status_code
+        self.response = None
+
+def make_client(monkeypatch, responses):
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    client = LLMClient(flight=SingleFlight(), hedger=Hedger("test", enabled=False), retry_policy=RetryPolicy(max_retries=2, base_delay=0, jitter=0))
+    client.request_limiter = TokenBucket("llm_requests", rate_per_minute=10, max_wait=0)
+    client.token_limiter = TokenBucket("llm_tokens", rate_per_minute=10000, max_wait=0)
+    calls = []
+    
+    def create(**request):
+        calls.append(request)
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+    
+    completions = SimpleNamespace(create=create)
+    monkeypatch.setattr(client, "_client_for", lambda expires_at, timeout: SimpleNamespace(chat=SimpleNamespace(completions=completions)))
+    return client, calls
+
+def completion(content: str, prompt_tokens: int, completion_tokens: int):
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+        usage=SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+    )
+
+def test_llm_retries_take_a_request_token_per_attempt(monkeypatch):
+    client, calls = make_client(monkeypatch, [UpstreamError(429), UpstreamError(503), completion("ok", 10, 5)])
+    assert client.generate_text("system", "user", max_tokens=100) == "ok"
+    assert len(calls) == 3
+    assert client.request_limiter.snapshot()["acquired"] == 3
+    assert client.token_limiter.snapshot()["acquired"] == 3
+
+def test_llm_failed_attempts_refund_their_token_reservation(monkeypatch):
+    client, calls = make_client(monkeypatch, [UpstreamError(503), completion("ok", 10, 5)])
+    client.generate_text("system", "user", max_tokens=100)
+    assert client.token_limiter.try_acquire(10000 - 15)
+    assert not client.token_limiter.try_acquire(50)
+
+def test_llm_retries_stop_when_request_bucket_is_empty(monkeypatch):
+    client, calls = make_client(monkeypatch, [UpstreamError(429), UpstreamError(429), completion("ok", 10, 5)])
+    client.request_limiter = TokenBucket("llm_requests", rate_per_minute=2, max_wait=0)
+    with pytest.raises(Exception, match="Rate limit for llm_requests exceeded"):
+        client.generate_text("system", "user", max_tokens=100)
+    assert len(calls) == 2
+
+def test_llm_client_errors_are_not_retried(monkeypatch):
+    client, calls = make_client(monkeypatch, [UpstreamError(400), completion("ok", 10, 5)])
+    with pytest.raises(Exception, match="upstream returned 400"):
+        client.generate_text("system", "user", max_tokens=100)
+    assert len(calls) == 1
\ No newline at end of file
@@ -0,0 +1,124 @@
+import time
+import httpx
+import pytest
+from email.utils import formatdate
+from tools.errors import ToolError, error_from_exception, error_from_response, parse_retry_after
+from utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from utils.deadline import DeadlineExceeded
+from utils.retry import RetryPolicy
+
+def response(status, headers=None, body=None):
+    return httpx.Response(status, headers=headers, json=body or {"message": "nope"}, request=httpx.Request("GET", "http://test"))
+
+@pytest.mark.parametrize("status, retryable", [
+    (400, False), (401, False), (403, False), (404, False), (422, False),
+    (408, True), (429, True), (500, True), (502, True), (503, True), (504, True)
+])
+def test_status_codes_are_classified(status, retryable):
+    error = error_from_response("GitHub", response(status))
+    assert error.status_code == status
+    assert error.retryable is retryable
+    assert error.retry_after is None
+    assert str(error).endswith("- nope")
+
+def test_exhausted_github_quota_is_retryable():
+    reset = str(int(time.time()) + 20)
+    error = error_from_response("GitHub", response(403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset}))
+    assert error.retryable
+    assert 18 <= error.retry_after <= 20
+
+def test_retry_after_header_wins_over_reset():
+    error = error_from_response("GitHub", response(429, {"Retry-After": "3", "X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "9999999999"}))
+    assert error.retry_after == 3.0
+
+def test_parse_retry_after():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("2.5") == 2.5
+    assert parse_retry_after("-1") == 0.0
+    assert parse_retry_after("soon") is None
+    assert 8 <= parse_retry_after(formatdate(time.time() + 10, usegmt=True)) <= 10
+
+def test_exceptions_are_classified():
+    assert error_from_exception("Weather", httpx.ConnectError("refused")).retryable
+    assert error_from_exception("Weather", httpx.ReadTimeout("slow")).retryable
+    assert not error_from_exception("Weather", DeadlineExceeded("http request", 1.0)).retryable
+    assert not error_from_exception("Weather", ValueError("bad json")).retryable
+    
+    original = ToolError("kept", status_code=404)
+    assert error_from_exception("Weather", original) is original
+
+def test_retry_policy_backs_off_exponentially():
+    policy = RetryPolicy(max_retries=3, base_delay=0.5, max_delay=1.5, jitter=0)
+    error = ToolError("busy", status_code=503, retryable=True)
+    assert [policy.next_delay(attempt, error) for attempt in range(4)] == [0.5, 1.0, 1.5, None]
+
+def test_retry_policy_jitter_stays_below_the_backoff():
+    policy = RetryPolicy(base_delay=1.0, jitter=0.5)
+    delays = [policy.next_delay(0, ToolError("busy", retryable=True)) for _ in range(50)]
+    assert all(0.5 <= delay <= 1.0 for delay in delays)
+
+def test_retry_policy_honours_retry_after():
+    policy = RetryPolicy(max_retries=2, max_retry_after=5.0)
+    assert policy.next_delay(0, ToolError("slow down", retryable=True, retry_after=4.0)) == 4.0
+    assert policy.next_delay(0, ToolError("slow down", retryable=True, retry_after=60.0)) is None
+
+def test_retry_policy_skips_permanent_errors():
+    policy = RetryPolicy(max_retries=5)
+    assert policy.next_delay(0, ToolError("missing", status_code=404)) is None
+    assert policy.next_delay(0, ValueError("bad")) is None
+    assert policy.next_delay(0, CircuitOpenError("github", 10.0)) is None
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=60)
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record_failure()
+    breaker.before_call()
+    breaker.record_success()
+    
+    for _ in range(3):
+        breaker.before_call()
+        breaker.record_failure()
+    
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    assert breaker.snapshot()["rejected"] == 1
+    assert breaker.snapshot()["opened"] == 1
+
+def test_breaker_half_opens_after_the_timeout():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.05)
+    breaker.before_call()
+    breaker.record_failure()
+    time.sleep(0.06)
+    
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.before_call()
+
+def test_failed_probe_reopens_the_breaker():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.05)
+    breaker.before_call()
+    breaker.record_failure()
+    time.sleep(0.06)
+    
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.snapshot()["opened"] == 2
+
+def test_released_probe_frees_the_half_open_slot():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.05)
+    breaker.before_call()
+    breaker.record_failure()
+    time.sleep(0.06)
+    
+    breaker.before_call()
+    breaker.release()
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
\ No newline at end of file
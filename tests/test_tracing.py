@@ -0,0 +1,103 @@
+import threading
+import contextvars
+from typing import Dict, List, Any
+from agents.executor import ExecutorAgent
+from tools.cache import ToolCache
+from tools.registry import ToolRegistry, ToolSpec
+from utils.tracing import Tracer
+
+class EchoTool:
+    def run(self, value: str = "") -> Dict[str, Any]:
+        return {"value": value}
+
+def make_executor(tracer: Tracer) -> ExecutorAgent:
+    registry = ToolRegistry()
+    registry.register(ToolSpec(name="echo", description="Echo", entry_point="tests:EchoTool", method="run", parameters={"value": {"type": "string"}}, cacheable=False), instance=EchoTool())
+    return ExecutorAgent(registry=registry, cache=ToolCache(ttls={}), tracer=tracer)
+
+def plan_events(tracer: Tracer, steps: List[Dict[str, Any]]):
+    with tracer.span("planner.stream_plan"):
+        for step in steps:
+            yield {"type": "step", "step": step}
+        yield {"type": "plan", "plan": {"task_summary": "echo", "steps": steps}}
+
+def make_steps(count: int) -> List[Dict[str, Any]]:
+    return [
+        {"step_number": number, "action": "echo", "description": f"Echo {number}", "parameters": {"value": str(number)}, "depends_on": []}
+        for number in range(1, count + 1)
+    ]
+
+def spans_by_name(tracer: Tracer, trace_id: str) -> Dict[str, List[Dict[str, Any]]]:
+    spans = {}
+    for span in tracer.get_trace(trace_id):
+        spans.setdefault(span["name"], []).append(span)
+    return spans
+
+def test_nested_spans_share_trace_and_parent():
+    tracer = Tracer()
+    with tracer.span("pipeline") as root:
+        with tracer.span("planner.create_plan") as child:
+            assert tracer.current_span() is child
+        assert tracer.current_span() is root
+    
+    assert child.trace_id == root.trace_id
+    assert child.parent_id == root.span_id
+    assert tracer.current_span() is None
+
+def test_span_records_errors():
+    tracer = Tracer()
+    try:
+        with tracer.span("pipeline"):
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    
+    [span] = tracer.get_trace(tracer.recent_trace_ids()[0])
+    assert span["status"] == "error"
+    assert span["error"] == "boom"
+    assert 'ai_ops_span_errors_total{span="pipeline"} 1' in tracer.prometheus_text()
+
+def test_executor_span_does_not_leak_into_consumer():
+    tracer = Tracer()
+    executor = make_executor(tracer)
+    with tracer.span("pipeline") as root:
+        stream = executor.stream_results(plan_events(tracer, make_steps(2)))
+        for _ in stream:
+            assert tracer.current_span() is root
+            with tracer.span("ui.step") as consumer:
+                pass
+            assert consumer.parent_id == root.span_id
+    
+    spans = spans_by_name(tracer, root.trace_id)
+    [execute] = spans["executor.execute_plan"]
+    [planner] = spans["planner.stream_plan"]
+    assert execute["parent_id"] == root.span_id
+    assert planner["parent_id"] == root.span_id
+    assert len(spans["executor.step"]) == 2
+    assert all(step["parent_id"] == execute["span_id"] for step in spans["executor.step"])
+    assert execute["attributes"]["steps"] == 2
+
+def test_stream_resumed_and_closed_from_other_contexts():
+    tracer = Tracer()
+    executor = make_executor(tracer)
+    with tracer.span("pipeline") as root:
+        events = iter(executor.stream_results(plan_events(tracer, make_steps(3))))
+    
+    first = contextvars.copy_context().run(next, events)
+    errors = []
+    
+    def close() -> None:
+        try:
+            events.close()
+        except Exception as e:
+            errors.append(e)
+    
+    thread = threading.Thread(target=close)
+    thread.start()
+    thread.join()
+    
+    assert first["status"] == "success"
+    assert errors == []
+    [execute] = spans_by_name(tracer, root.trace_id)["executor.execute_plan"]
+    assert execute["parent_id"] == root.span_id
+    assert execute["end_ns"] is not None
\ No newline at end of file
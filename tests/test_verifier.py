@@ -0,0 +1,147 @@
+import time
+from typing import Dict, Any
+from agents.executor import ExecutorAgent
+from agents.verifier import VerifierAgent
+from tools.cache import ToolCache
+from tools.records import RepositoryRecord, WeatherReading
+from tools.registry import ToolRegistry, ToolSpec
+from utils.deadline import RULES_ONLY, Deadline, deadline_scope
+from utils.retry import RetryPolicy
+from utils.tracing import Tracer
+
+class RecordingLLM:
+    def __init__(self):
+        self.calls = 0
+    
+    def generate_structured_output(self, **kwargs):
+        self.calls += 1
+        return {"is_complete": False, "completeness_score": 40, "issues": ["Weather missing"], "suggestions": []}
+
+def repos(count):
+    return {"repositories": [RepositoryRecord(f"repo{number}", stars=number) for number in range(count)], "total_count": 100}
+
+def reading(city):
+    return WeatherReading(city, temperature=20.0, condition="clear sky", humidity=40)
+
+def result(number, action, data=None, error=None, **parameters):
+    return {
+        "step_number": number,
+        "action": action,
+        "status": "failed" if error else "success",
+        "data": data,
+        "error": error,
+        "parameters": parameters
+    }
+
+def plan_for(*results):
+    return {"steps": [{"step_number": step["step_number"], "action": step["action"], "parameters": step["parameters"]} for step in results]}
+
+def summary(*results):
+    failed = [step for step in results if step["status"] != "success"]
+    status = "success" if not failed else "failed" if len(failed) == len(results) else "partial_failure"
+    return {"status": status, "steps": list(results), "errors": [{"step": step["step_number"], "error": step["error"]} for step in failed]}
+
+def make_verifier():
+    return VerifierAgent(RecordingLLM(), tracer=Tracer())
+
+def test_add_step_returns_cards_for_that_step():
+    session = make_verifier().start("python repos and weather in Oslo")
+    
+    cards = session.add_step(result(2, "weather_get", reading("Oslo"), city="Oslo"))
+    assert [(card["type"], card["city"]) for card in cards] == [("weather", "Oslo")]
+    assert session.checks == {2: True}
+    
+    cards = session.add_step(result(1, "github_search", repos(3), max_results=5))
+    assert [card["name"] for card in cards] == ["repo0", "repo1", "repo2"]
+    assert session.checks == {2: True, 1: False}
+    
+    assert session.add_step(result(3, "weather_get", error="boom", city="Lima")) == []
+    assert session.checks[3] is False
+
+def test_finish_orders_cards_by_step_and_skips_the_llm_when_rules_decide():
+    verifier = make_verifier()
+    github = result(1, "github_search", repos(2), max_results=2)
+    weather = result(2, "weather_get", {"cities": {"Oslo": reading("Oslo")}, "errors": {}}, cities=["Oslo"])
+    
+    session = verifier.start("two repos and weather")
+    session.add_step(weather)
+    session.add_step(github)
+    verification = session.finish(plan_for(github, weather), summary(github, weather))
+    
+    assert verification["is_complete"]
+    assert verification["verification_details"]["verified_by"] == "rules"
+    assert [card["type"] for card in verification["formatted_output"]["data"]] == ["repo", "repo", "weather"]
+    assert verifier.llm.calls == 0
+
+def test_finish_checks_steps_that_were_never_streamed():
+    verifier = make_verifier()
+    github = result(1, "github_search", repos(5), max_results=5)
+    
+    streamed = verifier.start("repos")
+    streamed.add_step(github)
+    batch = verifier.verify_results("repos", plan_for(github), summary(github))
+    
+    assert streamed.finish(plan_for(github), summary(github)) == batch
+    assert batch["verification_details"]["verified_by"] == "rules"
+
+def test_partial_failures_are_left_to_the_llm():
+    verifier = make_verifier()
+    github = result(1, "github_search", repos(5), max_results=5)
+    weather = result(2, "weather_get", error="City not found", city="Nowhere")
+    
+    verification = verifier.verify_results("repos and weather", plan_for(github, weather), summary(github, weather))
+    assert verifier.llm.calls == 1
+    assert verification["verification_details"]["completeness_score"] == 40
+    assert verification["formatted_output"]["summary"].startswith("⚠ Partially completed with 1 error(s)")
+
+def test_complete_failures_are_decided_by_rules():
+    verifier = make_verifier()
+    weather = result(1, "weather_get", error="City not found", city="Nowhere")
+    
+    verification = verifier.verify_results("weather", plan_for(weather), summary(weather))
+    assert verifier.llm.calls == 0
+    assert verification["verification_details"]["issues"] == ["Step 1 failed: City not found"]
+
+def test_llm_check_is_skipped_when_the_deadline_is_close():
+    verifier = make_verifier()
+    github = result(1, "github_search", repos(1), max_results=5)
+    deadline = Deadline(1)
+    
+    with deadline_scope(deadline):
+        verification = verifier.verify_results("repos", plan_for(github), summary(github))
+    
+    assert verifier.llm.calls == 0
+    assert verification["verification_details"]["verified_by"] == "rules_only"
+    assert RULES_ONLY in deadline.degraded
+
+class SearchTool:
+    def search(self, query: str = "", delay: str = "0", max_results: int = 5) -> Dict[str, Any]:
+        time.sleep(float(delay))
+        return repos(int(max_results))
+
+def test_cards_are_built_while_other_steps_are_still_running():
+    registry = ToolRegistry()
+    registry.register(ToolSpec(
+        name="github_search",
+        description="Search",
+        entry_point="tests:SearchTool",
+        method="search",
+        parameters={"query": {"type": "string"}, "delay": {"type": "string", "default": "0"}, "max_results": {"type": "integer", "default": 5}},
+        cacheable=False
+    ), instance=SearchTool())
+    executor = ExecutorAgent(registry=registry, cache=ToolCache(ttls={}), retry_policy=RetryPolicy(max_retries=0))
+    plan = {"task_summary": "Search", "expected_output": "", "steps": [
+        {"step_number": 1, "action": "github_search", "description": "Slow", "parameters": {"query": "slow", "delay": "0.3", "max_results": 2}, "depends_on": []},
+        {"step_number": 2, "action": "github_search", "description": "Fast", "parameters": {"query": "fast", "max_results": 1}, "depends_on": []}
+    ]}
+    
+    session = make_verifier().start("slow and fast repos")
+    stream = executor.stream_results(executor._plan_events(plan))
+    started = time.monotonic()
+    arrivals = []
+    for step_result in stream:
+        arrivals.append((step_result["step_number"], len(session.add_step(step_result)), time.monotonic() - started))
+    
+    assert [(number, cards) for number, cards, _ in arrivals] == [(2, 1), (1, 2)]
+    assert arrivals[0][2] < 0.2
+    assert session.finish(plan, stream.results)["verification_details"]["verified_by"] == "rules"
\ No newline at end of file
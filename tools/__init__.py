@@ -1,4 +1,25 @@
-from .github_tool import GitHubTool
-from .weather_tool import WeatherTool
+import importlib
 
-__all__ = ['GitHubTool', 'WeatherTool']
\ No newline at end of file
+_exports = {
+    'GitHubTool': '.github_tool',
+    'WeatherTool': '.weather_tool',
+    'HTTPClientPool': '.http_client',
+    'get_http_pool': '.http_client',
+    'ToolCache': '.cache',
+    'get_tool_cache': '.cache',
+    'ToolError': '.errors',
+    'RepositoryRecord': '.records',
+    'WeatherReading': '.records',
+    'ToolSpec': '.registry',
+    'ToolRegistry': '.registry',
+    'get_registry': '.registry'
+}
+
+__all__ = list(_exports)
+
+def __getattr__(name):
+    if name not in _exports:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_exports[name], __name__), name)
+    globals()[name] = value
+    return value
\ No newline at end of file
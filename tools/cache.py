@@ -0,0 +1,182 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+from tools.registry import Loader, get_registry
+from tools.records import encode_record, decode_record
+from utils.env import load_env
+
+class CacheEntry:
+    __slots__ = ("value", "etag", "expires_at")
+    
+    def __init__(self, value: Dict[str, Any], etag: Optional[str], expires_at: float):
+        self.value = value
+        self.etag = etag
+        self.expires_at = expires_at
+    
+    def is_fresh(self, now: float) -> bool:
+        return now < self.expires_at
+
+class ToolCache:
+    def __init__(self, max_entries: int = 512, ttls: Optional[Dict[str, float]] = None, db_path: Optional[str] = None, default_ttl: float = 300):
+        self.max_entries = max_entries
+        self.ttls = get_registry().cache_ttls()
+        if ttls:
+            self.ttls.update(ttls)
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "stale": 0,
+            "revalidated": 0,
+            "evictions": 0,
+            "persistent_hits": 0
+        }
+        if db_path:
+            self._open_db(db_path)
+    
+    def _open_db(self, db_path: str) -> None:
+        self._db = sqlite3.connect(db_path, check_same_thread=False, timeout=5)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS tool_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, etag TEXT, expires_at REAL NOT NULL)"
+        )
+        self._db.commit()
+    
+    def make_key(self, action: str, parameters: Dict[str, Any]) -> str:
+        return f"{action}:{json.dumps(self._normalize(parameters), sort_keys=True, separators=(',', ':'))}"
+    
+    def _normalize(self, value: Any) -> Any:
+        if isinstance(value, str):
+            text = " ".join(value.lower().split())
+            return int(text) if text.isdigit() else text
+        if isinstance(value, dict):
+            return {str(k).lower(): self._normalize(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self._normalize(v) for v in value]
+        return value
+    
+    def ttl_for(self, action: str) -> float:
+        return self.ttls.get(action, self.default_ttl)
+    
+    def fetch(self, action: str, parameters: Dict[str, Any], loader: Loader) -> Tuple[Dict[str, Any], str]:
+        key = self.make_key(action, parameters)
+        now = time.time()
+        entry = self._lookup(key)
+        
+        if entry is not None and entry.is_fresh(now):
+            self._count("hits")
+            return entry.value, "hit"
+        
+        etag = None
+        if entry is not None:
+            self._count("stale")
+            etag = entry.etag
+        else:
+            self._count("misses")
+        
+        value, new_etag = loader(etag)
+        
+        if value is None and entry is not None:
+            self._count("revalidated")
+            self._store(key, CacheEntry(entry.value, new_etag or entry.etag, time.time() + self.ttl_for(action)))
+            return entry.value, "revalidated"
+        
+        if value is not None and not (isinstance(value, dict) and "error" in value):
+            self._store(key, CacheEntry(value, new_etag, time.time() + self.ttl_for(action)))
+        return value, "miss"
+    
+    def _lookup(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+            
+            if self._db is None:
+                return None
+            
+            row = self._db.execute(
+                "SELECT value, etag, expires_at FROM tool_cache WHERE key = ?", (key,)
+            ).fetchone()
+        
+        if row is None:
+            return None
+        
+        entry = CacheEntry(json.loads(row[0], object_hook=decode_record), row[1], row[2])
+        self._count("persistent_hits")
+        self._store(key, entry, persist=False)
+        return entry
+    
+    def _store(self, key: str, entry: CacheEntry, persist: bool = True) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+            
+            if persist and self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO tool_cache (key, value, etag, expires_at) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(entry.value, default=encode_record), entry.etag, entry.expires_at)
+                )
+                self._db.commit()
+    
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats["size"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"] + stats["stale"]
+        stats["hit_rate"] = (stats["hits"] + stats["revalidated"]) / lookups if lookups else 0.0
+        return stats
+    
+    def discard(self, action: str, parameters: Dict[str, Any]) -> None:
+        key = self.make_key(action, parameters)
+        with self._lock:
+            self._entries.pop(key, None)
+            if self._db is not None:
+                self._db.execute("DELETE FROM tool_cache WHERE key = ?", (key,))
+                self._db.commit()
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM tool_cache")
+                self._db.commit()
+
+CACHE_TTL_ENV = {
+    "weather_get": "WEATHER_CACHE_TTL",
+    "github_search": "GITHUB_CACHE_TTL"
+}
+
+_default_cache: Optional[ToolCache] = None
+_default_cache_lock = threading.Lock()
+
+def get_tool_cache() -> ToolCache:
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                load_env()
+                _default_cache = ToolCache(
+                    max_entries=int(os.getenv("TOOL_CACHE_MAX_ENTRIES", "512")),
+                    ttls={
+                        action: float(os.getenv(CACHE_TTL_ENV.get(action, f"{action.upper()}_CACHE_TTL"), str(ttl)))
+                        for action, ttl in get_registry().cache_ttls().items()
+                    },
+                    db_path=os.getenv("TOOL_CACHE_DB") or None
+                )
+    return _default_cache
\ No newline at end of file
@@ -0,0 +1,62 @@
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+import httpx
+from utils.deadline import DeadlineExceeded
+
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+
+class ToolError(Exception):
+    def __init__(self, message: str, status_code: Optional[int] = None, retryable: bool = False, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def error_from_response(service: str, response: httpx.Response) -> ToolError:
+    status = response.status_code
+    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+    rate_limited = status == 429
+    
+    if status == 403 and response.headers.get("X-RateLimit-Remaining") == "0":
+        rate_limited = True
+        reset = response.headers.get("X-RateLimit-Reset")
+        if retry_after is None and reset and reset.isdigit():
+            retry_after = max(0.0, int(reset) - time.time())
+    
+    try:
+        detail = response.json().get("message", "")
+    except ValueError:
+        detail = response.text[:200]
+    
+    message = f"{service} API request failed: {status} {response.reason_phrase}"
+    if detail:
+        message = f"{message} - {detail}"
+    
+    return ToolError(
+        message,
+        status_code=status,
+        retryable=rate_limited or status in RETRYABLE_STATUS_CODES,
+        retry_after=retry_after
+    )
+
+def error_from_exception(service: str, error: Exception) -> ToolError:
+    if isinstance(error, ToolError):
+        return error
+    if isinstance(error, DeadlineExceeded):
+        return ToolError(f"{service} API request failed: {str(error)}")
+    if isinstance(error, httpx.TransportError):
+        return ToolError(f"{service} API request failed: {str(error) or type(error).__name__}", retryable=True)
+    return ToolError(f"Unexpected error: {str(error)}")
\ No newline at end of file
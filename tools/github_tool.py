@@ -1,11 +1,29 @@
 import os
-import requests
-from typing import Dict, Any, List
+import json
+import math
+import asyncio
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple, Iterator, AsyncIterator, Deque
+import httpx
+from tools.http_client import HTTPClientPool, get_http_pool
+from tools.errors import ToolError, error_from_response, error_from_exception
+from tools.records import RepositoryRecord
+from utils.env import load_env
+from utils.rate_limit import TokenBucket, get_limiter
+from utils.hedging import Hedger, get_hedger
 
 class GitHubTool:
-    def __init__(self):
+    MAX_RESULTS = 1000
+    MAX_PER_PAGE = 100
+    PAGE_CONCURRENCY = 4
+    
+    def __init__(self, http_pool: Optional[HTTPClientPool] = None, limiter: Optional[TokenBucket] = None, hedger: Optional[Hedger] = None):
+        self.http = http_pool or get_http_pool()
+        self.limiter = limiter or get_limiter("github")
+        self.hedger = hedger or get_hedger("github")
+        load_env()
         self.token = os.getenv("GITHUB_TOKEN")
-        self.base_url = "https://api.github.com"
+        self.base_url = os.getenv("GITHUB_API_URL", "https://api.github.com").rstrip("/")
         self.headers = {
             "Accept": "application/vnd.github.v3+json"
         }
@@ -13,50 +31,136 @@ class GitHubTool:
             self.headers["Authorization"] = f"token {self.token}"
     
     def search(self, query: str, sort: str = "stars", max_results: int = 5) -> Dict[str, Any]:
-        if not query:
-            return {"error": "Query parameter is required"}
+        return self.http.run(self.search_async(query, sort, max_results))
+    
+    async def search_async(self, query: str, sort: str = "stars", max_results: int = 5) -> Dict[str, Any]:
+        data, _ = await self.search_conditional_async(query, sort, max_results)
+        return data
+    
+    def search_conditional(self, query: str, sort: str = "stars", max_results: int = 5, etag: Optional[str] = None) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        return self.http.run(self.search_conditional_async(query, sort, max_results, etag))
+    
+    async def search_conditional_async(self, query: str, sort: str = "stars", max_results: int = 5, etag: Optional[str] = None) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        meta: Dict[str, Any] = {}
+        repos = [repo async for repo in self._stream(query, sort, max_results, etag, meta)]
+        if meta.get("not_modified"):
+            return None, meta.get("etag") or etag
         
-        if max_results > 10:
-            max_results = 10
+        return {
+            "repositories": repos,
+            "total_count": meta.get("total_count", 0)
+        }, meta.get("etag")
+    
+    def iter_search(self, query: str, sort: str = "stars", max_results: int = 5) -> Iterator[RepositoryRecord]:
+        return self.http.iterate(self.iter_search_async(query, sort, max_results))
+    
+    async def iter_search_async(self, query: str, sort: str = "stars", max_results: int = 5) -> AsyncIterator[RepositoryRecord]:
+        async for repo in self._stream(query, sort, max_results, None, {}):
+            yield repo
+    
+    async def _stream(self, query: str, sort: str, max_results: int, etag: Optional[str], meta: Dict[str, Any]) -> AsyncIterator[RepositoryRecord]:
+        if not query:
+            raise ToolError("Query parameter is required")
         
-        url = f"{self.base_url}/search/repositories"
+        max_results = min(max(int(max_results), 1), self.MAX_RESULTS)
+        pages = math.ceil(max_results / self.MAX_PER_PAGE)
+        per_page = math.ceil(max_results / pages)
         params = {
             "q": query,
             "sort": sort,
             "order": "desc",
-            "per_page": max_results
+            "per_page": per_page
         }
         
+        page_etags = etag.split(" ") if etag else []
+        first = await self._fetch_page(params, 1, page_etags[0] if page_etags else None)
+        if first is None and await self._unchanged(params, page_etags[1:]):
+            meta["not_modified"] = True
+            return
+        if first is None:
+            first = await self._fetch_page(params, 1, None)
+        items, total_count, last_page, first_etag = first
+        etags = [first_etag]
+        meta["total_count"] = total_count
+        meta["etag"] = first_etag
+        
+        remaining = max_results
+        for repo in items[:remaining]:
+            yield repo
+        remaining -= min(len(items), remaining)
+        
+        pages = min(pages, last_page, math.ceil(min(total_count, self.MAX_RESULTS) / per_page))
+        if remaining <= 0 or len(items) < per_page or pages < 2:
+            return
+        
+        pending: Deque[asyncio.Future] = deque()
+        next_page = 2
         try:
-            response = requests.get(
-                url,
-                headers=self.headers,
-                params=params,
-                timeout=10
+            while pending or next_page <= pages:
+                while next_page <= pages and len(pending) < self.PAGE_CONCURRENCY:
+                    pending.append(asyncio.ensure_future(self._fetch_page(params, next_page, None)))
+                    next_page += 1
+                result = await pending.popleft()
+                items = result[0] if result else []
+                etags.append(result[3] if result else None)
+                meta["etag"] = " ".join(etags) if all(etags) else None
+                for repo in items[:remaining]:
+                    yield repo
+                remaining -= min(len(items), remaining)
+                if remaining <= 0 or len(items) < per_page:
+                    return
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+    
+    async def _unchanged(self, params: Dict[str, Any], etags: List[str]) -> bool:
+        for start in range(0, len(etags), self.PAGE_CONCURRENCY):
+            batch = etags[start:start + self.PAGE_CONCURRENCY]
+            results = await asyncio.gather(*(self._fetch_page(params, page, etag) for page, etag in enumerate(batch, start + 2)))
+            if any(result is not None for result in results):
+                return False
+        return True
+    
+    async def _fetch_page(self, params: Dict[str, Any], page: int, etag: Optional[str]) -> Optional[Tuple[List[RepositoryRecord], int, int, Optional[str]]]:
+        headers = dict(self.headers)
+        if etag:
+            headers["If-None-Match"] = etag
+            charged = self.limiter.try_acquire()
+        else:
+            await self.limiter.acquire_async()
+            charged = True
+        
+        try:
+            response = await self.hedger.run_async(
+                lambda: self.http.get(
+                    f"{self.base_url}/search/repositories",
+                    headers=headers,
+                    params=dict(params, page=page) if page > 1 else params,
+                    timeout=10
+                ),
+                admit=self.limiter.try_acquire
             )
-            response.raise_for_status()
-            data = response.json()
+            if response.status_code == 304:
+                if charged:
+                    self.limiter.refund(1)
+                return None
             
-            repos = []
-            for item in data.get("items", [])[:max_results]:
-                repos.append({
-                    "name": item.get("name"),
-                    "full_name": item.get("full_name"),
-                    "stars": item.get("stargazers_count"),
-                    "forks": item.get("forks_count"),
-                    "language": item.get("language"),
-                    "url": item.get("html_url"),
-                    "description": item.get("description"),
-                    "updated_at": item.get("updated_at"),
-                    "owner": item.get("owner", {}).get("login")
-                })
+            if response.is_error:
+                raise error_from_response("GitHub", response)
+            data = json.loads(response.content, object_hook=project_repository)
             
-            return {
-                "repositories": repos,
-                "total_count": data.get("total_count", 0)
-            }
+            last_url = response.links.get("last", {}).get("url")
+            last_page = int(httpx.URL(last_url).params.get("page", page)) if last_url else page
+            if "next" in response.links:
+                last_page = max(last_page, page + 1)
+            
+            return data.get("items", []), data.get("total_count", 0), last_page, response.headers.get("ETag")
             
-        except requests.exceptions.RequestException as e:
-            return {"error": f"GitHub API request failed: {str(e)}"}
         except Exception as e:
-            return {"error": f"Unexpected error: {str(e)}"}
\ No newline at end of file
+            raise error_from_exception("GitHub", e) from e
+
+def project_repository(value: Dict[str, Any]) -> Any:
+    if "stargazers_count" in value and "full_name" in value:
+        return RepositoryRecord.from_api(value)
+    return value
\ No newline at end of file
@@ -0,0 +1,109 @@
+import os
+import asyncio
+import threading
+from typing import Any, AsyncIterator, Coroutine, Iterator, Optional
+import httpx
+from utils.env import load_env
+from utils.deadline import DeadlineExceeded, current_deadline
+from utils.tracing import Tracer, get_tracer
+
+class HTTPClientPool:
+    def __init__(self, max_connections: int = 100, max_keepalive_connections: int = 20, keepalive_expiry: float = 30.0, timeout: float = 10.0, tracer: Optional[Tracer] = None):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.timeout = timeout
+        self.tracer = tracer or get_tracer()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+    
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is not None:
+            return self._loop
+        
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+                
+                def run() -> None:
+                    asyncio.set_event_loop(loop)
+                    self._client = httpx.AsyncClient(limits=self.limits, timeout=self.timeout)
+                    ready.set()
+                    loop.run_forever()
+                
+                self._thread = threading.Thread(target=run, name="tool-http-loop", daemon=True)
+                self._thread.start()
+                ready.wait()
+                self._loop = loop
+        
+        return self._loop
+    
+    def run(self, coro: Coroutine) -> Any:
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+    
+    def iterate(self, iterator: AsyncIterator) -> Iterator:
+        try:
+            while True:
+                try:
+                    yield self.run(iterator.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            self.run(iterator.aclose())
+    
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        loop = self._ensure_loop()
+        deadline = current_deadline()
+        if deadline is not None:
+            kwargs["timeout"] = deadline.timeout(kwargs.get("timeout", self.timeout), "http request")
+        with self.tracer.span("http.request", method=method, url=url) as span:
+            if asyncio.get_running_loop() is loop:
+                pending = self._client.request(method, url, **kwargs)
+            else:
+                pending = asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._client.request(method, url, **kwargs), loop))
+            if deadline is None:
+                response = await pending
+            else:
+                try:
+                    response = await asyncio.wait_for(pending, kwargs["timeout"])
+                except asyncio.TimeoutError:
+                    raise DeadlineExceeded("http request", deadline.seconds)
+            span.set(status_code=response.status_code, response_bytes=len(response.content))
+            return response
+    
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+    
+    def close(self) -> None:
+        with self._lock:
+            if self._loop is None:
+                return
+            asyncio.run_coroutine_threadsafe(self._client.aclose(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._client = None
+            self._loop = None
+            self._thread = None
+
+_default_pool: Optional[HTTPClientPool] = None
+_default_pool_lock = threading.Lock()
+
+def get_http_pool() -> HTTPClientPool:
+    global _default_pool
+    if _default_pool is None:
+        with _default_pool_lock:
+            if _default_pool is None:
+                load_env()
+                _default_pool = HTTPClientPool(
+                    max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", "100")),
+                    max_keepalive_connections=int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20")),
+                    keepalive_expiry=float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+                )
+    return _default_pool
\ No newline at end of file
@@ -0,0 +1,89 @@
+from typing import Dict, Any, Optional
+
+class RepositoryRecord:
+    __slots__ = ("name", "full_name", "stars", "forks", "language", "url", "description", "updated_at", "owner")
+    kind = "repository"
+    
+    def __init__(self, name: str, full_name: Optional[str] = None, stars: int = 0, forks: int = 0, language: Optional[str] = None, url: Optional[str] = None, description: Optional[str] = None, updated_at: Optional[str] = None, owner: Optional[str] = None):
+        self.name = name
+        self.full_name = full_name
+        self.stars = stars
+        self.forks = forks
+        self.language = language
+        self.url = url
+        self.description = description
+        self.updated_at = updated_at
+        self.owner = owner
+    
+    @classmethod
+    def from_api(cls, item: Dict[str, Any]) -> "RepositoryRecord":
+        return cls(
+            name=item.get("name"),
+            full_name=item.get("full_name"),
+            stars=item.get("stargazers_count") or 0,
+            forks=item.get("forks_count") or 0,
+            language=item.get("language"),
+            url=item.get("html_url"),
+            description=item.get("description"),
+            updated_at=item.get("updated_at"),
+            owner=(item.get("owner") or {}).get("login")
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {field: getattr(self, field) for field in self.__slots__}
+    
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, RepositoryRecord) and self.to_dict() == other.to_dict()
+    
+    def __repr__(self) -> str:
+        return f"RepositoryRecord({self.full_name or self.name!r}, stars={self.stars})"
+
+class WeatherReading:
+    __slots__ = ("city", "country", "temperature", "feels_like", "condition", "humidity", "wind_speed", "pressure")
+    kind = "weather"
+    
+    def __init__(self, city: str, country: Optional[str] = None, temperature: Optional[float] = None, feels_like: Optional[float] = None, condition: Optional[str] = None, humidity: Optional[int] = None, wind_speed: Optional[float] = None, pressure: Optional[int] = None):
+        self.city = city
+        self.country = country
+        self.temperature = temperature
+        self.feels_like = feels_like
+        self.condition = condition
+        self.humidity = humidity
+        self.wind_speed = wind_speed
+        self.pressure = pressure
+    
+    @classmethod
+    def from_api(cls, data: Dict[str, Any]) -> "WeatherReading":
+        main = data.get("main") or {}
+        return cls(
+            city=data.get("name"),
+            country=(data.get("sys") or {}).get("country"),
+            temperature=main.get("temp"),
+            feels_like=main.get("feels_like"),
+            condition=(data.get("weather") or [{}])[0].get("description"),
+            humidity=main.get("humidity"),
+            wind_speed=(data.get("wind") or {}).get("speed"),
+            pressure=main.get("pressure")
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {field: getattr(self, field) for field in self.__slots__}
+    
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, WeatherReading) and self.to_dict() == other.to_dict()
+    
+    def __repr__(self) -> str:
+        return f"WeatherReading({self.city!r}, temperature={self.temperature})"
+
+RECORD_TYPES = {record.kind: record for record in (RepositoryRecord, WeatherReading)}
+
+def encode_record(value: Any) -> Any:
+    if isinstance(value, (RepositoryRecord, WeatherReading)):
+        return {"__record__": value.kind, **value.to_dict()}
+    return str(value)
+
+def decode_record(value: Dict[str, Any]) -> Any:
+    kind = value.pop("__record__", None)
+    if kind is None:
+        return value
+    return RECORD_TYPES[kind](**value)
\ No newline at end of file
@@ -0,0 +1,189 @@
+import importlib
+import threading
+from typing import Dict, List, Any, Optional, Callable, Tuple
+
+Loader = Callable[[Optional[str]], Tuple[Optional[Dict[str, Any]], Optional[str]]]
+
+class ToolSpec:
+    def __init__(self, name: str, description: str, entry_point: str, method: str, parameters: Dict[str, Dict[str, Any]], examples: Optional[List[str]] = None, conditional_method: Optional[str] = None, typical_latency_ms: float = 500, cacheable: bool = True, cache_ttl: float = 300, idempotent: bool = True):
+        self.name = name
+        self.description = description
+        self.entry_point = entry_point
+        self.method = method
+        self.parameters = parameters
+        self.examples = examples or []
+        self.conditional_method = conditional_method
+        self.typical_latency_ms = typical_latency_ms
+        self.cacheable = cacheable
+        self.cache_ttl = cache_ttl
+        self.idempotent = idempotent
+    
+    def bind(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        arguments = {}
+        for name, schema in self.parameters.items():
+            if schema.get("type") == "array":
+                value = parameters.get(name, schema.get("default"))
+                if isinstance(value, str):
+                    value = value.split(",")
+                if value:
+                    arguments[name] = list(dict.fromkeys(str(item).strip() for item in value if str(item).strip()))
+                continue
+            value = parameters.get(name, schema.get("default", ""))
+            if schema.get("type") == "integer" and value not in (None, ""):
+                try:
+                    value = int(value)
+                except (TypeError, ValueError):
+                    raise ValueError(f"Parameter {name} of {self.name} must be an integer, got {value!r}")
+            arguments[name] = value
+        return arguments
+    
+    def missing_parameters(self, parameters: Dict[str, Any]) -> List[str]:
+        return [
+            name for name, schema in self.parameters.items()
+            if schema.get("required") and parameters.get(name) in (None, "")
+            and not parameters.get(schema.get("alternative"))
+        ]
+    
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "description": self.description,
+            "parameters": {name: schema["description"] for name, schema in self.parameters.items()},
+            "examples": self.examples
+        }
+
+class ToolRegistry:
+    def __init__(self):
+        self._specs: Dict[str, ToolSpec] = {}
+        self._instances: Dict[str, Any] = {}
+        self._catalogue: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+        self.version = 0
+    
+    def register(self, spec: ToolSpec, instance: Any = None) -> None:
+        with self._lock:
+            self._specs[spec.name] = spec
+            self._instances.pop(spec.name, None)
+            if instance is not None:
+                self._instances[spec.name] = instance
+            self._catalogue = None
+            self.version += 1
+    
+    def names(self) -> List[str]:
+        return list(self._specs)
+    
+    def get(self, name: str) -> Optional[ToolSpec]:
+        return self._specs.get(name)
+    
+    def get_spec(self, name: str) -> ToolSpec:
+        spec = self._specs.get(name)
+        if spec is None:
+            raise ValueError(f"Unknown tool: {name}")
+        return spec
+    
+    def get_tool(self, name: str) -> Any:
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        
+        spec = self.get_spec(name)
+        with self._lock:
+            if name not in self._instances:
+                module_name, _, attribute = spec.entry_point.partition(":")
+                factory = getattr(importlib.import_module(module_name), attribute)
+                self._instances[name] = factory()
+            return self._instances[name]
+    
+    def loader(self, name: str, arguments: Dict[str, Any]) -> Loader:
+        spec = self.get_spec(name)
+        tool = self.get_tool(name)
+        if spec.conditional_method:
+            conditional = getattr(tool, spec.conditional_method)
+            return lambda etag: conditional(etag=etag, **arguments)
+        method = getattr(tool, spec.method)
+        return lambda etag: (method(**arguments), None)
+    
+    def catalogue(self) -> Dict[str, Any]:
+        catalogue = self._catalogue
+        if catalogue is None:
+            with self._lock:
+                catalogue = {name: spec.describe() for name, spec in self._specs.items()}
+                self._catalogue = catalogue
+        return catalogue
+    
+    def cache_ttls(self) -> Dict[str, float]:
+        return {name: spec.cache_ttl for name, spec in self._specs.items() if spec.cacheable}
+
+def _builtin_specs() -> List[ToolSpec]:
+    return [
+        ToolSpec(
+            name="github_search",
+            description="Search GitHub repositories by query, sort by stars/forks/updated, get repository details",
+            entry_point="tools.github_tool:GitHubTool",
+            method="search",
+            conditional_method="search_conditional",
+            parameters={
+                "query": {
+                    "type": "string",
+                    "required": True,
+                    "description": "Search query (e.g., 'python machine learning', 'javascript react')"
+                },
+                "sort": {
+                    "type": "string",
+                    "default": "stars",
+                    "description": "Sort by: stars, forks, or updated (default: stars)"
+                },
+                "max_results": {
+                    "type": "integer",
+                    "default": 5,
+                    "description": "Maximum number of results to return (default: 5, max: 1000; more than 100 costs one request per extra page)"
+                }
+            },
+            examples=[
+                "Find top Python repos",
+                "Search for machine learning projects",
+                "Find React repositories sorted by stars"
+            ],
+            typical_latency_ms=800,
+            cache_ttl=3600
+        ),
+        ToolSpec(
+            name="weather_get",
+            description="Get current weather information for one or more cities including temperature, conditions, and humidity",
+            entry_point="tools.weather_tool:WeatherTool",
+            method="get_weather",
+            parameters={
+                "city": {
+                    "type": "string",
+                    "required": True,
+                    "alternative": "cities",
+                    "description": "City name (e.g., 'New York', 'London', 'Tokyo')"
+                },
+                "cities": {
+                    "type": "array",
+                    "description": "List of city names fetched together in one step (e.g., ['Delhi', 'Mumbai']); use instead of city for several cities"
+                }
+            },
+            examples=[
+                "Get weather in New York",
+                "Check temperature in London",
+                "What's the weather in Tokyo",
+                "Weather in Delhi, Mumbai and Chennai"
+            ],
+            typical_latency_ms=300,
+            cache_ttl=600
+        )
+    ]
+
+_default_registry: Optional[ToolRegistry] = None
+_default_registry_lock = threading.Lock()
+
+def get_registry() -> ToolRegistry:
+    global _default_registry
+    if _default_registry is None:
+        with _default_registry_lock:
+            if _default_registry is None:
+                registry = ToolRegistry()
+                for spec in _builtin_specs():
+                    registry.register(spec)
+                _default_registry = registry
+    return _default_registry
\ No newline at end of file
@@ -1,18 +1,110 @@
 import os
-import requests
-from typing import Dict, Any
+import asyncio
+from typing import Dict, List, Any, Optional
+from tools.http_client import HTTPClientPool, get_http_pool
+from tools.errors import ToolError, error_from_response, error_from_exception
+from tools.records import WeatherReading
+from utils.env import load_env
+from utils.rate_limit import TokenBucket, get_limiter
+from utils.hedging import Hedger, get_hedger
 
 class WeatherTool:
-    def __init__(self):
+    MAX_GROUP_SIZE = 20
+    MAX_CITY_IDS = 2048
+    
+    def __init__(self, http_pool: Optional[HTTPClientPool] = None, limiter: Optional[TokenBucket] = None, hedger: Optional[Hedger] = None):
+        self.http = http_pool or get_http_pool()
+        self.limiter = limiter or get_limiter("openweather")
+        self.hedger = hedger or get_hedger("openweather")
+        load_env()
         self.api_key = os.getenv("OPENWEATHER_API_KEY")
-        self.base_url = "https://api.openweathermap.org/data/2.5/weather"
+        api_url = os.getenv("OPENWEATHER_API_URL", "https://api.openweathermap.org/data/2.5").rstrip("/")
+        self.base_url = f"{api_url}/weather"
+        self.group_url = f"{api_url}/group"
+        self.city_ids: Dict[str, int] = {}
+    
+    def get_weather(self, city: str = "", cities: Optional[List[str]] = None) -> Any:
+        if cities:
+            return self.http.run(self.get_weather_many_async(cities))
+        return self.http.run(self.get_weather_async(city))
+    
+    async def get_weather_many_async(self, cities: List[str]) -> Dict[str, Any]:
+        cities = list(dict.fromkeys(city for city in cities if city))
+        if not cities:
+            raise ToolError("At least one city is required")
+        
+        if not self.api_key:
+            raise ToolError("OPENWEATHER_API_KEY not configured")
+        
+        known = [city for city in cities if city.lower() in self.city_ids]
+        groups = [known[start:start + self.MAX_GROUP_SIZE] for start in range(0, len(known), self.MAX_GROUP_SIZE)] if len(known) > 1 else []
+        grouped = {city for group in groups for city in group}
+        singles = [city for city in cities if city not in grouped]
+        
+        outcomes = await asyncio.gather(
+            *(self._get_group_async(group) for group in groups),
+            *(self.get_weather_async(city) for city in singles),
+            return_exceptions=True
+        )
+        readings: Dict[str, WeatherReading] = {}
+        for outcome in outcomes[:len(groups)]:
+            if isinstance(outcome, dict):
+                readings.update(outcome)
+            elif not isinstance(outcome, Exception):
+                raise outcome
+        
+        fallback = [city for group in groups for city in group if city not in readings]
+        if fallback:
+            outcomes += await asyncio.gather(*(self.get_weather_async(city) for city in fallback), return_exceptions=True)
+        
+        errors: Dict[str, Exception] = {}
+        for city, outcome in zip(singles + fallback, outcomes[len(groups):]):
+            if isinstance(outcome, Exception):
+                errors[city] = outcome
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            else:
+                readings[city] = outcome
+        
+        if not readings:
+            raise errors[cities[0]]
+        
+        return {
+            "cities": {city: readings[city] for city in cities if city in readings},
+            "errors": {city: str(error) for city, error in errors.items()}
+        }
+    
+    async def _get_group_async(self, cities: List[str]) -> Dict[str, WeatherReading]:
+        ids = {self.city_ids[city.lower()]: city for city in cities}
+        params = {
+            "id": ",".join(str(city_id) for city_id in ids),
+            "appid": self.api_key,
+            "units": "metric"
+        }
+        
+        await self.limiter.acquire_async()
+        
+        try:
+            response = await self.hedger.run_async(
+                lambda: self.http.get(self.group_url, params=params, timeout=10),
+                admit=self.limiter.try_acquire
+            )
+            if response.is_error:
+                raise error_from_response("Weather", response)
+            return {
+                ids[item["id"]]: self._parse_reading(item)
+                for item in response.json().get("list", [])
+                if item.get("id") in ids
+            }
+        except Exception as e:
+            raise error_from_exception("Weather", e) from e
     
-    def get_weather(self, city: str) -> Dict[str, Any]:
+    async def get_weather_async(self, city: str) -> WeatherReading:
         if not city:
-            return {"error": "City parameter is required"}
+            raise ToolError("City parameter is required")
         
         if not self.api_key:
-            return {"error": "OPENWEATHER_API_KEY not configured"}
+            raise ToolError("OPENWEATHER_API_KEY not configured")
         
         params = {
             "q": city,
@@ -20,27 +112,29 @@ class WeatherTool:
             "units": "metric"
         }
         
+        await self.limiter.acquire_async()
+        
         try:
-            response = requests.get(
-                self.base_url,
-                params=params,
-                timeout=10
+            response = await self.hedger.run_async(
+                lambda: self.http.get(
+                    self.base_url,
+                    params=params,
+                    timeout=10
+                ),
+                admit=self.limiter.try_acquire
             )
-            response.raise_for_status()
+            if response.status_code == 404:
+                raise ToolError(f"City not found: {city}", status_code=404)
+            if response.is_error:
+                raise error_from_response("Weather", response)
             data = response.json()
+            if data.get("id") is not None and len(self.city_ids) < self.MAX_CITY_IDS:
+                self.city_ids[city.lower()] = data["id"]
             
-            return {
-                "city": data.get("name"),
-                "country": data.get("sys", {}).get("country"),
-                "temperature": f"{data['main'].get('temp')}°C",
-                "feels_like": f"{data['main'].get('feels_like')}°C",
-                "condition": data["weather"][0].get("description"),
-                "humidity": f"{data['main'].get('humidity')}%",
-                "wind_speed": f"{data.get('wind', {}).get('speed')} m/s",
-                "pressure": f"{data['main'].get('pressure')} hPa"
-            }
+            return self._parse_reading(data)
             
-        except requests.exceptions.RequestException as e:
-            return {"error": f"Weather API request failed: {str(e)}"}
         except Exception as e:
-            return {"error": f"Unexpected error: {str(e)}"}
\ No newline at end of file
+            raise error_from_exception("Weather", e) from e
+    
+    def _parse_reading(self, data: Dict[str, Any]) -> WeatherReading:
+        return WeatherReading.from_api(data)
\ No newline at end of file
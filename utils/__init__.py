@@ -0,0 +1,18 @@
+from .singleflight import SingleFlight
+from .retry import RetryPolicy
+from .circuit_breaker import CircuitBreaker, CircuitOpenError, get_breaker, breaker_states
+from .env import load_env
+from .tracing import Span, Tracer, get_tracer, start_metrics_server
+from .rate_limit import TokenBucket, RateLimitExceeded, get_limiter, limiter_states
+from .deadline import Deadline, DeadlineExceeded, current_deadline, deadline_scope, create_deadline
+from .hedging import Hedger, get_hedger, hedger_states
+from .profiling import Profile, profile_request, current_profile, track_allocations
+
+__all__ = [
+    'SingleFlight', 'RetryPolicy', 'CircuitBreaker', 'CircuitOpenError', 'get_breaker', 'breaker_states',
+    'TokenBucket', 'RateLimitExceeded', 'get_limiter', 'limiter_states', 'load_env',
+    'Span', 'Tracer', 'get_tracer', 'start_metrics_server',
+    'Deadline', 'DeadlineExceeded', 'current_deadline', 'deadline_scope', 'create_deadline',
+    'Hedger', 'get_hedger', 'hedger_states',
+    'Profile', 'profile_request', 'current_profile', 'track_allocations'
+]
\ No newline at end of file
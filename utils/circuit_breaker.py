@@ -0,0 +1,92 @@
+import time
+import threading
+from typing import Dict, Any, List, Optional
+
+class CircuitOpenError(Exception):
+    retryable = False
+    
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuit for {name} is open; failing fast for another {retry_after:.1f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0, half_open_max_calls: int = 1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.half_open_calls = 0
+        self.stats = {"successes": 0, "failures": 0, "rejected": 0, "opened": 0}
+        self._lock = threading.Lock()
+    
+    def before_call(self) -> None:
+        with self._lock:
+            if self.state == self.OPEN:
+                remaining = self.opened_at + self.reset_timeout - time.monotonic()
+                if remaining > 0:
+                    self.stats["rejected"] += 1
+                    raise CircuitOpenError(self.name, remaining)
+                self.state = self.HALF_OPEN
+                self.half_open_calls = 0
+            
+            if self.state == self.HALF_OPEN:
+                if self.half_open_calls >= self.half_open_max_calls:
+                    self.stats["rejected"] += 1
+                    raise CircuitOpenError(self.name, 0.0)
+                self.half_open_calls += 1
+    
+    def record_success(self) -> None:
+        with self._lock:
+            self.stats["successes"] += 1
+            self.consecutive_failures = 0
+            self.state = self.CLOSED
+            self.opened_at = None
+    
+    def record_failure(self) -> None:
+        with self._lock:
+            self.stats["failures"] += 1
+            self.consecutive_failures += 1
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.stats["opened"] += 1
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+    
+    def release(self) -> None:
+        with self._lock:
+            if self.state == self.HALF_OPEN and self.half_open_calls > 0:
+                self.half_open_calls -= 1
+    
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            snapshot = {
+                "name": self.name,
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures
+            }
+            snapshot.update(self.stats)
+            if self.state == self.OPEN:
+                snapshot["retry_in"] = max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+        return snapshot
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+def get_breaker(name: str, **kwargs) -> CircuitBreaker:
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name, **kwargs)
+        return _breakers[name]
+
+def breaker_states() -> List[Dict[str, Any]]:
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return [breaker.snapshot() for breaker in breakers]
\ No newline at end of file
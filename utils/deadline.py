@@ -0,0 +1,84 @@
+import os
+import time
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Any, Optional, Iterator
+from utils.env import load_env
+
+_current_deadline: ContextVar[Optional["Deadline"]] = ContextVar("request_deadline", default=None)
+
+FAST_MODEL = "fast_model"
+RULES_ONLY = "rules_only_verification"
+PARTIAL_RESULTS = "partial_results"
+
+class DeadlineExceeded(Exception):
+    retryable = False
+    
+    def __init__(self, stage: str, seconds: float):
+        super().__init__(f"Deadline exceeded during {stage} ({seconds:.1f}s budget)")
+        self.stage = stage
+        self.seconds = seconds
+
+class Deadline:
+    STAGE_SHARES = {"plan": 0.5, "stream_plan": 0.6, "execute": 0.85, "verify": 1.0}
+    
+    def __init__(self, seconds: float, started_at: Optional[float] = None, degraded: Optional[List[str]] = None, lock: Optional[threading.Lock] = None):
+        waited = max(0.0, time.time() - started_at) if started_at is not None else 0.0
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds - waited
+        self.degraded = degraded if degraded is not None else []
+        self._lock = lock or threading.Lock()
+    
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+    
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+    
+    def check(self, stage: str) -> None:
+        if self.expired():
+            raise DeadlineExceeded(stage, self.seconds)
+    
+    def budget(self, stage: str) -> float:
+        return self.remaining() * self.STAGE_SHARES.get(stage, 1.0)
+    
+    def stage(self, stage: str) -> "Deadline":
+        return Deadline(self.budget(stage), degraded=self.degraded, lock=self._lock)
+    
+    def timeout(self, default: Optional[float], stage: str) -> float:
+        self.check(stage)
+        remaining = self.remaining()
+        return remaining if default is None else min(default, remaining)
+    
+    def degrade(self, level: str) -> None:
+        with self._lock:
+            if level not in self.degraded:
+                self.degraded.append(level)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        remaining = self.remaining()
+        return {
+            "budget": self.seconds,
+            "remaining": remaining,
+            "expired": remaining <= 0,
+            "degraded": list(self.degraded)
+        }
+
+def current_deadline() -> Optional[Deadline]:
+    return _current_deadline.get()
+
+@contextmanager
+def deadline_scope(deadline: Optional[Deadline]) -> Iterator[Optional[Deadline]]:
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+def create_deadline(started_at: Optional[float] = None, seconds: Optional[float] = None) -> Optional[Deadline]:
+    load_env()
+    seconds = float(os.getenv("REQUEST_DEADLINE", "30")) if seconds is None else seconds
+    if seconds <= 0:
+        return None
+    return Deadline(seconds, started_at=started_at)
\ No newline at end of file
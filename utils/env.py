@@ -0,0 +1,14 @@
+import threading
+
+_loaded = False
+_lock = threading.Lock()
+
+def load_env() -> None:
+    global _loaded
+    if _loaded:
+        return
+    with _lock:
+        if not _loaded:
+            from dotenv import load_dotenv
+            load_dotenv()
+            _loaded = True
\ No newline at end of file
@@ -0,0 +1,203 @@
+import os
+import math
+import time
+import asyncio
+import threading
+import contextvars
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, Any, Optional, Callable, Awaitable
+from utils.env import load_env
+from utils.tracing import get_tracer
+
+class Hedger:
+    def __init__(self, name: str, enabled: bool = True, percentile: float = 95.0, budget: float = 0.05, window: int = 200, min_samples: int = 20, max_tokens: float = 10.0, max_workers: int = 32):
+        self.name = name
+        self.enabled = enabled
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self.max_tokens = max_tokens
+        self.max_workers = max_workers
+        self._samples: deque = deque(maxlen=window)
+        self._tail: deque = deque(maxlen=window)
+        self._tokens = 0.0
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "hedged": 0, "hedge_wins": 0, "denied": 0, "saved_seconds": 0.0}
+    
+    def threshold(self) -> Optional[float]:
+        with self._lock:
+            if not self._samples or len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, max(0, math.ceil(self.percentile / 100 * len(ordered)) - 1))]
+    
+    def run(self, call: Callable[[], Any], admit: Optional[Callable[[], bool]] = None) -> Any:
+        if not self.enabled:
+            return call()
+        
+        threshold = delay = self._start()
+        started = time.monotonic()
+        pool = self._executor()
+        primary = pool.submit(contextvars.copy_context().run, call)
+        attempts = {primary: started}
+        pending = {primary}
+        error = None
+        try:
+            while True:
+                done, pending = wait(pending, timeout=self._wait(delay, started, len(attempts)), return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is None:
+                        return self._finish(future.result(), attempts[future], len(attempts) > 1, future is not primary, started, threshold)
+                    error = error or future.exception()
+                if not pending:
+                    raise error
+                if not done and len(attempts) == 1:
+                    delay = None
+                    if self._admit(admit):
+                        hedge = pool.submit(contextvars.copy_context().run, call)
+                        attempts[hedge] = time.monotonic()
+                        pending.add(hedge)
+        finally:
+            for future in pending:
+                if not future.cancel():
+                    future.add_done_callback(lambda future, begun=attempts[future]: self._observe(future, begun, threshold))
+    
+    async def run_async(self, call: Callable[[], Awaitable[Any]], admit: Optional[Callable[[], bool]] = None) -> Any:
+        if not self.enabled:
+            return await call()
+        
+        threshold = delay = self._start()
+        started = time.monotonic()
+        primary = asyncio.ensure_future(call())
+        attempts = {primary: started}
+        pending = {primary}
+        error = None
+        try:
+            while True:
+                done, pending = await asyncio.wait(pending, timeout=self._wait(delay, started, len(attempts)), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return self._finish(task.result(), attempts[task], len(attempts) > 1, task is not primary, started, threshold)
+                    error = error or task.exception()
+                if not pending:
+                    raise error
+                if not done and len(attempts) == 1:
+                    delay = None
+                    if self._admit(admit):
+                        hedge = asyncio.ensure_future(call())
+                        attempts[hedge] = time.monotonic()
+                        pending.add(hedge)
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"hedge-{self.name}")
+        return self._pool
+    
+    def _start(self) -> Optional[float]:
+        with self._lock:
+            self.stats["calls"] += 1
+            self._tokens = min(self.max_tokens, self._tokens + self.budget)
+        return self.threshold()
+    
+    def _wait(self, delay: Optional[float], started: float, attempts: int) -> Optional[float]:
+        if delay is None or attempts > 1:
+            return None
+        return max(0.0, delay - (time.monotonic() - started))
+    
+    def _admit(self, admit: Optional[Callable[[], bool]]) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                self.stats["denied"] += 1
+                return False
+            self._tokens -= 1
+        if admit is not None and not admit():
+            with self._lock:
+                self._tokens += 1
+                self.stats["denied"] += 1
+            return False
+        with self._lock:
+            self.stats["hedged"] += 1
+        return True
+    
+    def _observe(self, future: Any, begun: float, threshold: Optional[float]) -> None:
+        if not future.cancelled() and future.exception() is None:
+            with self._lock:
+                self._add_sample(time.monotonic() - begun, threshold)
+    
+    def _add_sample(self, latency: float, threshold: Optional[float]) -> None:
+        self._samples.append(latency)
+        if threshold is not None and latency > threshold:
+            self._tail.append(latency)
+    
+    def _finish(self, value: Any, attempt_started: float, hedged: bool, hedge_won: bool, started: float, threshold: Optional[float]) -> Any:
+        now = time.monotonic()
+        elapsed = now - started
+        with self._lock:
+            if hedged:
+                self._samples.append(now - attempt_started)
+            else:
+                self._add_sample(now - attempt_started, threshold)
+            if hedge_won:
+                slower = [sample for sample in self._tail if sample > elapsed]
+                saved = sum(slower) / len(slower) - elapsed if slower else 0.0
+                self.stats["hedge_wins"] += 1
+                self.stats["saved_seconds"] += saved
+        if hedge_won:
+            span = get_tracer().current_span()
+            if span is not None:
+                span.set(hedged=self.name, hedge_saved=saved)
+        return value
+    
+    def snapshot(self) -> Dict[str, Any]:
+        threshold = self.threshold()
+        with self._lock:
+            snapshot = {"name": self.name, "enabled": self.enabled, "threshold": threshold, "samples": len(self._samples)}
+            snapshot.update(self.stats)
+        snapshot["hedge_rate"] = snapshot["hedged"] / snapshot["calls"] if snapshot["calls"] else 0.0
+        return snapshot
+
+_hedgers: Dict[str, Hedger] = {}
+_hedgers_lock = threading.Lock()
+
+def get_hedger(name: str) -> Hedger:
+    with _hedgers_lock:
+        if name not in _hedgers:
+            load_env()
+            setting = os.getenv("HEDGING", "0").strip().lower()
+            _hedgers[name] = Hedger(
+                name,
+                enabled=setting in ("1", "all") or name in {part.strip() for part in setting.split(",")},
+                percentile=float(os.getenv("HEDGE_PERCENTILE", "95")),
+                budget=float(os.getenv("HEDGE_BUDGET", "0.05")),
+                min_samples=int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+            )
+        return _hedgers[name]
+
+def hedger_states() -> Dict[str, Dict[str, Any]]:
+    with _hedgers_lock:
+        hedgers = list(_hedgers.values())
+    return {hedger.name: hedger.snapshot() for hedger in hedgers}
+
+def hedging_prometheus_text() -> str:
+    states = hedger_states()
+    metrics = [
+        ("ai_ops_hedge_calls_total", "calls", "Calls that went through a hedger"),
+        ("ai_ops_hedges_total", "hedged", "Duplicate requests issued after the latency threshold"),
+        ("ai_ops_hedge_wins_total", "hedge_wins", "Calls answered by the duplicate request"),
+        ("ai_ops_hedge_denied_total", "denied", "Hedges skipped because the hedge budget or rate limit was exhausted"),
+        ("ai_ops_hedge_saved_seconds_total", "saved_seconds", "Estimated latency saved by hedge wins")
+    ]
+    lines: List[str] = []
+    for metric, field, description in metrics:
+        lines.append(f"# HELP {metric} {description}")
+        lines.append(f"# TYPE {metric} counter")
+        for name in sorted(states):
+            lines.append(f'{metric}{{upstream="{name}"}} {states[name][field]}')
+    return "\n".join(lines) + "\n"
\ No newline at end of file
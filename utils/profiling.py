@@ -0,0 +1,214 @@
+import os
+import re
+import sys
+import time
+import threading
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+from utils.env import load_env
+
+_current_profile: ContextVar[Optional["Profile"]] = ContextVar("active_profile", default=None)
+_tracemalloc_users = 0
+_tracemalloc_started = False
+_tracemalloc_lock = threading.Lock()
+
+MEMORY_STAGES = ("planner.create_plan", "planner.stream_plan", "verifier.verify_results", "ui.render")
+
+class Profile:
+    def __init__(self, name: str, output_dir: str = "profiles", interval: float = 0.005, top: int = 25, trace_memory: bool = True):
+        self.name = re.sub(r"[^A-Za-z0-9_.-]", "_", name)
+        self.output_dir = output_dir
+        self.interval = interval
+        self.top = top
+        self.trace_memory = trace_memory
+        self.stacks: Counter = Counter()
+        self.allocations: Dict[str, List[Tuple[int, int, str]]] = {}
+        self.report: Optional[Dict[str, Any]] = None
+        self._threads: Dict[int, List[str]] = {}
+        self._snapshots: Dict[Tuple[int, str], List[Any]] = {}
+        self._labels: Dict[Any, str] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._started = 0.0
+        self._elapsed = 0.0
+    
+    def start(self) -> "Profile":
+        if self.trace_memory:
+            _start_tracemalloc()
+        self._started = time.perf_counter()
+        self._sampler = threading.Thread(target=self._sample, name=f"profiler-{self.name}", daemon=True)
+        self._sampler.start()
+        return self
+    
+    def stop(self) -> None:
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        self._elapsed = time.perf_counter() - self._started
+        if self.trace_memory:
+            _stop_tracemalloc()
+    
+    def enter(self, stage: str) -> None:
+        thread = threading.get_ident()
+        with self._lock:
+            self._threads.setdefault(thread, []).append(stage)
+        if self.trace_memory and stage in MEMORY_STAGES and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            with self._lock:
+                self._snapshots.setdefault((thread, stage), []).append(snapshot)
+    
+    def exit(self, stage: str) -> None:
+        thread = threading.get_ident()
+        with self._lock:
+            stages = self._threads.get(thread, [])
+            for index in range(len(stages) - 1, -1, -1):
+                if stages[index] == stage:
+                    del stages[index]
+                    break
+            if not stages:
+                self._threads.pop(thread, None)
+            opened = self._snapshots.get((thread, stage))
+            before = opened.pop() if opened else None
+        if before is not None and tracemalloc.is_tracing():
+            self._record_allocations(stage, before, tracemalloc.take_snapshot())
+    
+    def _record_allocations(self, stage: str, before: Any, after: Any) -> None:
+        ignored = (tracemalloc.__file__, __file__)
+        rows = []
+        for stat in after.compare_to(before, "lineno"):
+            if len(rows) >= self.top or stat.size_diff <= 0:
+                break
+            frame = stat.traceback[0]
+            if frame.filename not in ignored:
+                rows.append((stat.size_diff, stat.count_diff, f"{self._short_path(frame.filename)}:{frame.lineno}"))
+        with self._lock:
+            self.allocations.setdefault(stage, []).extend(rows)
+    
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            with self._lock:
+                active = {thread: ";".join(f"[{stage}]" for stage in stages) for thread, stages in self._threads.items() if stages}
+            for thread, stages in active.items():
+                frame = frames.get(thread)
+                if frame is None:
+                    continue
+                calls = []
+                while frame is not None:
+                    calls.append(self._label(frame.f_code))
+                    frame = frame.f_back
+                calls.reverse()
+                self.stacks[f"{stages};{';'.join(calls)}"] += 1
+    
+    def _label(self, code: Any) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = f"{code.co_name} ({self._short_path(code.co_filename)}:{code.co_firstlineno})"
+        return label
+    
+    def _short_path(self, filename: str) -> str:
+        relative = os.path.relpath(filename) if os.path.isabs(filename) else filename
+        if relative.startswith(".."):
+            parts = filename.replace("\\", "/").split("/")
+            marker = "site-packages"
+            relative = "/".join(parts[parts.index(marker) + 1:]) if marker in parts else "/".join(parts[-2:])
+        return relative.replace(";", "_")
+    
+    def stage_samples(self) -> Dict[str, int]:
+        stages: Counter = Counter()
+        for stack, count in self.stacks.items():
+            stages[stack.split(";")[0].strip("[]")] += count
+        return dict(stages)
+    
+    def top_allocations(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        rows = [
+            {"stage": stage, "size_kib": size / 1024, "blocks": count, "line": line}
+            for stage, entries in self.allocations.items()
+            for size, count, line in entries
+        ]
+        rows.sort(key=lambda row: -row["size_kib"])
+        return rows[:limit or self.top]
+    
+    def write(self) -> Dict[str, Any]:
+        os.makedirs(self.output_dir, exist_ok=True)
+        stacks_path = os.path.join(self.output_dir, f"{self.name}.collapsed")
+        allocations_path = os.path.join(self.output_dir, f"{self.name}.alloc.txt")
+        
+        with open(stacks_path, "w", encoding="utf-8") as handle:
+            for stack, count in sorted(self.stacks.items()):
+                handle.write(f"{stack} {count}\n")
+        
+        with open(allocations_path, "w", encoding="utf-8") as handle:
+            handle.write(f"Profile {self.name}: {self._elapsed:.3f}s, {sum(self.stacks.values())} CPU sample(s) every {self.interval * 1000:g}ms\n")
+            for stage, samples in sorted(self.stage_samples().items(), key=lambda item: -item[1]):
+                handle.write(f"  {stage}: {samples} sample(s)\n")
+            for stage in sorted(self.allocations):
+                handle.write(f"\n[{stage}] top allocations (net growth while the stage ran)\n")
+                for size, count, line in sorted(self.allocations[stage], reverse=True)[:self.top]:
+                    handle.write(f"  {size / 1024:10.1f} KiB {count:+8d} blocks  {line}\n")
+        
+        self.report = {
+            "stacks": stacks_path,
+            "allocations": allocations_path,
+            "elapsed": self._elapsed,
+            "samples": sum(self.stacks.values()),
+            "stages": self.stage_samples(),
+            "top_allocations": self.top_allocations(10)
+        }
+        return self.report
+
+def _start_tracemalloc() -> None:
+    global _tracemalloc_users, _tracemalloc_started
+    with _tracemalloc_lock:
+        if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start(int(os.getenv("AI_OPS_PROFILE_FRAMES", "1")))
+            _tracemalloc_started = True
+        _tracemalloc_users += 1
+
+def _stop_tracemalloc() -> None:
+    global _tracemalloc_users, _tracemalloc_started
+    with _tracemalloc_lock:
+        _tracemalloc_users -= 1
+        if _tracemalloc_users == 0 and _tracemalloc_started:
+            tracemalloc.stop()
+            _tracemalloc_started = False
+
+@contextmanager
+def track_allocations(stage: str, profile: Optional[Profile]) -> Iterator[None]:
+    before = tracemalloc.take_snapshot() if profile is not None and profile.trace_memory and tracemalloc.is_tracing() else None
+    try:
+        yield
+    finally:
+        if before is not None and tracemalloc.is_tracing():
+            profile._record_allocations(stage, before, tracemalloc.take_snapshot())
+
+def current_profile() -> Optional[Profile]:
+    return _current_profile.get()
+
+def profiling_requested() -> bool:
+    load_env()
+    return os.getenv("AI_OPS_PROFILE", "0") == "1"
+
+@contextmanager
+def profile_request(name: str, enabled: bool = False) -> Iterator[Optional[Profile]]:
+    if not (enabled or profiling_requested()):
+        yield None
+        return
+    
+    profile = Profile(
+        name,
+        output_dir=os.getenv("AI_OPS_PROFILE_DIR", "profiles"),
+        interval=float(os.getenv("AI_OPS_PROFILE_INTERVAL", "0.005")),
+        trace_memory=os.getenv("AI_OPS_PROFILE_MEMORY", "1") == "1"
+    ).start()
+    token = _current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _current_profile.reset(token)
+        profile.stop()
+        profile.write()
\ No newline at end of file
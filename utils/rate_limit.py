@@ -0,0 +1,177 @@
+import os
+import time
+import sqlite3
+import threading
+from typing import Dict, Any, Optional
+from utils.env import load_env
+from utils.deadline import current_deadline
+
+class RateLimitExceeded(Exception):
+    retryable = False
+    
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Rate limit for {name} exceeded; next slot in {retry_after:.1f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+class TokenBucket:
+    def __init__(self, name: str, rate_per_minute: float, capacity: Optional[float] = None, db_path: Optional[str] = None, max_wait: float = 30.0):
+        self.name = name
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.max_wait = max_wait
+        self.db_path = db_path
+        self._tokens = self.capacity
+        self._updated_at = time.time()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.stats = {"acquired": 0, "waited": 0, "rejected": 0, "wait_seconds": 0.0}
+        if db_path:
+            self._connection().execute(
+                "CREATE TABLE IF NOT EXISTS token_buckets (name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+    
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+    
+    def _take(self, tokens: float) -> float:
+        tokens = min(tokens, self.capacity)
+        with self._lock:
+            if self.db_path:
+                return self._take_shared(tokens)
+            
+            now = time.time()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+    
+    def _take_shared(self, tokens: float) -> float:
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            row = connection.execute("SELECT tokens, updated_at FROM token_buckets WHERE name = ?", (self.name,)).fetchone()
+            available = self.capacity if row is None else min(self.capacity, row[0] + (now - row[1]) * self.rate)
+            wait = 0.0
+            if available >= tokens:
+                available -= tokens
+            else:
+                wait = (tokens - available) / self.rate
+            connection.execute(
+                "INSERT OR REPLACE INTO token_buckets (name, tokens, updated_at) VALUES (?, ?, ?)",
+                (self.name, available, now)
+            )
+            connection.execute("COMMIT")
+            return wait
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+    
+    def refund(self, tokens: float) -> None:
+        with self._lock:
+            if not self.db_path:
+                self._tokens = min(self.capacity, self._tokens + tokens)
+                return
+            
+            connection = self._connection()
+            connection.execute(
+                "UPDATE token_buckets SET tokens = MIN(?, tokens + ?) WHERE name = ?",
+                (self.capacity, tokens, self.name)
+            )
+    
+    def _record(self, waited: float, rejected: bool = False) -> None:
+        with self._lock:
+            if rejected:
+                self.stats["rejected"] += 1
+                return
+            self.stats["acquired"] += 1
+            if waited > 0:
+                self.stats["waited"] += 1
+                self.stats["wait_seconds"] += waited
+    
+    def try_acquire(self, tokens: float = 1) -> bool:
+        if self._take(tokens) > 0:
+            return False
+        self._record(0.0)
+        return True
+    
+    def acquire(self, tokens: float = 1, max_wait: Optional[float] = None) -> float:
+        limit = self.max_wait if max_wait is None else max_wait
+        deadline = current_deadline()
+        if deadline is not None:
+            limit = min(limit, deadline.remaining())
+        started = time.monotonic()
+        slept = False
+        while True:
+            wait = self._take(tokens)
+            waited = time.monotonic() - started
+            if wait <= 0:
+                self._record(waited if slept else 0.0)
+                return waited
+            if waited + wait > limit:
+                self._record(waited, rejected=True)
+                raise RateLimitExceeded(self.name, wait)
+            time.sleep(wait)
+            slept = True
+    
+    async def acquire_async(self, tokens: float = 1, max_wait: Optional[float] = None) -> float:
+        import asyncio
+        limit = self.max_wait if max_wait is None else max_wait
+        deadline = current_deadline()
+        if deadline is not None:
+            limit = min(limit, deadline.remaining())
+        started = time.monotonic()
+        slept = False
+        while True:
+            wait = self._take(tokens)
+            waited = time.monotonic() - started
+            if wait <= 0:
+                self._record(waited if slept else 0.0)
+                return waited
+            if waited + wait > limit:
+                self._record(waited, rejected=True)
+                raise RateLimitExceeded(self.name, wait)
+            await asyncio.sleep(wait)
+            slept = True
+    
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            snapshot = {"name": self.name, "rate_per_minute": self.rate * 60, "capacity": self.capacity, "shared": bool(self.db_path)}
+            snapshot.update(self.stats)
+        return snapshot
+
+DEFAULT_LIMITS = {
+    "github": ("GITHUB_RPM", 30),
+    "openweather": ("OPENWEATHER_RPM", 60),
+    "llm_requests": ("LLM_RPM", 10),
+    "llm_tokens": ("LLM_TPM", 250000)
+}
+
+_limiters: Dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+def get_limiter(name: str) -> TokenBucket:
+    with _limiters_lock:
+        if name not in _limiters:
+            load_env()
+            env_name, default = DEFAULT_LIMITS.get(name, (f"{name.upper()}_RPM", 60))
+            _limiters[name] = TokenBucket(
+                name,
+                rate_per_minute=float(os.getenv(env_name, str(default))),
+                db_path=os.getenv("RATE_LIMIT_DB") or None,
+                max_wait=float(os.getenv("RATE_LIMIT_MAX_WAIT", "30"))
+            )
+        return _limiters[name]
+
+def limiter_states() -> Dict[str, Dict[str, Any]]:
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return {limiter.name: limiter.snapshot() for limiter in limiters}
\ No newline at end of file
@@ -0,0 +1,26 @@
+import random
+from typing import Optional
+
+class RetryPolicy:
+    def __init__(self, max_retries: int = 2, base_delay: float = 0.5, max_delay: float = 8.0, jitter: float = 1.0, max_retry_after: float = 30.0):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.max_retry_after = max_retry_after
+    
+    def is_retryable(self, error: BaseException) -> bool:
+        return bool(getattr(error, "retryable", False))
+    
+    def next_delay(self, attempt: int, error: BaseException) -> Optional[float]:
+        if attempt >= self.max_retries or not self.is_retryable(error):
+            return None
+        
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:
+            if retry_after > self.max_retry_after:
+                return None
+            return retry_after
+        
+        backoff = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return backoff * (1 - self.jitter * random.random())
\ No newline at end of file
@@ -0,0 +1,59 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+class SingleFlight:
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.stats = {"executed": 0, "shared": 0}
+    
+    def do(self, key: Hashable, fn: Callable[[], Any], timeout: Optional[float] = None) -> Tuple[Any, bool]:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.stats["shared"] += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.stats["executed"] += 1
+                leader = True
+        
+        if not leader:
+            if not call.done.wait(timeout):
+                raise TimeoutError(f"Timed out after {timeout:.1f}s waiting for an in-flight call")
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+        
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        
+        return call.result, False
+    
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+    
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats["in_flight"] = len(self._calls)
+        return stats
\ No newline at end of file
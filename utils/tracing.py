@@ -0,0 +1,255 @@
+import os
+import json
+import time
+import secrets
+import threading
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Any, Optional, Iterator
+from utils.env import load_env
+from utils.profiling import current_profile
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+class Span:
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "status", "error")
+    
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.status = "ok"
+        self.error: Optional[str] = None
+    
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+    
+    def fail(self, error: str) -> None:
+        self.status = "error"
+        self.error = error
+    
+    @property
+    def duration(self) -> float:
+        end_ns = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end_ns - self.start_ns) / 1e9
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration": self.duration,
+            "attributes": dict(self.attributes),
+            "status": self.status,
+            "error": self.error
+        }
+
+class Tracer:
+    def __init__(self, service_name: str = "ai-ops-assistant", max_traces: int = 50, enabled: bool = True):
+        self.service_name = service_name
+        self.max_traces = max_traces
+        self.enabled = enabled
+        self._traces: "OrderedDict[str, List[Span]]" = OrderedDict()
+        self._histograms: Dict[str, List[int]] = defaultdict(lambda: [0] * (len(DURATION_BUCKETS) + 1))
+        self._sums: Dict[str, float] = defaultdict(float)
+        self._errors: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+    
+    @contextmanager
+    def span(self, name: str, parent: Optional[Span] = None, **attributes: Any) -> Iterator[Span]:
+        profile = current_profile()
+        if profile is not None:
+            profile.enter(name)
+        try:
+            span = self.start_span(name, parent, **attributes)
+            if not self.enabled:
+                yield span
+                return
+        
+            token = _current_span.set(span)
+            try:
+                yield span
+            except BaseException as e:
+                span.fail(str(e) or type(e).__name__)
+                raise
+            finally:
+                _current_span.reset(token)
+                self.end_span(span)
+        finally:
+            if profile is not None:
+                profile.exit(name)
+    
+    def start_span(self, name: str, parent: Optional[Span] = None, **attributes: Any) -> Span:
+        if not self.enabled:
+            return Span(name, "", None, attributes)
+        parent = parent or _current_span.get()
+        return Span(name, parent.trace_id if parent else secrets.token_hex(16), parent.span_id if parent else None, attributes)
+    
+    def end_span(self, span: Span) -> None:
+        span.end_ns = time.time_ns()
+        if self.enabled:
+            self._finish(span)
+    
+    def current_span(self) -> Optional[Span]:
+        return _current_span.get()
+    
+    def _finish(self, span: Span) -> None:
+        duration = span.duration
+        with self._lock:
+            spans = self._traces.get(span.trace_id)
+            if spans is None:
+                spans = self._traces[span.trace_id] = []
+                while len(self._traces) > self.max_traces:
+                    self._traces.popitem(last=False)
+            spans.append(span)
+            
+            buckets = self._histograms[span.name]
+            for index, bound in enumerate(DURATION_BUCKETS):
+                if duration <= bound:
+                    buckets[index] += 1
+                    break
+            else:
+                buckets[-1] += 1
+            self._sums[span.name] += duration
+            if span.status == "error":
+                self._errors[span.name] += 1
+    
+    def get_trace(self, trace_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            spans = list(self._traces.get(trace_id, []))
+        return [span.to_dict() for span in sorted(spans, key=lambda span: span.start_ns)]
+    
+    def recent_trace_ids(self) -> List[str]:
+        with self._lock:
+            return list(self._traces)
+    
+    def export_otlp(self, trace_ids: Optional[List[str]] = None) -> Dict[str, Any]:
+        with self._lock:
+            spans = [
+                span
+                for trace_id in (trace_ids if trace_ids is not None else list(self._traces))
+                for span in self._traces.get(trace_id, [])
+            ]
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attribute("service.name", self.service_name)]},
+                "scopeSpans": [{
+                    "scope": {"name": "ai_ops_assistant.tracing"},
+                    "spans": [_otlp_span(span) for span in spans]
+                }]
+            }]
+        }
+    
+    def prometheus_text(self) -> str:
+        with self._lock:
+            histograms = {name: list(buckets) for name, buckets in self._histograms.items()}
+            sums = dict(self._sums)
+            errors = dict(self._errors)
+        
+        lines = [
+            "# HELP ai_ops_span_duration_seconds Duration of pipeline spans",
+            "# TYPE ai_ops_span_duration_seconds histogram"
+        ]
+        for name in sorted(histograms):
+            cumulative = 0
+            for bound, count in zip(DURATION_BUCKETS + ("+Inf",), histograms[name]):
+                cumulative += count
+                lines.append(f'ai_ops_span_duration_seconds_bucket{{span="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'ai_ops_span_duration_seconds_sum{{span="{name}"}} {sums[name]}')
+            lines.append(f'ai_ops_span_duration_seconds_count{{span="{name}"}} {cumulative}')
+        
+        lines.append("# HELP ai_ops_span_errors_total Spans that ended with an exception")
+        lines.append("# TYPE ai_ops_span_errors_total counter")
+        for name in sorted(histograms):
+            lines.append(f'ai_ops_span_errors_total{{span="{name}"}} {errors.get(name, 0)}')
+        return "\n".join(lines) + "\n"
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": value if isinstance(value, str) else json.dumps(value, default=str)}}
+
+def _otlp_span(span: Span) -> Dict[str, Any]:
+    otlp = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": 1,
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": [_otlp_attribute(key, value) for key, value in span.attributes.items() if value is not None],
+        "status": {"code": 2, "message": span.error or ""} if span.status == "error" else {"code": 1}
+    }
+    if span.parent_id:
+        otlp["parentSpanId"] = span.parent_id
+    return otlp
+
+def _serve_metrics(tracer: Tracer, host: str, port: int) -> Any:
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from utils.hedging import hedging_prometheus_text
+    
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+        
+        def do_GET(self) -> None:
+            path = self.path.split("?")[0]
+            if path == "/metrics":
+                body, content_type = (tracer.prometheus_text() + hedging_prometheus_text()).encode("utf-8"), "text/plain; version=0.0.4"
+            elif path == "/traces":
+                body, content_type = json.dumps(tracer.export_otlp()).encode("utf-8"), "application/json"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+    
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
+
+_default_tracer: Optional[Tracer] = None
+_metrics_server: Any = None
+_tracing_lock = threading.Lock()
+
+def get_tracer() -> Tracer:
+    global _default_tracer
+    if _default_tracer is None:
+        with _tracing_lock:
+            if _default_tracer is None:
+                load_env()
+                _default_tracer = Tracer(
+                    max_traces=int(os.getenv("TRACE_MAX_TRACES", "50")),
+                    enabled=os.getenv("TRACING", "1") != "0"
+                )
+    return _default_tracer
+
+def start_metrics_server(port: Optional[int] = None, host: str = "0.0.0.0") -> Any:
+    global _metrics_server
+    tracer = get_tracer()
+    if port is None:
+        port = int(os.getenv("METRICS_PORT", "0"))
+    if not port:
+        return None
+    
+    with _tracing_lock:
+        if _metrics_server is None:
+            _metrics_server = _serve_metrics(tracer, host, port)
+    return _metrics_server
\ No newline at end of file